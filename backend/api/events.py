@@ -0,0 +1,41 @@
+import asyncio
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from core.events import event_bus
+
+router = APIRouter()
+
+
+async def _stream(request: Request, last_event_id: str | None):
+    sub = event_bus.subscribe(last_event_id)
+    try:
+        yield b"retry: 3000\n\n"
+        while not sub.overflowed:
+            try:
+                ev = await asyncio.wait_for(sub.queue.get(), settings.event_keepalive_seconds)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield b": keepalive\n\n"
+                continue
+            yield ev.encode()
+        # overflowed: 버퍼를 못 따라온 클라이언트 → 연결 종료, Last-Event-ID로 재접속해서 이어받음
+    finally:
+        event_bus.unsubscribe(sub)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    since: str | None = Query(None, description="Last-Event-ID 헤더를 보낼 수 없는 클라이언트용"),
+) -> StreamingResponse:
+    """대시보드 실시간 이벤트 (SSE): job.created / job.updated / task.appended / worker.status"""
+    return StreamingResponse(
+        _stream(request, last_event_id or since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,37 +1,108 @@
-from fastapi import APIRouter, HTTPException, Query
+import base64
+from datetime import datetime
 
-from models.job import Job, JobStatus, JobTask
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from core.etag import check_etag
+from models.job import Job, JobPage, JobSearchHit, JobStatus, JobTask, JobTaskSummary
 from services.job_queue import JobService
 
 router = APIRouter()
 service = JobService()
 
 
-@router.get("", response_model=list[Job])
+def _encode_cursor(created_at: datetime, job_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{job_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), job_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=JobPage)
 async def list_jobs(
+    request: Request,
+    response: Response,
     status: JobStatus | None = Query(None, description="상태 필터 (pending/processing/done/failed)"),
     source_project_id: str | None = Query(None, description="소스 프로젝트 ID 필터"),
-    page: int = Query(1, ge=1, description="페이지 번호 (1부터)"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (없으면 첫 페이지)"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
-) -> list[Job]:
-    """Job 목록 조회 (페이징 + 상태/프로젝트 필터)"""
-    offset = (page - 1) * limit
-    return await service.list_jobs(status=status, source_project_id=source_project_id, offset=offset, limit=limit)
+) -> JobPage:
+    """Job 목록 조회 (최신순 keyset 페이징 + 상태/프로젝트 필터, 요약 필드만)"""
+    # 요약 필드는 job.* 이벤트(생성/상태 변경)로만 바뀜 → DB 변경 카운터가 같으면 목록 조회 없이 304
+    if not_modified := check_etag(request, response, "jobs", await service.list_version()):
+        return not_modified
+    after = _decode_cursor(cursor) if cursor else None
+    items = await service.list_job_summaries(
+        status=status, source_project_id=source_project_id, after=after, limit=limit + 1,
+    )
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor(items[-1].created_at, items[-1].id)
+    return JobPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=list[JobSearchHit])
+async def search_jobs(
+    q: str = Query(..., min_length=1, description='검색어 (단어는 AND, "구문", 접두어*)'),
+    status: JobStatus | None = Query(None, description="상태 필터"),
+    source_project_id: str | None = Query(None, description="소스 프로젝트 ID 필터"),
+    limit: int = Query(20, ge=1, le=50, description="최대 job 수"),
+) -> list[JobSearchHit]:
+    """job 필드 + 에이전트 작업 히스토리 전문 검색 (관련도순, 일치 구간 표시)"""
+    if not service.search_available:
+        raise HTTPException(status_code=501, detail="Full-text search requires the SQLite backend")
+    hits = await service.search(q, status=status, source_project_id=source_project_id, limit=limit)
+    if hits is None:
+        raise HTTPException(status_code=400, detail="Query has no searchable terms")
+    return hits
 
 
 @router.get("/{job_id}", response_model=Job)
-async def get_job(job_id: str) -> Job:
+async def get_job(job_id: str, request: Request, response: Response) -> Job:
     """Job 단건 조회"""
+    updated_at = await service.get_job_updated_at(job_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not_modified := check_etag(request, response, "job", job_id, updated_at.isoformat()):
+        return not_modified
     job = await service.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
 
-@router.get("/{job_id}/tasks", response_model=list[JobTask])
-async def list_job_tasks(job_id: str) -> list[JobTask]:
+@router.get("/{job_id}/tasks", response_model=list[JobTaskSummary] | list[JobTask])
+async def list_job_tasks(
+    job_id: str,
+    request: Request,
+    response: Response,
+    after_sequence: int = Query(0, ge=0, description="이 sequence 이후 task만 (증분 조회)"),
+    slim: bool = Query(False, description="content 대신 content_length만 반환"),
+) -> list[JobTaskSummary] | list[JobTask]:
     """Job 에이전트 작업 히스토리 조회"""
-    job = await service.get_job(job_id)
-    if not job:
+    if not await service.job_id_exists(job_id):
         raise HTTPException(status_code=404, detail="Job not found")
-    return await service.list_tasks(job_id)
+    # task는 append-only → 마지막 sequence가 같으면 내용도 같음 (보존 정리로 content가 지워질 때만 예외)
+    last_sequence = await service.last_task_sequence(job_id)
+    if not_modified := check_etag(
+        request, response, "tasks", job_id, last_sequence, await service.retention_version(),
+    ):
+        return not_modified
+    if slim:
+        return await service.list_task_summaries(job_id, after_sequence=after_sequence)
+    return await service.list_tasks(job_id, after_sequence=after_sequence)
+
+
+@router.get("/{job_id}/tasks/{sequence}", response_model=JobTask)
+async def get_job_task(job_id: str, sequence: int) -> JobTask:
+    """task 단건 조회 (content 포함)"""
+    task = await service.get_task(job_id, sequence)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
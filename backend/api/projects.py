@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from core.etag import check_etag
 from models.project import Project, RepoPlatform
 from services.project import ProjectService
 
@@ -32,8 +33,10 @@ async def create_project(body: CreateProjectRequest) -> Project:
 
 
 @router.get("", response_model=list[Project])
-async def list_projects(source: str | None = None) -> list[Project]:
+async def list_projects(request: Request, response: Response, source: str | None = None) -> list[Project]:
     """프로젝트 목록 조회"""
+    if not_modified := check_etag(request, response, "projects", await service.list_version()):
+        return not_modified
     return await service.list(source=source)
 
 
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Query
+
+from models.job import ProjectJobStats
+from services.job_queue import JobService
+
+router = APIRouter()
+service = JobService()
+
+
+@router.get("", response_model=list[ProjectJobStats])
+async def get_stats(
+    days: int = Query(7, ge=1, le=366, description="토큰 합계 기간 (오늘 포함 최근 N일 사용량)"),
+) -> list[ProjectJobStats]:
+    """프로젝트별 상태별 job 수, 토큰 합계 (job_stats/token_usage 집계 테이블만 조회)"""
+    return await service.project_stats(days=days)
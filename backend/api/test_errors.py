@@ -4,7 +4,7 @@ from sqlalchemy import select, text
 
 from fastapi import APIRouter
 
-from core.database import db_session
+from core.database import current_session
 from models.job import JobModel
 from models.project import ProjectModel
 
@@ -35,7 +35,7 @@ async def trigger_n_plus_one():
     projects 목록을 1번 조회한 뒤,
     각 project마다 별도 쿼리로 job을 조회하는 전형적인 N+1 패턴.
     """
-    session = db_session.get()
+    session = current_session()
 
     # Query 1: 전체 프로젝트 목록 조회
     result = await session.execute(select(ProjectModel))
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import ValidationError
 
-from models.job import ErrorSource, JobStatus
+from core.config import settings
+from core.database import db_write_context
+from models.job import ErrorSource
+from services.ingest import webhook_ingestor
+from services.ingest_cache import IngestCache, ingest_cache
 from services.job_queue import JobService
 from services.parsers import get_parser
 
@@ -55,52 +59,77 @@ def print_parsed_error(parsed) -> None:
 
 
 @router.post("/sentry")
-async def sentry_webhook(request: Request) -> dict:
-    """Sentry webhook endpoint → Job 생성"""
-    payload = await request.json()
-
+async def sentry_webhook(request: Request, response: Response) -> dict:
+    """Sentry webhook endpoint → Job 생성 (queue 모드면 202 후 백그라운드 기록)"""
+    raw = await request.body()
     parser = get_parser(ErrorSource.SENTRY)
     try:
-        parsed = parser.parse(payload)
+        # body bytes에서 필요한 필드만 바로 검증 (dict 변환 없음), 원본 body는 그대로 raw_payload로 저장
+        parsed = parser.parse_json(raw)
     except ValidationError as e:
+        if any(err["type"] == "json_invalid" for err in e.errors()):
+            raise HTTPException(status_code=400, detail=e.errors()[0]["msg"])
         raise HTTPException(status_code=422, detail=str(e))
 
+    # 이미 기록한 이벤트의 재전송이면 DB 없이 응답
+    key = IngestCache.key_of(parsed)
+    cached = ingest_cache.lookup(key) if key else None
+    if cached:
+        return {
+            "status": "duplicate",
+            "source": parsed.source.value,
+            "issue_id": parsed.source_issue_id,
+            "job_id": cached[0],
+        }
+
     # 파싱 결과 출력
     print_parsed_error(parsed)
 
-    # 중복 체크 — 동일 이슈가 재발생하면 PENDING으로 재등록
-    existing = await job_service.get_by_source(parsed.source, parsed.source_issue_id)
-    if existing:
-        if existing.status in (JobStatus.PENDING, JobStatus.PROCESSING, JobStatus.RATE_LIMITED):
-            print(f"⚠️  Duplicate issue (already {existing.status}): {parsed.source_issue_id}")
-            return {
-                "status": "duplicate",
-                "source": parsed.source.value,
-                "issue_id": parsed.source_issue_id,
-                "job_id": existing.id,
-            }
-        # DONE/FAILED → 에러 재발생이므로 PENDING으로 재처리
-        print(f"🔄 Reopen issue ({existing.status} → pending): {parsed.source_issue_id}")
-        await job_service.update_job_status(
-            existing.id,
-            JobStatus.PENDING,
-            error_log=None,
-        )
+    if settings.webhook_ingest_mode == "queue":
+        # 큐에 넣고 바로 응답. 기록(생성/재오픈/중복 판정)은 백그라운드 배치에서
+        if not webhook_ingestor.submit(parsed):
+            raise HTTPException(status_code=503, detail="Webhook queue is full", headers={"Retry-After": "1"})
+        response.status_code = 202
         return {
-            "status": "reopened",
+            "status": "accepted",
             "source": parsed.source.value,
             "issue_id": parsed.source_issue_id,
-            "job_id": existing.id,
         }
 
-    # Job 생성
-    job_id = await job_service.create_job(parsed)
-    print(f"✅ Job created: {job_id}")
+    # 중복 체크 — 동일 이슈가 재발생(DONE/FAILED)하면 PENDING으로 재등록
+    # 동시 수신이 몰리는 쓰기 경로라 요청 세션(DEFERRED) 대신 writer 경로로 기록 ("database is locked" 방지)
+    async with db_write_context():
+        result, job_id = await job_service.ingest_error(parsed)
+    if result == "duplicate":
+        print(f"⚠️  Duplicate issue (already in progress): {parsed.source_issue_id}")
+    elif result == "reopened":
+        print(f"🔄 Reopen issue (→ pending): {parsed.source_issue_id}")
+    else:
+        print(f"✅ Job created: {job_id}")
 
-    return {
-        "status": "created",
-        "job_id": job_id,
+    body = {
+        "status": result,
         "source": parsed.source.value,
         "issue_id": parsed.source_issue_id,
-        "title": parsed.title,
+        "job_id": job_id,
+    }
+    if result == "created":
+        body["title"] = parsed.title
+    return body
+
+
+@router.get("/metrics")
+async def webhook_metrics() -> dict:
+    """웹훅 수신 통계 (재전송 캐시 적중률, 수신 큐)"""
+    return {
+        "dedupe_cache": ingest_cache.stats(),
+        "queue": {
+            "mode": settings.webhook_ingest_mode,
+            "pending": webhook_ingestor.pending,
+            "accepted": webhook_ingestor.accepted,
+            "rejected": webhook_ingestor.rejected,
+            "committed": webhook_ingestor.committed,
+            "failed": webhook_ingestor.failed,
+            "batches": webhook_ingestor.batches,
+        },
     }
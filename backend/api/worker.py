@@ -1,14 +1,18 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
+from core.etag import check_etag
 from services.worker_manager import worker_manager
 
 router = APIRouter()
 
 
 @router.get("/status")
-async def get_status() -> dict:
+async def get_status(request: Request, response: Response) -> dict:
     """Worker 상태 조회"""
-    return worker_manager.status()
+    status = worker_manager.status()
+    if not_modified := check_etag(request, response, *status.values()):
+        return not_modified
+    return status
 
 
 @router.post("/start", status_code=200)
@@ -0,0 +1,87 @@
+"""SQLite 쓰기 처리량 벤치마크 - PRAGMA 튜닝 전/후 비교
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_db_writes [--writers 8] [--writes 200] [--readers 2]
+
+writer 태스크 여러 개가 job_tasks에 짧은 트랜잭션으로 한 건씩 기록하고,
+reader 태스크가 동시에 Job 목록을 주기적으로 조회하는 상황(대시보드 폴링)을 재현.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import database
+from core.config import settings
+from models.error import ParsedError
+from models.job import ErrorSource, JobTaskType
+from repositories.job import JobRepository
+
+
+async def _run(tuned: bool, writers: int, writes: int, readers: int) -> dict:
+    settings.database_path = Path(tempfile.mkdtemp()) / "bench.db"
+    database.engine = database.create_engine(tuned=tuned)
+    database.AsyncSessionLocal = async_sessionmaker(
+        database.engine, class_=AsyncSession, expire_on_commit=False,
+    )
+    await database.init_db()
+    write_context = database.db_write_context if tuned else database.db_context
+
+    repo = JobRepository()
+    async with database.db_context():
+        job_id = await repo.create(ParsedError(
+            source=ErrorSource.SENTRY, source_issue_id="bench", title="bench",
+        ))
+
+    errors = 0
+    done = asyncio.Event()
+
+    async def writer() -> None:
+        nonlocal errors
+        for _ in range(writes):
+            try:
+                async with write_context():
+                    await repo.add_task(job_id, JobTaskType.MESSAGE, content="x" * 200, label="bench")
+            except OperationalError:
+                errors += 1
+
+    async def reader() -> None:
+        while not done.is_set():
+            async with database.db_context():
+                await repo.list_job_summaries(limit=20)
+            await asyncio.sleep(0.01)
+
+    reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(writers)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*reader_tasks)
+    await database.engine.dispose()
+
+    committed = writers * writes - errors
+    return {"elapsed": elapsed, "committed": committed, "errors": errors, "wps": committed / elapsed}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    for label, tuned in (("before (default journal)", False), ("after (WAL + pragmas)", True)):
+        r = await _run(tuned, args.writers, args.writes, args.readers)
+        print(
+            f"{label:<26} {r['wps']:>8.0f} writes/s | "
+            f"{r['committed']} committed, {r['errors']} locked errors, {r['elapsed']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""HTTP 처리량 벤치마크 - DB 세션 미들웨어 비교 (/api/health, /api/jobs)
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_http [--requests 5000] [--concurrency 32] [--jobs 1000]
+
+네트워크/서버 프로세스 영향을 빼기 위해 httpx ASGITransport로 앱을 직접 호출.
+legacy는 이전 구현(BaseHTTPMiddleware, 요청마다 세션 생성)과 같은 동작.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import insert
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from api.jobs import router as jobs_router
+from core import database
+from core.config import settings
+from core.middleware import DBSessionMiddleware
+from models.job import JobModel, JobStatus
+
+
+class LegacyDBSessionMiddleware(BaseHTTPMiddleware):
+    """비교용: 이전 DBSessionMiddleware"""
+
+    async def dispatch(self, request: Request, call_next):
+        async with database.AsyncSessionLocal() as session:
+            token = database.db_session.set(session)
+            try:
+                response = await call_next(request)
+                if response.status_code < 400:
+                    await session.commit()
+                else:
+                    await session.rollback()
+                return response
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                database.db_session.reset(token)
+
+
+def _build_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+    api_router = APIRouter(prefix="/api")
+    api_router.include_router(jobs_router, prefix="/jobs")
+
+    @api_router.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.include_router(api_router)
+    return app
+
+
+async def _populate(jobs: int) -> None:
+    now = datetime.now(UTC)
+    async with database.db_write_context() as session:
+        await session.execute(insert(JobModel), [
+            {
+                "id": str(uuid.uuid4()), "status": JobStatus.DONE.value, "source": "sentry",
+                "source_project_id": "p1", "source_issue_id": str(i), "title": f"error {i}",
+                "created_at": now - timedelta(seconds=i), "updated_at": now - timedelta(seconds=i),
+            }
+            for i in range(jobs)
+        ])
+
+
+async def _run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """requests/sec"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def client_loop():
+            for _ in remaining:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await client.get(path)  # warm-up
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--jobs", type=int, default=1000)
+    args = parser.parse_args()
+
+    settings.database_path = Path(tempfile.mkdtemp()) / "bench.db"
+    database.reset_engine()
+    await database.init_db()
+    await _populate(args.jobs)
+
+    for label, middleware in (("legacy", LegacyDBSessionMiddleware), ("asgi", DBSessionMiddleware)):
+        app = _build_app(middleware)
+        for path in ("/api/health", "/api/jobs?limit=20"):
+            rps = await _run(app, path, args.requests, args.concurrency)
+            print(f"{label:<7} {path:<22} {rps:8.0f} req/s")
+    await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""웹훅 수신 처리량 벤치마크 - sync (요청 안에서 기록) vs queue (202 + group commit)
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_ingest [--events 2000] [--concurrency 32] [--issues 500]
+    WEBHOOK_DEDUPE_CACHE_SIZE=0 uv run python -m benchmarks.bench_ingest   # 재전송 캐시 끄고 비교
+
+httpx ASGITransport로 /api/webhook/sentry에 동시 요청을 보내고
+응답 완료(accepted/s)와 DB 기록 완료(committed/s)까지의 처리량을 측정.
+같은 이슈가 반복되는 장애 상황처럼 issue_id는 --issues개 안에서 순환
+(같은 body를 다시 보내므로 Sentry 재전송과 같음 → 재전송 캐시 적중).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from api.webhook import router as webhook_router
+from core import database
+from core.config import settings
+from core.middleware import DBSessionMiddleware
+from core.responses import ORJSONResponse
+from services.ingest import webhook_ingestor
+from services.ingest_cache import ingest_cache
+
+_DEFAULT_PAYLOAD = Path(__file__).resolve().parents[2] / "webhook.json"
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(DBSessionMiddleware)
+    api_router = APIRouter(prefix="/api")
+    api_router.include_router(webhook_router, prefix="/webhook")
+    app.include_router(api_router)
+    return app
+
+
+def _bodies(payload: dict, events: int, issues: int) -> list[bytes]:
+    unique = []
+    for i in range(min(events, issues)):
+        p = copy.deepcopy(payload)
+        p["data"]["event"]["issue_id"] = f"bench-{i}"
+        unique.append(json.dumps(p).encode())
+    return [unique[i % len(unique)] for i in range(events)]
+
+
+async def _run(mode: str, bodies: list[bytes], concurrency: int) -> None:
+    settings.webhook_ingest_mode = mode
+    settings.database_path = Path(tempfile.mkdtemp()) / "bench.db"
+    database.reset_engine()
+    ingest_cache.clear()
+    await database.init_db()
+    if mode == "queue":
+        webhook_ingestor.start()
+
+    statuses: dict[int, int] = {}
+    pending = iter(bodies)
+    transport = httpx.ASGITransport(app=_build_app(), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def client_loop():
+            for body in pending:
+                while True:
+                    response = await client.post(
+                        "/api/webhook/sentry", content=body, headers={"Content-Type": "application/json"},
+                    )
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    if response.status_code != 503:
+                        break
+                    await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # 파싱 결과 출력 제외
+            await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+            accepted = time.perf_counter() - started
+            await webhook_ingestor.stop()
+        committed = time.perf_counter() - started
+
+    print(
+        f"{mode:<6} accepted {len(bodies) / accepted:7.0f} ev/s | committed {len(bodies) / committed:7.0f} ev/s "
+        f"| responses {dict(sorted(statuses.items()))}"
+    )
+    await database.engine.dispose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--payload", type=Path, default=_DEFAULT_PAYLOAD)
+    args = parser.parse_args()
+
+    bodies = _bodies(json.loads(args.payload.read_bytes()), args.events, args.issues)
+    for mode in ("sync", "queue"):
+        await _run(mode, bodies, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
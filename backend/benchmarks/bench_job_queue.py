@@ -0,0 +1,107 @@
+"""get_next_job / list_job_summaries 지연 시간 벤치마크 - 대량 jobs 테이블 기준
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_job_queue [--jobs 1000000] [--claims 200]
+
+DONE/FAILED가 대부분이고 PENDING이 뒤쪽에 쌓인 운영 DB 형태를 bulk insert로 만든 뒤
+claim(get_next_job)과 목록 조회 시간을 측정.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from core import database
+from core.config import settings
+from models.job import JobModel, JobStatus
+from models.project import ProjectModel
+from repositories.job import JobRepository
+
+_BATCH = 10_000
+
+
+async def _populate(jobs: int, projects: int) -> None:
+    now = datetime.now(UTC)
+    async with database.db_write_context() as session:
+        await session.execute(insert(ProjectModel), [
+            {"id": str(uuid.uuid4()), "source": "sentry", "source_project_id": f"p{i}",
+             "repo_url": "https://example.com/r.git", "repo_platform": "github",
+             "created_at": now, "updated_at": now}
+            for i in range(projects)
+        ])
+    for start in range(0, jobs, _BATCH):
+        rows = []
+        for i in range(start, min(start + _BATCH, jobs)):
+            # 최근 1%만 PENDING (나머지는 처리 완료)
+            status = JobStatus.PENDING if i >= jobs * 0.99 else (
+                JobStatus.FAILED if i % 10 == 0 else JobStatus.DONE
+            )
+            created = now - timedelta(seconds=jobs - i)
+            rows.append({
+                "id": str(uuid.uuid4()), "status": status.value, "source": "sentry",
+                "source_project_id": f"p{i % (projects * 2)}",  # 절반은 미등록 프로젝트
+                "source_issue_id": str(i), "title": f"error {i}",
+                "created_at": created, "updated_at": created,
+            })
+        async with database.db_write_context() as session:
+            await session.execute(insert(JobModel), rows)
+
+
+async def _timed(fn, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--claims", type=int, default=200)
+    args = parser.parse_args()
+
+    settings.database_path = Path(tempfile.mkdtemp()) / "bench.db"
+    database.reset_engine()
+    await database.init_db()
+
+    started = time.perf_counter()
+    await _populate(args.jobs, args.projects)
+    print(f"populated {args.jobs} jobs in {time.perf_counter() - started:.1f}s")
+
+    repo = JobRepository()
+
+    async def claim():
+        async with database.db_write_context():
+            await repo.get_next_job()
+
+    async def list_page():
+        async with database.db_context():
+            await repo.list_job_summaries(limit=50)
+
+    async def list_project():
+        async with database.db_context():
+            await repo.list_job_summaries(source_project_id="p3", limit=50)
+
+    for label, fn in (
+        ("get_next_job", claim), ("list_summaries", list_page), ("list_summaries(project)", list_project),
+    ):
+        samples = await _timed(fn, args.claims)
+        print(
+            f"{label:<24} p50 {statistics.median(samples):7.2f} ms | "
+            f"max {max(samples):7.2f} ms ({len(samples)} calls)"
+        )
+    await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""webhook 파싱 벤치마크 - dict 경로 (json 디코드 → model_validate) vs bytes 경로 (model_validate_json)
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_parse [--iterations 200] [--fixture ../webhook.json ...]
+
+fixture: 녹화된 Sentry webhook body (기본 ../webhook.json, 124KB performance issue).
+각 fixture에 in_app 섞인 깊은 스택(exception frames)을 붙여 ~500KB로 키운 변형도 함께 측정.
+"""
+
+import argparse
+import copy
+import json
+import time
+from pathlib import Path
+
+import orjson
+
+from models.job import ErrorSource
+from services.parsers import get_parser
+
+_DEFAULT_FIXTURE = Path(__file__).resolve().parents[2] / "webhook.json"
+
+
+def _timed(fn, iterations: int) -> float:
+    """호출당 평균 µs"""
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def _deep_stack(payload: dict, target_bytes: int = 500_000) -> bytes:
+    """exception.values[-1].stacktrace에 프레임을 target_bytes가 될 때까지 추가"""
+    payload = copy.deepcopy(payload)
+    event = payload["data"]["event"]
+    frames = []
+    event["exception"] = {"values": [{"type": "ValueError", "value": "boom", "stacktrace": {"frames": frames}}]}
+    while len(orjson.dumps(payload)) < target_bytes:
+        i = len(frames)
+        frames.append({
+            "filename": f"app/module_{i}.py" if i % 4 == 0 else f"site-packages/lib/mod_{i}.py",
+            "abs_path": f"/srv/app/module_{i}.py",
+            "function": f"handler_{i}",
+            "module": f"app.module_{i}",
+            "lineno": i,
+            "colno": 4,
+            "in_app": i % 4 == 0,
+            "context_line": "    result = process(data)",
+            "pre_context": ["def handler():", "    data = get_data()", "    # " + "x" * 60] * 3,
+            "post_context": ["    return result", ""] * 3,
+            "vars": {f"v{j}": "y" * 40 for j in range(8)},
+        })
+    return json.dumps(payload).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--fixture", type=Path, action="append")
+    args = parser.parse_args()
+
+    sentry = get_parser(ErrorSource.SENTRY)
+    for path in args.fixture or [_DEFAULT_FIXTURE]:
+        recorded = path.read_bytes()
+        for label, body in ((path.name, recorded), (f"{path.name} + deep stack", _deep_stack(json.loads(recorded)))):
+            before = _timed(lambda: sentry.parse(json.loads(body)), args.iterations)
+            after = _timed(lambda: sentry.parse_json(body), args.iterations)
+            print(
+                f"{label:<28} {len(body) / 1000:6.0f}KB | dict {before:8.0f} µs | bytes {after:8.0f} µs "
+                f"| x{before / after:4.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""전문 검색 벤치마크 - /api/jobs/search가 쓰는 JobService.search 지연 시간
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_search [--tasks 1000000] [--tasks-per-job 50] [--repeat 20]
+
+임시 DB에 job과 도구 출력 비슷한 task를 직접 INSERT하고 FTS 인덱스를 rebuild한 뒤,
+희귀/흔한 단어, 파일 경로 phrase, 접두어, 여러 단어 AND 검색의 중앙값/최대 지연을 측정.
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from core import database
+from core.config import settings
+from repositories.search import SearchRepository
+from services.job_queue import JobService
+
+_WORDS = [f"w{i}" for i in range(20_000)]
+_FILES = [f"app/{pkg}/{name}.py" for pkg in ("payments", "orders", "users", "billing") for name in
+          ("refund", "charge", "views", "models", "serializers", "tasks", "utils", "api")]
+_QUERIES = [
+    ("rare word", "w19999"),
+    ("common word", "pytest"),
+    ("file path", "app/payments/refund.py"),
+    ("prefix", "serial*"),
+    ("two words", "pytest failed"),
+]
+
+
+def _task_text(rng: random.Random) -> str:
+    words = " ".join(rng.choices(_WORDS[:2000], k=20) + [rng.choice(_WORDS)])
+    if rng.random() < 0.3:
+        return f"$ pytest {rng.choice(_FILES)}\n{'1 failed' if rng.random() < 0.3 else '3 passed'} {words}"
+    return f"read {rng.choice(_FILES)}: {words}"
+
+
+def _populate(path: Path, tasks: int, tasks_per_job: int) -> None:
+    rng = random.Random(0)
+    conn = sqlite3.connect(path)
+    now = "2026-01-01 00:00:00"
+    for start in range(0, tasks, tasks_per_job * 1000):
+        jobs, rows = [], []
+        for _ in range(min(1000, (tasks - start) // tasks_per_job or 1)):
+            job_id = str(uuid.uuid4())
+            filename = rng.choice(_FILES)
+            jobs.append((job_id, "done", "sentry", job_id, f"ValueError in {filename}", filename, now, now))
+            rows += [
+                (str(uuid.uuid4()), job_id, seq, "tool_use", "bash", _task_text(rng), now)
+                for seq in range(1, tasks_per_job + 1)
+            ]
+        conn.executemany(
+            "INSERT INTO jobs (id, status, source, source_issue_id, title, filename, input_tokens, output_tokens, "
+            "retry_count, occurrence_count, event_rate, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 0, 0, 0, 1, 0, ?, ?)",
+            jobs,
+        )
+        conn.executemany(
+            "INSERT INTO job_tasks (id, job_id, sequence, type, label, content, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    conn.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--tasks-per-job", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.database_path = Path(tempfile.mkdtemp()) / "bench.db"
+    database.reset_engine()
+    await database.init_db()
+    started = time.perf_counter()
+    _populate(settings.database_path, args.tasks, args.tasks_per_job)
+    async with database.db_write_context():
+        await SearchRepository().rebuild()
+    print(f"{args.tasks:,} tasks indexed in {time.perf_counter() - started:.1f}s")
+
+    service = JobService()
+    for label, query in _QUERIES:
+        timings = []
+        async with database.db_context():
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                hits = await service.search(query, limit=20)
+                timings.append((time.perf_counter() - t) * 1000)
+        print(
+            f"{label:<12} {query!r:<26} | p50 {statistics.median(timings):6.1f} ms | max {max(timings):6.1f} ms "
+            f"| {len(hits)} jobs"
+        )
+    await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""직렬화 비용 마이크로벤치마크 - 요청당 JSON 인코딩 시간 (이전 vs 현재)
+
+실행 방법 (backend 디렉토리에서):
+    uv run python -m benchmarks.bench_serialization [--iterations 2000] [--payload ../webhook.json]
+
+- 응답: Job 목록 1페이지(50건) / Job 상세 — pydantic dump 후 json.dumps(Starlette 기본) vs orjson
+- webhook raw_payload: dict를 json.dumps로 재직렬화 vs 원본 body 그대로
+- stacktrace 컬럼: frame별 model_dump + json.dumps vs TypeAdapter.dump_json
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from core.responses import ORJSONResponse
+from models.error import StackFrame
+from models.job import ErrorSource, Job, JobPage, JobStatus, JobSummary
+from repositories.job import _FRAMES
+from services.parsers import get_parser
+
+_DEFAULT_PAYLOAD = Path(__file__).resolve().parents[2] / "webhook.json"
+
+
+def _timed(fn, iterations: int) -> float:
+    """호출당 평균 µs"""
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def _sample_page() -> JobPage:
+    now = datetime.now(UTC)
+    return JobPage(
+        items=[
+            JobSummary(
+                id=str(uuid.uuid4()), status=JobStatus.DONE, source=ErrorSource.SENTRY,
+                source_project_id="4509981525278720", source_issue_id=str(i),
+                title="ZeroDivisionError: division by zero", exception_type="ZeroDivisionError",
+                level="error", environment="prod", retry_count=0, created_at=now, updated_at=now,
+            )
+            for i in range(50)
+        ],
+        next_cursor="cursor",
+    )
+
+
+def _sample_frames() -> list[StackFrame]:
+    return [
+        StackFrame(
+            filename=f"app/module_{i}.py", lineno=i * 10, function=f"handler_{i}",
+            context_line="    result = process(data)",
+            pre_context=["def handler():", "    data = get_data()"] * 3,
+            post_context=["    return result", ""] * 3,
+        )
+        for i in range(30)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--payload", type=Path, default=_DEFAULT_PAYLOAD)
+    args = parser.parse_args()
+
+    body = args.payload.read_bytes()
+    payload = json.loads(body)
+    parsed = get_parser(ErrorSource.SENTRY).parse(payload, raw=body)
+    job = Job(id=str(uuid.uuid4()), **parsed.model_dump(exclude={"frames"}), stacktrace=_FRAMES.dump_json(parsed.frames).decode())
+
+    cases = []
+    for label, model, adapter in (
+        ("GET /jobs (50건)", _sample_page(), TypeAdapter(JobPage)),
+        ("GET /jobs/{id}", job, TypeAdapter(Job)),
+    ):
+        content = adapter.dump_python(model, mode="json")  # FastAPI response_model 직렬화 결과
+        cases.append((
+            label,
+            lambda content=content: JSONResponse(content).body,
+            lambda content=content: ORJSONResponse(content).body,
+        ))
+    cases.append((
+        "webhook raw_payload",
+        lambda: json.dumps(payload, ensure_ascii=False),
+        lambda: body.decode(),
+    ))
+    frames = _sample_frames()
+    cases.append((
+        "stacktrace (30 frames)",
+        lambda: json.dumps([frame.model_dump() for frame in frames], ensure_ascii=False),
+        lambda: _FRAMES.dump_json(frames).decode(),
+    ))
+
+    print(f"webhook payload {len(body):,} bytes")
+    for label, before, after in cases:
+        b, a = _timed(before, args.iterations), _timed(after, args.iterations)
+        print(f"{label:<22} before {b:8.1f} µs | after {a:8.1f} µs | x{b / a:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
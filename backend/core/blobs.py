@@ -0,0 +1,45 @@
+"""큰 TEXT 값 압축/해시 (blobs 테이블)
+
+blob_inline_max_bytes를 넘는 값은 zlib 압축해 blobs에 내용 해시로 한 번만 저장하고,
+원래 컬럼은 NULL + *_blob 컬럼에 해시를 기록. 작은 값은 그대로 인라인.
+"""
+
+import hashlib
+import zlib
+from dataclasses import dataclass
+
+from core.config import settings
+
+CODEC = "zlib"
+
+
+@dataclass(frozen=True)
+class PendingBlob:
+    """아직 저장하지 않은 blob. 압축은 실제로 저장할 때만 (중복 수신이면 생략)"""
+
+    hash: str
+    raw: bytes
+
+    def row(self) -> dict:
+        return {
+            "hash": self.hash,
+            "codec": CODEC,
+            "size": len(self.raw),
+            "data": zlib.compress(self.raw, settings.blob_compress_level),
+        }
+
+
+def split(value: str | None) -> tuple[str | None, PendingBlob | None]:
+    """(인라인 값, None) 또는 (None, 저장할 blob)"""
+    if value is None:
+        return None, None
+    raw = value.encode()
+    if len(raw) <= settings.blob_inline_max_bytes:
+        return value, None
+    return None, PendingBlob(hashlib.sha256(raw).hexdigest(), raw)
+
+
+def decode(codec: str, data: bytes) -> str:
+    if codec != CODEC:
+        raise ValueError(f"Unknown blob codec: {codec}")
+    return zlib.decompress(data).decode()
@@ -16,9 +16,52 @@ class Settings(BaseSettings):
 
     # Database
     database_path: Path = Path("data/jobs.db")
+    # 설정하면 database_path 대신 사용 (PostgreSQL: postgresql+asyncpg://user:pw@host:5432/prbot)
+    database_url: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds
+    db_pool_recycle: int = 1800    # seconds, PostgreSQL 커넥션 재생성 주기 (-1이면 끔)
+
+    # SQLite PRAGMA (커넥션마다 적용)
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes
+    sqlite_cache_size_kib: int = 64 * 1024
+
+    # 큰 TEXT 값(raw_payload, stacktrace, task content)은 압축해서 blobs 테이블에 저장 (내용 해시로 중복 제거)
+    blob_inline_max_bytes: int = 2048  # 이하는 원래 컬럼에 그대로
+    blob_compress_level: int = 6       # zlib 1-9
+
+    # 보존 정책 (services/maintenance.py 백그라운드 정리, 일수 0이면 해당 정책 끔)
+    retention_task_content_days: int = 0   # 끝난(DONE/FAILED) job의 task content를 N일 후 삭제 (label만 남김)
+    retention_archive_days: int = 0        # N일 지난 DONE job을 archive_dir에 NDJSON(gzip)으로 옮기고 DB에서 삭제
+    archive_dir: Path = Path("data/archive")
+    maintenance_interval_minutes: float = 60.0
+    maintenance_batch_size: int = 200      # 한 쓰기 트랜잭션에서 처리할 최대 행 수 (worker 쓰기를 오래 막지 않도록)
+    maintenance_vacuum_pages: int = 1000   # 한 번에 파일에서 반환할 free 페이지 수 (PRAGMA incremental_vacuum)
+
+    # 전문 검색 (/api/jobs/search): 흔한 단어는 최근 N개 일치 문서만 bm25 순위 계산 (응답 시간 상한)
+    search_rank_window: int = 2000
 
     # Worker
     worker_poll_interval: int = 5  # seconds
+    # job_tasks 버퍼링: N건 쌓이거나 T ms 지나면 한 트랜잭션으로 기록
+    task_log_flush_events: int = 20
+    task_log_flush_interval_ms: int = 500
+    task_log_flush_retries: int = 5  # 타이머 flush 연속 실패 시 재시도 횟수 (넘으면 버퍼를 버리고 로그)
+
+    # Job 우선순위: "fifo" = 생성 순, "score" = 발생 빈도 + level + 대기 시간 점수 높은 순
+    # score = frequency_weight * ln(1 + 감쇠 발생 수) + level 가중치 + age_weight * 대기 시간(h)
+    job_priority: Literal["fifo", "score"] = "score"
+    job_rate_half_life_minutes: float = 60.0  # 발생 빈도(event_rate) 감쇠 반감기
+    job_priority_frequency_weight: float = 1.0
+    job_priority_level_weights: dict[str, float] = {"fatal": 4.0, "error": 2.0, "warning": 1.0}
+    job_priority_age_weight: float = 0.5  # 대기 1시간당 가산점 (오래 기다린 job이 밀리지 않도록)
+
+    # 대시보드 이벤트 스트림 (/api/events)
+    event_history_size: int = 1000  # Last-Event-ID 재접속 시 재생 가능한 최근 이벤트 수
+    event_queue_size: int = 256     # 연결별 버퍼 (가득 차면 연결 종료 → 클라이언트 재접속)
+    event_keepalive_seconds: float = 15.0
 
     # Workspace
     workspace_dir: Path = Path.home() / ".pr-bot-workspaces"
@@ -33,6 +76,17 @@ class Settings(BaseSettings):
     # Agent mode: "api" = Anthropic API 직접 호출, "claude-code" = claude CLI subprocess
     agent_mode: Literal["api", "claude-code"] = "api"
 
+    # bash 도구: True면 Job마다 영속 셸 하나를 재사용 (cwd/env/venv 유지), False면 호출마다 새 /bin/sh
+    bash_persistent_shell: bool = False
+
+    # 프롬프트 입력 토큰 예산 (모델별). 초과 시 소스 컨텍스트를 단계적으로 줄임
+    # .env에서 PROMPT_TOKEN_BUDGETS='{"claude-opus-4-6": 80000}' 형태로 모델별 지정
+    prompt_token_budgets: dict[str, int] = {}
+    default_prompt_token_budget: int = 50_000
+
+    def get_prompt_budget(self, model: str) -> int:
+        return self.prompt_token_budgets.get(model, self.default_prompt_token_budget)
+
     # Bot git identity
     bot_git_name: str = "pr-bot"
     bot_git_email: str = "pr-bot@noreply"
@@ -53,6 +107,16 @@ class Settings(BaseSettings):
     sentry_webhook_secret: str | None = None
     sentry_dsn: str | None = None
 
+    # 웹훅 수신 방식: "sync" = 요청 안에서 Job 기록 후 응답
+    # "queue" = 검증 후 메모리 큐에 넣고 바로 202, 백그라운드에서 배치로 한 트랜잭션에 기록
+    webhook_ingest_mode: Literal["sync", "queue"] = "sync"
+    webhook_queue_size: int = 10_000       # 가득 차면 503 + Retry-After (Sentry가 재전송)
+    webhook_batch_size: int = 200          # 한 트랜잭션에 기록할 최대 건수
+    webhook_batch_interval_ms: int = 20    # 첫 건 이후 배치를 모으는 시간
+    # 최근 수신 (source, issue_id, event_id) 캐시 — 같은 이벤트 재전송은 DB 없이 duplicate 응답 (0이면 끔)
+    webhook_dedupe_cache_size: int = 10_000
+    webhook_dedupe_ttl_seconds: float = 300.0
+
     # Dooray webhook (DB settings 테이블에서 관리)
 
 
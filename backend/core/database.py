@@ -1,23 +1,139 @@
+import asyncio
+import math
 from contextlib import asynccontextmanager
 from contextvars import ContextVar
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, make_url
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
+from core import blobs
 from core.config import settings
 
-# 현재 요청의 DB 세션 (미들웨어가 설정, Repository가 사용)
+# 명시적으로 연 DB 세션 (db_context / db_write_context, 테스트가 설정)
 db_session: ContextVar[AsyncSession] = ContextVar("db_session")
 
 
+class LazySession:
+    """HTTP 요청 스코프 세션 자리. Repository가 처음 접근할 때 세션 생성 (미들웨어가 설정)"""
+
+    __slots__ = ("session",)
+
+    def __init__(self) -> None:
+        self.session: AsyncSession | None = None
+
+
+request_session: ContextVar[LazySession] = ContextVar("request_session")
+
+# 프로세스 내 쓰기 트랜잭션 직렬화 (db_write_context, SQLite만)
+# SQLite는 writer가 하나뿐이라, 같은 프로세스의 writer끼리는 busy 대기 대신 락으로 줄 세움
+_write_lock = asyncio.Lock()
+
+
 def get_database_url() -> str:
-    """SQLite 비동기 URL 생성"""
-    return f"sqlite+aiosqlite:///{settings.database_path}"
+    """DATABASE_URL이 있으면 그대로, 없으면 database_path의 SQLite 비동기 URL"""
+    return settings.database_url or f"sqlite+aiosqlite:///{settings.database_path}"
+
+
+def is_sqlite() -> bool:
+    """현재 엔진이 SQLite인지 (PRAGMA/FTS5/writer 락 등 SQLite 전용 경로 분기)"""
+    return engine.dialect.name == "sqlite"
+
+
+def insert_on_conflict(table):
+    """ON CONFLICT upsert용 INSERT. SQLite/PostgreSQL 모두 on_conflict_do_update/do_nothing, excluded 사용법이 같음"""
+    return sqlite_insert(table) if is_sqlite() else pg_insert(table)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """커넥션마다 적용하는 SQLite PRAGMA
+
+    - auto_vacuum=INCREMENTAL: 삭제로 생긴 free 페이지를 incremental_vacuum으로 조금씩 반환
+      (새 DB에만 적용됨 — WAL 전환 전에 설정해야 하고, 기존 DB는 VACUUM 한 번 필요)
+    - WAL: reader가 writer를 막지 않음 (대시보드 조회 중에도 worker/webhook 쓰기 가능)
+    - synchronous=NORMAL: WAL에서는 안전하며 commit마다 fsync 하지 않음
+    - busy_timeout: "database is locked" 대신 락 해제까지 대기
+    - mmap/cache: 읽기 I/O 감소
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _ensure_math_functions(dbapi_connection, connection_record) -> None:
+    """job 우선순위 점수에 쓰는 exp/ln 보장.
+
+    SQLite 빌드에 math 함수(SQLITE_ENABLE_MATH_FUNCTIONS)가 없으면 Python 함수로 등록.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT exp(0), ln(1)")
+    except Exception:
+        dbapi_connection.create_function("exp", 1, math.exp, deterministic=True)
+        dbapi_connection.create_function("ln", 1, math.log, deterministic=True)
+    finally:
+        cursor.close()
+
+
+def _register_blob_text(dbapi_connection, connection_record) -> None:
+    """blob_text(codec, data): blobs 값을 SQL 안에서 풀기 (검색 인덱스 뷰 *_search_source가 사용)"""
+    def blob_text(codec: str | None, data: bytes | None) -> str | None:
+        return blobs.decode(codec, data) if data is not None else None
+
+    dbapi_connection.create_function("blob_text", 2, blob_text, deterministic=True)
+
+
+def _begin_transaction(conn) -> None:
+    """db_write_context 트랜잭션은 BEGIN IMMEDIATE로 시작.
+
+    DEFERRED 트랜잭션이 읽기 후 쓰기로 승격할 때의 SQLITE_BUSY는 busy_timeout으로도
+    해결되지 않으므로, 쓰기 경로는 처음부터 write 락을 잡음.
+    """
+    if conn.get_execution_options().get("sqlite_begin") == "IMMEDIATE":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_engine(url: str | None = None, *, tuned: bool = True) -> AsyncEngine:
+    """엔진 생성. tuned=False는 PRAGMA 적용 전 기본 동작 (벤치마크 비교용)
+
+    PostgreSQL은 노드마다 pool_size + max_overflow개까지 커넥션을 열고, 끊긴 커넥션은 pre_ping으로 교체.
+    세션 타임존은 UTC (date(created_at) 집계가 SQLite와 같도록).
+    """
+    url = url or get_database_url()
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_async_engine(
+            url,
+            echo=False,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True,
+            connect_args={"server_settings": {"timezone": "UTC"}},
+        )
+    engine = create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    event.listen(engine.sync_engine, "connect", _ensure_math_functions)
+    event.listen(engine.sync_engine, "connect", _register_blob_text)
+    if tuned:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        event.listen(engine.sync_engine, "begin", _begin_transaction)
+    return engine
 
 
-engine = create_async_engine(
-    get_database_url(),
-    echo=False,
-)
+engine = create_engine()
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -27,16 +143,19 @@ AsyncSessionLocal = async_sessionmaker(
 
 
 async def init_db():
-    """DB 초기화 (테이블 생성)"""
+    """DB 초기화 (테이블 생성 + 마이그레이션)"""
+    from core.migrations import run_migrations
     from models.job import Base
     import models.project  # noqa: F401 - Base에 ProjectModel 등록
     import models.setting  # noqa: F401 - Base에 SettingModel 등록
+    import repositories.change  # noqa: F401 - Base에 ChangeCounterModel 등록 + 변경 카운터 hook
 
-    # 디렉토리 생성
-    settings.database_path.parent.mkdir(parents=True, exist_ok=True)
+    if is_sqlite() and not settings.database_url:
+        settings.database_path.parent.mkdir(parents=True, exist_ok=True)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
 
 
 @asynccontextmanager
@@ -54,10 +173,73 @@ async def db_context():
             db_session.reset(token)
 
 
+@asynccontextmanager
+async def db_write_context():
+    """쓰기 전용 DB 세션 컨텍스트 매니저 (직렬화된 writer 경로)
+
+    SQLite: 프로세스 내 writer 락을 잡고 BEGIN IMMEDIATE 트랜잭션으로 실행.
+    PostgreSQL: writer가 동시에 실행되므로 일반 트랜잭션 (충돌은 행 락/SKIP LOCKED/compare-and-set으로 처리).
+    블록 안에서는 짧은 쓰기만 수행할 것 (API 호출 등 대기 작업 금지).
+    """
+    if not is_sqlite():
+        async with db_context() as session:
+            yield session
+        return
+    async with _write_lock:
+        async with AsyncSessionLocal() as session:
+            await session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+            token = db_session.set(session)
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                db_session.reset(token)
+
+
+async def incremental_vacuum(pages: int) -> int | None:
+    """free 페이지를 최대 pages개 파일에서 반환하고 남은 free 페이지 수 반환.
+
+    auto_vacuum=INCREMENTAL이 아닌 DB(또는 SQLite가 아니면) 아무것도 하지 않고 None.
+    writer 락을 잡고 짧게 실행 (페이지 수로 한 번에 걸리는 시간을 제한).
+    """
+    if not is_sqlite():
+        return None
+    async with _write_lock:
+        async with engine.connect() as conn:
+            if (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar() != 2:
+                return None
+            # execute()는 PRAGMA를 한 step(1페이지)만 실행하므로 executescript로 끝까지 실행
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+            return (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar()
+
+
+async def vacuum() -> None:
+    """전체 VACUUM (auto_vacuum=INCREMENTAL 적용 + 파일 축소, SQLite 전용). 파일 전체를 다시 쓰므로 운영 중에는 피할 것"""
+    async with _write_lock:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM")
+
+
+def current_session() -> AsyncSession:
+    """Repository가 사용할 세션. 명시적 세션이 우선이고, 없으면 요청 스코프 세션을 지연 생성"""
+    session = db_session.get(None)
+    if session is not None:
+        return session
+    lazy = request_session.get()
+    if lazy.session is None:
+        lazy.session = AsyncSessionLocal()
+    return lazy.session
+
+
 def reset_engine():
     """엔진 재설정 (테스트용)"""
     global engine, AsyncSessionLocal
-    engine = create_async_engine(get_database_url(), echo=False)
+    engine = create_engine()
     AsyncSessionLocal = async_sessionmaker(
         engine,
         class_=AsyncSession,
@@ -0,0 +1,34 @@
+"""조건부 GET (ETag / If-None-Match)
+
+응답 본문 대신 싼 validator(updated_at, 마지막 sequence, 변경 카운터)로 ETag를 만들어,
+일치하면 조회/직렬화 없이 304를 반환.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # weak 비교: W/ 접두어 무시
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def check_etag(request: Request, response: Response, *parts) -> Response | None:
+    """ETag를 응답 헤더에 설정. If-None-Match와 일치하면 304 응답 반환 (호출자는 그대로 return)"""
+    etag = make_etag(*parts)
+    # no-cache: 브라우저가 캐시해 두고 매번 If-None-Match로 재검증
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
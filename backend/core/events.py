@@ -0,0 +1,163 @@
+"""프로세스 내 이벤트 pub/sub - 대시보드 SSE 스트림(/api/events)용
+
+Repository는 세션에 이벤트를 쌓아두고(queue_event), 트랜잭션이 commit된 뒤에만 발행.
+rollback된 변경은 발행되지 않으므로 클라이언트가 이벤트를 받고 다시 조회하면 항상 반영된 상태를 봄.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 타입
+JOB_CREATED = "job.created"
+JOB_UPDATED = "job.updated"
+JOBS_ARCHIVED = "job.archived"
+TASK_APPENDED = "task.appended"
+TASKS_PRUNED = "retention.tasks_pruned"  # 보존 정리로 task content 삭제 (task 목록 ETag 무효화)
+PROJECT_CREATED = "project.created"
+PROJECT_DELETED = "project.deleted"
+WORKER_STATUS = "worker.status"
+RESET = "reset"  # Last-Event-ID 이후 이벤트를 재생할 수 없음 → 클라이언트가 전체 재조회
+
+_SESSION_KEY = "pending_events"
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+@dataclass
+class Event:
+    id: str
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        payload = orjson.dumps(self.data, default=str)
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (self.id.encode(), self.type.encode(), payload)
+
+
+@dataclass(eq=False)
+class Subscription:
+    """연결 하나의 bounded 버퍼. 가득 차면 overflowed로 표시하고 스트림 종료.
+
+    느린 클라이언트 때문에 메모리가 무한히 늘지 않도록 버리고,
+    클라이언트는 Last-Event-ID로 재접속해 history에서 이어받음.
+    """
+
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(settings.event_queue_size))
+    overflowed: bool = False
+
+    def offer(self, ev: Event) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(ev)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBus:
+    def __init__(self, history_size: int | None = None):
+        # 재시작 후 이전 프로세스의 Last-Event-ID와 섞이지 않도록 id에 부팅 시각 포함
+        self._epoch = format(int(time.time() * 1000), "x")
+        self._seq = 0
+        self._history: deque[Event] = deque(maxlen=history_size or settings.event_history_size)
+        self._subscribers: set[Subscription] = set()
+        # 프로세스 내 동기 리스너 (캐시 무효화 등). SSE 구독과 달리 버퍼 없이 publish 안에서 바로 호출
+        self._listeners: list[Callable[[Event], None]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, type: str, data: dict) -> Event:
+        self._seq += 1
+        ev = Event(id=f"{self._epoch}-{self._seq}", type=type, data=data)
+        self._history.append(ev)
+        for sub in self._subscribers:
+            sub.offer(ev)
+        for listener in self._listeners:
+            try:
+                listener(ev)
+            except Exception:
+                logger.exception("Event listener failed: %s", ev.type)
+        return ev
+
+    def add_listener(self, listener: Callable[[Event], None]) -> None:
+        self._listeners.append(listener)
+
+    def subscribe(self, last_event_id: str | None = None) -> Subscription:
+        """구독 시작. last_event_id 이후 history를 먼저 버퍼에 채움"""
+        sub = Subscription()
+        if last_event_id:
+            missed = self._replay(last_event_id)
+            if missed is None:
+                sub.offer(Event(id=self._last_id(), type=RESET, data={}))
+            else:
+                for ev in missed:
+                    sub.offer(ev)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def _last_id(self) -> str:
+        return f"{self._epoch}-{self._seq}"
+
+    def _replay(self, last_event_id: str) -> list[Event] | None:
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq >= self._seq:
+            return []
+        oldest = self._seq - len(self._history) + 1
+        if seq + 1 < oldest:
+            return None  # history에서 밀려남
+        return list(self._history)[seq + 1 - oldest:]
+
+
+# 싱글톤
+event_bus = EventBus()
+
+
+def queue_event(session, type: str, data: dict) -> None:
+    """현재 트랜잭션이 commit되면 발행할 이벤트 등록 (AsyncSession/Session 모두 가능)"""
+    session.info.setdefault(_SESSION_KEY, []).append((type, data))
+
+
+def pending_topics(session) -> set[str]:
+    """현재 트랜잭션이 등록한 이벤트의 토픽 (이벤트 타입의 "." 앞부분: job, task, project ...)"""
+    return {type.partition(".")[0] for type, _ in session.info.get(_SESSION_KEY, ())}
+
+
+def call_after_commit(session, callback: Callable[[], None]) -> None:
+    """현재 트랜잭션이 commit되면 실행할 콜백 등록 (rollback되면 버림)"""
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    for type, data in session.info.pop(_SESSION_KEY, ()):
+        event_bus.publish(type, data)
+    for callback in session.info.pop(_CALLBACKS_KEY, ()):
+        try:
+            callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+    session.info.pop(_CALLBACKS_KEY, None)
@@ -1,24 +1,42 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core import database
 
 
-class DBSessionMiddleware(BaseHTTPMiddleware):
-    """요청마다 DB 세션 생성 → ContextVar 저장 → commit/rollback"""
+class DBSessionMiddleware:
+    """요청 스코프 DB 세션 (pure ASGI) - Repository가 처음 접근할 때 생성 → commit/rollback
 
-    async def dispatch(self, request: Request, call_next):
-        async with database.AsyncSessionLocal() as session:
-            token = database.db_session.set(session)
-            try:
-                response = await call_next(request)
-                if response.status_code < 400:
-                    await session.commit()
+    응답 시작(http.response.start) 직전에 상태 코드로 commit(< 400) / rollback을 결정하므로
+    클라이언트는 항상 commit된 뒤에 응답을 받음. DB를 쓰지 않는 요청(/health 등)은 세션을 만들지 않음.
+    BaseHTTPMiddleware와 달리 요청마다 태스크/스트림을 추가로 만들지 않아 StreamingResponse(SSE)도 그대로 전달.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lazy = database.LazySession()
+        token = database.request_session.set(lazy)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and lazy.session is not None:
+                if message["status"] < 400:
+                    await lazy.session.commit()
                 else:
-                    await session.rollback()
-                return response
-            except Exception:
-                await session.rollback()
-                raise
-            finally:
-                database.db_session.reset(token)
+                    await lazy.session.rollback()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if lazy.session is not None:
+                await lazy.session.rollback()
+            raise
+        finally:
+            if lazy.session is not None:
+                await lazy.session.close()
+            database.request_session.reset(token)
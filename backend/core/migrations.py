@@ -0,0 +1,240 @@
+"""기존 SQLite DB 스키마 마이그레이션
+
+create_all은 없는 테이블만 만들고, 기존 테이블의 인덱스/컬럼은 건드리지 않음.
+그래서 스키마 변경은 여기에 순서대로 추가하고 PRAGMA user_version으로 적용 여부를 기록.
+각 단계는 새로 만든 DB(create_all 직후)에서도 그대로 실행되므로 멱등이어야 함.
+"""
+
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import Connection, text
+
+from core import blobs
+from core.config import settings
+from models.job import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _create_indexes(conn: Connection, table: str, *names: str) -> None:
+    """모델에 선언된 인덱스 중 names만 생성 (이미 있으면 건너뜀)
+
+    테이블 전체 인덱스를 만들면 이후 단계에서 추가될 컬럼의 인덱스까지 만들려다 실패하므로
+    각 단계는 자기 인덱스만 이름으로 지정.
+    """
+    indexes = {index.name: index for index in Base.metadata.tables[table].indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+def _v1_composite_indexes(conn: Connection) -> None:
+    """큐/목록/작업 히스토리 조회용 복합 인덱스, job_tasks (job_id, sequence) unique"""
+    # 동시 add_task로 생긴 sequence 중복이 있으면 unique 인덱스 생성 전에 재번호
+    duplicated = conn.execute(text(
+        "SELECT 1 FROM job_tasks GROUP BY job_id, sequence HAVING COUNT(*) > 1 LIMIT 1"
+    )).first()
+    if duplicated:
+        logger.warning("[migration] Resequencing job_tasks with duplicated sequence numbers")
+        conn.execute(text("""
+            CREATE TEMP TABLE _job_tasks_reseq AS
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY job_id ORDER BY sequence, created_at, id
+            ) AS seq
+            FROM job_tasks
+            WHERE job_id IN (
+                SELECT job_id FROM job_tasks GROUP BY job_id, sequence HAVING COUNT(*) > 1
+            )
+        """))
+        conn.execute(text("""
+            UPDATE job_tasks
+            SET sequence = (SELECT seq FROM _job_tasks_reseq r WHERE r.id = job_tasks.id)
+            WHERE id IN (SELECT id FROM _job_tasks_reseq)
+        """))
+        conn.execute(text("DROP TABLE _job_tasks_reseq"))
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_jobs_status"))        # idx_jobs_queue가 대체
+    conn.execute(text("DROP INDEX IF EXISTS idx_job_tasks_job_id"))   # uq_job_tasks_job_sequence가 대체
+    _create_indexes(conn, "jobs", "idx_jobs_queue", "idx_jobs_created_at", "idx_jobs_project_created_at")
+    _create_indexes(conn, "job_tasks", "uq_job_tasks_job_sequence")
+
+
+def _v2_keyset_indexes(conn: Connection) -> None:
+    """목록 인덱스에 id 추가 ((created_at, id) keyset 페이징)"""
+    for name in ("idx_jobs_queue", "idx_jobs_created_at", "idx_jobs_project_created_at"):
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    _create_indexes(conn, "jobs", "idx_jobs_queue", "idx_jobs_created_at", "idx_jobs_project_created_at")
+
+
+def _v3_occurrence_columns(conn: Connection) -> None:
+    """jobs 발생 빈도 컬럼 (occurrence_count, first_seen, last_seen, event_rate)"""
+    existing = {row[1] for row in conn.execute(text("PRAGMA table_info(jobs)"))}
+    for column, ddl in (
+        ("occurrence_count", "INTEGER NOT NULL DEFAULT 1"),
+        ("first_seen", "DATETIME"),
+        ("last_seen", "DATETIME"),
+        ("event_rate", "FLOAT NOT NULL DEFAULT 0"),
+    ):
+        if column not in existing:
+            conn.execute(text(f"ALTER TABLE jobs ADD COLUMN {column} {ddl}"))
+    conn.execute(text("""
+        UPDATE jobs
+        SET first_seen = COALESCE(first_seen, created_at),
+            last_seen = COALESCE(last_seen, created_at)
+        WHERE first_seen IS NULL OR last_seen IS NULL
+    """))
+
+
+def _v4_externalize_blobs(conn: Connection, batch_size: int = 500) -> None:
+    """큰 raw_payload/stacktrace/task content를 압축해 blobs 테이블로 이동 (절약한 용량 로그)"""
+    for table, column in (("jobs", "raw_payload_blob"), ("jobs", "stacktrace_blob"), ("job_tasks", "content_blob")):
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+        if column not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} VARCHAR(64)"))
+
+    moved = original_bytes = stored_bytes = 0
+    for table, column in (("jobs", "raw_payload"), ("jobs", "stacktrace"), ("job_tasks", "content")):
+        last_id = ""
+        while True:
+            rows = conn.execute(
+                text(f"""
+                    SELECT id, {column} FROM {table}
+                    WHERE id > :last_id AND length(CAST({column} AS BLOB)) > :limit
+                    ORDER BY id LIMIT :batch
+                """),
+                {"last_id": last_id, "limit": settings.blob_inline_max_bytes, "batch": batch_size},
+            ).all()
+            if not rows:
+                break
+            for row_id, value in rows:
+                _, pending = blobs.split(value)
+                blob = pending.row()
+                inserted = conn.execute(
+                    text("""
+                        INSERT INTO blobs (hash, codec, size, data) VALUES (:hash, :codec, :size, :data)
+                        ON CONFLICT (hash) DO NOTHING
+                    """),
+                    blob,
+                ).rowcount
+                conn.execute(
+                    text(f"UPDATE {table} SET {column} = NULL, {column}_blob = :hash WHERE id = :id"),
+                    {"hash": blob["hash"], "id": row_id},
+                )
+                moved += 1
+                original_bytes += blob["size"]
+                stored_bytes += len(blob["data"]) if inserted else 0
+            last_id = rows[-1][0]
+
+    if moved:
+        page_size = conn.execute(text("PRAGMA page_size")).scalar()
+        free_pages = conn.execute(text("PRAGMA freelist_count")).scalar()
+        logger.info(
+            "[migration] Moved %d values to blobs: %.1f MB -> %.1f MB compressed (saved %.1f MB, "
+            "%.1f MB free pages reusable; VACUUM to shrink the file)",
+            moved, original_bytes / 1e6, stored_bytes / 1e6, (original_bytes - stored_bytes) / 1e6,
+            page_size * free_pages / 1e6,
+        )
+
+
+def _v5_retention_indexes(conn: Connection) -> None:
+    """보존 정리용 partial 인덱스 (오래된 task content, blob 참조)"""
+    _create_indexes(conn, "jobs", "idx_jobs_stacktrace_blob", "idx_jobs_raw_payload_blob")
+    _create_indexes(conn, "job_tasks", "idx_job_tasks_retention", "idx_job_tasks_content_blob")
+
+
+def _v6_search_index(conn: Connection) -> None:
+    """FTS5 검색 인덱스 (jobs: 제목/메시지/예외 타입/파일/스택, job_tasks: label/content)
+
+    external content — 본문은 원래 테이블에서 읽고(blob은 blob_text()로 풀어서) 인덱스에는 토큰만 저장.
+    """
+    conn.execute(text("""
+        CREATE VIEW IF NOT EXISTS jobs_search_source AS
+        SELECT j.rowid AS doc_id, j.id, j.title, j.message, j.exception_type, j.filename,
+               COALESCE(j.stacktrace, blob_text(b.codec, b.data)) AS stacktrace
+        FROM jobs j LEFT JOIN blobs b ON b.hash = j.stacktrace_blob
+    """))
+    conn.execute(text("""
+        CREATE VIEW IF NOT EXISTS job_tasks_search_source AS
+        SELECT t.rowid AS doc_id, t.id, t.job_id, t.label,
+               COALESCE(t.content, blob_text(b.codec, b.data)) AS content
+        FROM job_tasks t LEFT JOIN blobs b ON b.hash = t.content_blob
+    """))
+    for fts, columns, source, weights in (
+        ("jobs_fts", "title, message, exception_type, filename, stacktrace", "jobs_search_source", "10, 4, 4, 4, 1"),
+        ("job_tasks_fts", "label, content", "job_tasks_search_source", "2, 1"),
+    ):
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{columns}, content='{source}', content_rowid='doc_id')"
+        ))
+        # ORDER BY rank = 컬럼 가중치 bm25 (제목/label 일치 우선)
+        conn.execute(text(f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({weights})')"))
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _v7_job_stats(conn: Connection) -> None:
+    """jobs.previous_status 컬럼, job_stats 집계 채우기 (테이블은 create_all이 생성, 이후 증감은 JobRepository가)
+
+    처음 배포된 v7은 reopened_from 컬럼을 추가했음 — 그런 DB는 v8이 이름을 바꿈.
+    """
+    from repositories.stats import rebuild_statements
+
+    existing = {row[1] for row in conn.execute(text("PRAGMA table_info(jobs)"))}
+    if not {"previous_status", "reopened_from"} & existing:
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN previous_status VARCHAR(20)"))
+
+    for stmt in rebuild_statements():
+        conn.execute(stmt)
+
+
+def _v8_token_usage(conn: Connection) -> None:
+    """job_stats에서 일(day)/토큰 차원 제거, 토큰은 사용일별 token_usage로 (테이블은 create_all이 생성)
+
+    - jobs.reopened_from → previous_status (모든 상태 전환이 기록)
+    - 이전 job_stats(프로젝트 × 상태 × 생성일)는 다시 만들고 jobs에서 재집계
+    - token_usage는 job별 누적 토큰을 마지막 변경일(updated_at)에 넣어 채움 (이전 사용일은 기록이 없음)
+    """
+    from models.job import JobStatsModel
+    from repositories.stats import backfill_token_usage_statement, rebuild_statements
+
+    existing = {row[1] for row in conn.execute(text("PRAGMA table_info(jobs)"))}
+    if "reopened_from" in existing:
+        conn.execute(text("ALTER TABLE jobs RENAME COLUMN reopened_from TO previous_status"))
+
+    stats_columns = {row[1] for row in conn.execute(text("PRAGMA table_info(job_stats)"))}
+    if "day" in stats_columns:
+        JobStatsModel.__table__.drop(conn)
+        JobStatsModel.__table__.create(conn)
+        for stmt in rebuild_statements():
+            conn.execute(stmt)
+
+    if conn.execute(text("SELECT 1 FROM token_usage LIMIT 1")).first() is None:
+        conn.execute(backfill_token_usage_statement())
+
+
+# 순서 중요 — 항상 끝에 추가할 것 (index + 1 = user_version)
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _v1_composite_indexes,
+    _v2_keyset_indexes,
+    _v3_occurrence_columns,
+    _v4_externalize_blobs,
+    _v5_retention_indexes,
+    _v6_search_index,
+    _v7_job_stats,
+    _v8_token_usage,
+]
+
+
+def run_migrations(conn: Connection) -> None:
+    """미적용 마이그레이션 실행 (init_db에서 create_all 이후 호출)
+
+    기존 SQLite DB 업그레이드용. PostgreSQL은 create_all이 바로 최신 스키마를 만들므로 건너뜀
+    (FTS5 검색 인덱스, PRAGMA user_version도 SQLite 전용).
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+    for i, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+        logger.info("[migration] Applying v%d: %s", i, migrate.__name__)
+        migrate(conn)
+        conn.execute(text(f"PRAGMA user_version = {i}"))
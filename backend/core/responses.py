@@ -0,0 +1,9 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """기본 응답 클래스 - 표준 json.dumps 대신 orjson으로 bytes 직렬화 (datetime/UUID 등 기본 지원)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
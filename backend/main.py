@@ -4,15 +4,20 @@ import sentry_sdk
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.events import router as events_router
 from api.jobs import router as jobs_router
 from api.projects import router as projects_router
 from api.test_errors import router as test_errors_router
 from api.webhook import router as webhook_router
 from api.setting import router as setting_router
+from api.stats import router as stats_router
 from api.worker import router as worker_router
 from core.config import settings
 from core.database import init_db
 from core.middleware import DBSessionMiddleware
+from core.responses import ORJSONResponse
+from services.ingest import webhook_ingestor
+from services.maintenance import maintenance
 from services.worker_manager import worker_manager
 
 if settings.sentry_dsn:
@@ -26,8 +31,14 @@ if settings.sentry_dsn:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    if settings.webhook_ingest_mode == "queue":
+        webhook_ingestor.start()
     await worker_manager.start()
+    if maintenance.enabled:
+        maintenance.start()
     yield
+    await maintenance.stop()
+    await webhook_ingestor.stop()  # 큐에 남은 웹훅 기록
     if worker_manager.is_running:
         await worker_manager.stop(timeout=10.0)
 
@@ -36,6 +47,7 @@ app = FastAPI(
     title="PR-Bot",
     description="Error tracking webhook → Claude Agent → Auto PR",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
 )
@@ -53,6 +65,8 @@ api_router.include_router(webhook_router, prefix="/webhook", tags=["webhook"])
 api_router.include_router(projects_router, prefix="/projects", tags=["projects"])
 api_router.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(worker_router, prefix="/worker", tags=["worker"])
+api_router.include_router(events_router, prefix="/events", tags=["events"])
+api_router.include_router(stats_router, prefix="/stats", tags=["stats"])
 api_router.include_router(setting_router, prefix="/settings", tags=["settings"])
 api_router.include_router(test_errors_router, prefix="/test-errors", tags=["test-errors"])
 
@@ -0,0 +1,17 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.job import Base
+
+
+class ChangeCounterModel(Base):
+    """토픽(job, project ...)별 변경 카운터 - 목록 ETag용
+
+    해당 토픽 이벤트를 남긴 트랜잭션이 commit 직전에 +1 (repositories/change.py).
+    프로세스 메모리가 아닌 DB에 있으므로 Worker, 관리 CLI, 다른 노드의 변경도 반영됨.
+    """
+
+    __tablename__ = "change_counters"
+
+    topic: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
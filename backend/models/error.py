@@ -23,6 +23,7 @@ class ParsedError(BaseModel):
     source: ErrorSource
     source_project_id: str | None = None  # projects 테이블 조회용
     source_issue_id: str  # 소스별 고유 ID
+    source_event_id: str | None = None  # 수신 이벤트 ID (재전송 판별용, DB에는 저장하지 않음)
 
     # 에러 정보
     title: str                          # issueTitle (N+1 Query) 또는 exception title
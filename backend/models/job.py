@@ -1,8 +1,9 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel, Field
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -20,6 +21,10 @@ class ErrorSource(str, Enum):
     DATADOG = "datadog"
 
 
+# 웹훅 반영 결과 (신규 생성 / DONE·FAILED 재오픈 / 처리 중이라 무시)
+IngestResult = Literal["created", "reopened", "duplicate"]
+
+
 class JobTaskType(str, Enum):
     """에이전트 작업 이벤트 타입"""
     TOOL_USE = "tool_use"        # Claude가 도구 호출
@@ -28,6 +33,11 @@ class JobTaskType(str, Enum):
     STATUS = "status"            # 상태 변경 (processing → done 등)
 
 
+def _where(condition: str) -> dict:
+    """partial 인덱스 조건 (SQLite/PostgreSQL)"""
+    return {"sqlite_where": text(condition), "postgresql_where": text(condition)}
+
+
 # SQLAlchemy Base
 class Base(DeclarativeBase):
     pass
@@ -58,6 +68,7 @@ class JobModel(Base):
     lineno: Mapped[int | None] = mapped_column(Integer, nullable=True)
     function: Mapped[str | None] = mapped_column(String(255), nullable=True)
     stacktrace: Mapped[str | None] = mapped_column(Text, nullable=True)
+    stacktrace_blob: Mapped[str | None] = mapped_column(String(64), nullable=True)  # 크면 blobs.hash (stacktrace는 NULL)
 
     # 작업 결과
     work_branch: Mapped[str | None] = mapped_column(String(255), nullable=True)  # 에이전트 작업 브랜치
@@ -68,17 +79,39 @@ class JobModel(Base):
     output_tokens: Mapped[int] = mapped_column(Integer, default=0)
 
     # Rate limit
-    rate_limited_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    rate_limited_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # 메타
     retry_count: Mapped[int] = mapped_column(Integer, default=0)
     source_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     raw_payload: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+    raw_payload_blob: Mapped[str | None] = mapped_column(String(64), nullable=True)  # 크면 blobs.hash (raw_payload는 NULL)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+    # 발생 빈도 (웹훅 중복 수신마다 갱신, 우선순위 점수에 사용)
+    occurrence_count: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    first_seen: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_seen: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # 반감기(job_rate_half_life_minutes)로 감쇠한 발생 수 (last_seen 시점 기준)
+    event_rate: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    # 마지막 상태 전환 직전 상태 — 전환 UPDATE가 같은 문장에서 기록, RETURNING으로 받아 job_stats 증감에 사용
+    # (RETURNING은 갱신 후 값만 주므로 조회 없이 이전 상태를 알기 위한 컬럼)
+    previous_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
     __table_args__ = (
-        Index("idx_jobs_status", "status"),
+        # get_next_job: status 필터 + created_at 정렬 + projects 조인 컬럼까지 커버
+        # (status, created_at, id) 접두어는 상태 필터 목록의 keyset 페이징에도 사용
+        Index(
+            "idx_jobs_queue",
+            "status", "created_at", "id", "source", "source_project_id", "rate_limited_until",
+        ),
+        # list_job_summaries: (created_at, id) keyset 정렬 (+ 프로젝트 필터)
+        Index("idx_jobs_created_at", "created_at", "id"),
+        Index("idx_jobs_project_created_at", "source_project_id", "created_at", "id"),
+        # 보존 정리: 참조가 없어진 blob 찾기 (NULL이 대부분이라 partial)
+        Index("idx_jobs_stacktrace_blob", "stacktrace_blob", **_where("stacktrace_blob IS NOT NULL")),
+        Index("idx_jobs_raw_payload_blob", "raw_payload_blob", **_where("raw_payload_blob IS NOT NULL")),
         UniqueConstraint("source", "source_issue_id", name="uq_jobs_source_issue"),
     )
 
@@ -98,13 +131,86 @@ class JobTaskModel(Base):
     type: Mapped[str] = mapped_column(String(20), nullable=False)        # JobTaskType
     label: Mapped[str | None] = mapped_column(String(200), nullable=True)  # 사람이 읽을 수 있는 요약 (AI가 저장 시점에 생성)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)     # JSON: 도구명/입력/출력/메시지 등
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+    content_blob: Mapped[str | None] = mapped_column(String(64), nullable=True)  # 크면 blobs.hash (content는 NULL)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+    __table_args__ = (
+        # add_task/list_tasks 조회 + 동시 기록 시 sequence 중복 방지
+        Index("uq_job_tasks_job_sequence", "job_id", "sequence", unique=True),
+        # 보존 정리: content가 남아 있는 오래된 task (정리된 행은 인덱스에서 빠짐)
+        Index(
+            "idx_job_tasks_retention", "created_at",
+            **_where("content IS NOT NULL OR content_blob IS NOT NULL"),
+        ),
+        Index("idx_job_tasks_content_blob", "content_blob", **_where("content_blob IS NOT NULL")),
+    )
+
+
+class JobCheckpointModel(Base):
+    """Executor 대화(messages) 체크포인트
+
+    턴마다 새로 추가된 메시지만 zlib 압축 JSON으로 append.
+    rate limit 후 재개 시 순서대로 이어 붙여 대화를 그대로 복원.
+    """
+
+    __tablename__ = "job_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String(36), ForeignKey("jobs.id"), nullable=False)
+    turn: Mapped[int] = mapped_column(Integer, nullable=False)       # 0 = 최초 프롬프트
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # zlib(JSON: list[MessageParam])
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
 
     __table_args__ = (
-        Index("idx_job_tasks_job_id", "job_id"),
+        UniqueConstraint("job_id", "turn", name="uq_job_checkpoints_job_turn"),
     )
 
 
+class BlobModel(Base):
+    """큰 TEXT 값의 압축 저장소 (jobs.raw_payload/stacktrace, job_tasks.content)
+
+    내용(UTF-8)의 sha256을 키로 한 번만 저장 — 같은 payload/도구 출력은 공유.
+    """
+
+    __tablename__ = "blobs"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 hex (압축 전 내용)
+    codec: Mapped[str] = mapped_column(String(10), nullable=False)    # "zlib"
+    size: Mapped[int] = mapped_column(Integer, nullable=False)        # 압축 전 bytes
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class JobStatsModel(Base):
+    """대시보드 집계 (프로젝트 × 상태 → job 수)
+
+    jobs를 (source, source_project_id, status)로 GROUP BY 한 결과와 같도록
+    생성/상태 전환/삭제와 같은 트랜잭션에서 증감. 어긋나면 StatsRepository.rebuild().
+    """
+
+    __tablename__ = "job_stats"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    source_project_id: Mapped[str] = mapped_column(String(255), primary_key=True)  # NULL이면 ""
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    job_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class TokenUsageModel(Base):
+    """일별 토큰 사용량 (사용일 × 프로젝트 → 토큰 합계)
+
+    add_tokens와 같은 트랜잭션에서 사용한 날(UTC)에 합산. job이 아카이브돼도 남음.
+    day가 PK 맨 앞이라 최근 N일 합계는 기간 안의 행만 읽음.
+    """
+
+    __tablename__ = "token_usage"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    source_project_id: Mapped[str] = mapped_column(String(255), primary_key=True)  # NULL이면 ""
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+
+
 # ── Pydantic Models ──────────────────────────────────────────────
 
 class Job(BaseModel):
@@ -132,6 +238,9 @@ class Job(BaseModel):
     retry_count: int = 0
     source_url: str | None = None
     raw_payload: str | None = None
+    occurrence_count: int = 1
+    first_seen: datetime | None = None
+    last_seen: datetime | None = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
@@ -162,11 +271,90 @@ class Job(BaseModel):
             retry_count=db.retry_count,
             source_url=db.source_url,
             raw_payload=db.raw_payload,
+            occurrence_count=db.occurrence_count or 1,
+            first_seen=db.first_seen,
+            last_seen=db.last_seen,
+            created_at=db.created_at,
+            updated_at=db.updated_at,
+        )
+
+
+class JobSummary(BaseModel):
+    """목록용 Job 요약 (raw_payload/stacktrace/error_log 등 큰 컬럼 제외)"""
+
+    id: str
+    status: JobStatus
+    source: ErrorSource
+    source_project_id: str | None = None
+    source_issue_id: str
+    title: str
+    exception_type: str | None = None
+    level: str | None = None
+    environment: str | None = None
+    retry_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_orm(cls, db: JobModel) -> "JobSummary":
+        return cls(
+            id=db.id,
+            status=JobStatus(db.status),
+            source=ErrorSource(db.source),
+            source_project_id=db.source_project_id,
+            source_issue_id=db.source_issue_id,
+            title=db.title,
+            exception_type=db.exception_type,
+            level=db.level,
+            environment=db.environment,
+            retry_count=db.retry_count,
             created_at=db.created_at,
             updated_at=db.updated_at,
         )
 
 
+# JobSummary.from_orm에서 읽는 컬럼 (나머지는 로드하지 않음)
+JOB_SUMMARY_COLUMNS = (
+    JobModel.id, JobModel.status, JobModel.source, JobModel.source_project_id,
+    JobModel.source_issue_id, JobModel.title, JobModel.exception_type, JobModel.level,
+    JobModel.environment, JobModel.retry_count, JobModel.created_at, JobModel.updated_at,
+)
+
+
+class JobPage(BaseModel):
+    """keyset 페이지. next_cursor가 None이면 마지막 페이지"""
+
+    items: list[JobSummary]
+    next_cursor: str | None = None
+
+
+class JobSearchMatch(BaseModel):
+    """검색 일치 문서 하나. sequence가 None이면 job 필드(제목/메시지/예외 타입/파일/스택)"""
+
+    sequence: int | None = None
+    type: JobTaskType | None = None
+    label: str | None = None
+    score: float
+    snippet: str
+    highlights: list[tuple[int, int]] = []  # snippet 안의 일치 구간 [start, end)
+
+
+class JobSearchHit(BaseModel):
+    job: JobSummary
+    score: float  # -bm25, 높을수록 관련
+    matches: list[JobSearchMatch]
+
+
+class ProjectJobStats(BaseModel):
+    """프로젝트별 집계 (GET /stats, job_stats/token_usage만 읽음)"""
+
+    source: str
+    source_project_id: str | None = None
+    counts: dict[JobStatus, int] = {}  # 현재 상태별 job 수
+    input_tokens: int = 0   # 최근 days일 동안 사용한 토큰 합계
+    output_tokens: int = 0
+
+
 class JobTask(BaseModel):
     id: str
     job_id: str
@@ -187,3 +375,27 @@ class JobTask(BaseModel):
             content=db.content,
             created_at=db.created_at,
         )
+
+
+class JobTaskSummary(BaseModel):
+    """타임라인 목록용 task (content 제외, 길이만)"""
+
+    id: str
+    job_id: str
+    sequence: int
+    type: JobTaskType
+    label: str | None = None
+    content_length: int = 0
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row) -> "JobTaskSummary":
+        return cls(
+            id=row.id,
+            job_id=row.job_id,
+            sequence=row.sequence,
+            type=JobTaskType(row.type),
+            label=row.label,
+            content_length=row.content_length,
+            created_at=row.created_at,
+        )
@@ -1,9 +1,53 @@
 """Claude Agent 시스템/유저 프롬프트 빌더"""
 
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from models.job import Job
+from services.source_context import SourceContext, detect_language, extract_context
+
+
+# ── Token Budget ──────────────────────────────────────────────────
+
+# 플랜 프롬프트 소스 컨텍스트 단계 (우선순위 높은 순)
+TIER_FULL_FILE = "full_file"
+TIER_SOURCE_CONTEXT = "source_context"
+TIER_FUNCTION_WINDOW = "function_window"
+TIER_FRAME_CONTEXT = "frame_context"
+PLAN_TIERS = (TIER_FULL_FILE, TIER_SOURCE_CONTEXT, TIER_FUNCTION_WINDOW, TIER_FRAME_CONTEXT)
+
+# 이 줄 수 이하 파일만 전체를 후보로 넣음 (그 이상은 source_context부터)
+FULL_FILE_MAX_LINES = 300
+
+# 실행 프롬프트 단계
+TIER_FULL_PLAN = "full_plan"
+TIER_TRUNCATED_PLAN = "truncated_plan"
+
+
+def estimate_tokens(text: str) -> int:
+    """로컬 토큰 수 추정 (보수적).
+
+    ASCII는 약 4자당 1토큰, 그 외(한글 등)는 1자당 1토큰으로 계산.
+    count_tokens 엔드포인트를 쓸 수 없거나 호출 전 1차 필터로 사용.
+    """
+    non_ascii = sum(1 for c in text if not c.isascii())
+    return (len(text) - non_ascii) // 4 + non_ascii + 1
+
+
+@dataclass
+class BudgetedPrompt:
+    """예산에 맞춰 선택된 프롬프트와 그 결정 내역"""
+
+    text: str
+    tier: str
+    tokens: int
+    budget: int
+    dropped: list[str] = field(default_factory=list)  # 예산 초과로 건너뛴 단계
+
+    @property
+    def fits(self) -> bool:
+        return self.tokens <= self.budget
 
 
 # ── Planner (Opus) ────────────────────────────────────────────────
@@ -31,8 +75,24 @@ Rules:
 """
 
 
-def build_plan_prompt(job: Job, file_content: str | None) -> str:
-    """Opus용 플랜 프롬프트: 에러 정보 + 파일 내용"""
+def build_plan_prompt(
+    job: Job,
+    file_content: str | None,
+    *,
+    tier: str = TIER_FULL_FILE,
+    context: SourceContext | None = None,
+) -> str:
+    """Opus용 플랜 프롬프트: 에러 정보 + 소스 컨텍스트
+
+    tier로 소스 컨텍스트 범위 결정:
+    full_file(전체 파일) → source_context(감싸는 함수 + import + 참조 정의)
+    → function_window(감싸는 함수만) → frame_context(스택 프레임 주변 줄만)
+    context를 넘기지 않으면 file_content에서 직접 추출.
+    """
+    language = detect_language(job.filename)
+    if context is None and file_content and tier in (TIER_SOURCE_CONTEXT, TIER_FUNCTION_WINDOW):
+        context = extract_context(file_content, job.lineno, job.filename)
+
     parts = [
         "## Error Report",
         "",
@@ -70,7 +130,7 @@ def build_plan_prompt(job: Job, file_content: str | None) -> str:
                 parts += [
                     "",
                     "**Code Context** (lines around the error):",
-                    "```python",
+                    f"```{language}",
                     pre,
                     f">>> {ctx}  # ← error here",
                     post,
@@ -79,15 +139,46 @@ def build_plan_prompt(job: Job, file_content: str | None) -> str:
         except Exception:
             pass
 
-    if file_content:
+    if file_content and tier == TIER_FULL_FILE:
         parts += [
             "",
             f"**Full Source File** (`{job.filename}`):",
-            "```python",
+            f"```{language}",
             file_content,
             "```",
         ]
-    elif job.filename:
+    elif context and tier in (TIER_SOURCE_CONTEXT, TIER_FUNCTION_WINDOW):
+        name = f" — `{context.region_name}`" if context.region_name else ""
+        if tier == TIER_SOURCE_CONTEXT and context.imports:
+            parts += [
+                "",
+                f"**Imports** (`{job.filename}`):",
+                f"```{language}",
+                context.imports,
+                "```",
+            ]
+        parts += [
+            "",
+            f"**Enclosing Code** (`{job.filename}` lines {context.region_start}-{context.region_end}{name}):",
+            f"```{language}",
+            context.region,
+            "```",
+        ]
+        if tier == TIER_SOURCE_CONTEXT:
+            for d in context.definitions:
+                parts += [
+                    "",
+                    f"**Referenced Definition** `{d.name}` (line {d.start}):",
+                    f"```{language}",
+                    d.code,
+                    "```",
+                ]
+        parts += [
+            "",
+            f"파일 전체({context.total_lines}줄) 대신 에러 지점과 관련된 부분만 발췌했습니다. "
+            "다른 부분이 필요하면 플랜에 확인할 위치를 명시하세요.",
+        ]
+    elif job.filename and not file_content:
         # file_content가 없으면 (경로 불일치 등) 파일 탐색 지시
         parts += [
             "",
@@ -105,6 +196,24 @@ def build_plan_prompt(job: Job, file_content: str | None) -> str:
     return "\n".join(parts)
 
 
+def plan_prompt_candidates(job: Job, file_content: str | None) -> list[tuple[str, str]]:
+    """예산 적용용 플랜 프롬프트 후보 (우선순위 높은 순, 동일 결과 중복 제거).
+
+    큰 파일(FULL_FILE_MAX_LINES 초과)은 전체 파일 후보를 만들지 않음.
+    """
+    context = extract_context(file_content, job.lineno, job.filename) if file_content else None
+    tiers = PLAN_TIERS
+    if context and context.total_lines > FULL_FILE_MAX_LINES:
+        tiers = tiers[1:]
+
+    candidates: list[tuple[str, str]] = []
+    for tier in tiers:
+        text = build_plan_prompt(job, file_content, tier=tier, context=context)
+        if not candidates or candidates[-1][1] != text:
+            candidates.append((tier, text))
+    return candidates
+
+
 # ── Executor (Sonnet) ─────────────────────────────────────────────
 
 EXECUTOR_SYSTEM_PROMPT = """\
@@ -129,8 +238,24 @@ Rules:
 """
 
 
-def build_execute_prompt(job: Job, repo_dir: Path, work_branch: str, plan: str) -> str:
-    """Sonnet용 실행 프롬프트: 에러 요약 + Opus 플랜"""
+def build_execute_prompt(
+    job: Job,
+    repo_dir: Path,
+    work_branch: str,
+    plan: str,
+    *,
+    max_plan_tokens: int | None = None,
+) -> str:
+    """Sonnet용 실행 프롬프트: 에러 요약 + Opus 플랜
+
+    max_plan_tokens가 주어지면 플랜 앞부분만 남기고 잘라냄 (estimate_tokens 기준).
+    """
+    if max_plan_tokens is not None and estimate_tokens(plan) > max_plan_tokens:
+        keep = len(plan)
+        while keep > 0 and estimate_tokens(plan[:keep]) > max_plan_tokens:
+            keep = keep * 3 // 4
+        plan = plan[:keep].rstrip() + "\n\n... (플랜이 길어 이후 내용은 생략됨 — 위 내용을 기준으로 수정하세요)"
+
     return "\n".join([
         "## Error Summary",
         "",
@@ -149,3 +274,48 @@ def build_execute_prompt(job: Job, repo_dir: Path, work_branch: str, plan: str)
         "",
         "Implement the fix plan above and commit your changes.",
     ])
+
+
+def execute_prompt_candidates(
+    job: Job,
+    repo_dir: Path,
+    work_branch: str,
+    plan: str,
+    budget: int,
+    prev_context: str | None = None,
+) -> list[tuple[str, str]]:
+    """예산 적용용 실행 프롬프트 후보: 전체 플랜 → 잘린 플랜
+
+    prev_context(rate limit 재개 시 이전 진행 내역)는 모든 후보 끝에 붙이고 그만큼 플랜 예산을 줄임.
+    진행 내역은 최근 것부터 예산의 절반까지만 남김.
+    """
+    progress = ""
+    if prev_context:
+        prev_context = _tail_within(prev_context, budget // 2)
+        progress = (
+            "\n\n## Previous Progress (rate limit로 중단됨)\n"
+            "이전 작업에서 아래 진행 내역이 있습니다. 이어서 작업하세요.\n\n"
+            f"{prev_context}"
+        )
+    full = build_execute_prompt(job, repo_dir, work_branch, plan) + progress
+    overhead = estimate_tokens(full) - estimate_tokens(plan)
+    max_plan = max(budget - estimate_tokens(EXECUTOR_SYSTEM_PROMPT) - overhead, 256)
+    truncated = build_execute_prompt(job, repo_dir, work_branch, plan, max_plan_tokens=max_plan) + progress
+    candidates = [(TIER_FULL_PLAN, full)]
+    if truncated != full:
+        candidates.append((TIER_TRUNCATED_PLAN, truncated))
+    return candidates
+
+
+def _tail_within(text: str, max_tokens: int) -> str:
+    """max_tokens 안에 드는 마지막 줄들 (앞부분을 버렸으면 표시)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept: list[str] = []
+    total = 0
+    for line in reversed(text.splitlines()):
+        total += estimate_tokens(line)
+        if total > max_tokens:
+            break
+        kept.append(line)
+    return "... (이전 진행 내역 앞부분 생략)\n" + "\n".join(reversed(kept))
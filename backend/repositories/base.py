@@ -1,9 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import db_session
+from core.database import current_session
+from core.events import call_after_commit, queue_event
 
 
 class BaseRepository:
     @property
     def session(self) -> AsyncSession:
-        return db_session.get()
+        return current_session()
+
+    def queue_event(self, type: str, data: dict) -> None:
+        """commit 후 /api/events로 발행할 이벤트 등록"""
+        queue_event(self.session, type, data)
+
+    def after_commit(self, callback) -> None:
+        """commit 후 실행할 콜백 등록 (프로세스 내 캐시 갱신 등)"""
+        call_after_commit(self.session, callback)
@@ -0,0 +1,87 @@
+from collections.abc import Iterable
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core import blobs, database
+from core.blobs import PendingBlob
+from models.job import BlobModel, JobModel, JobTaskModel
+from repositories.base import BaseRepository
+
+
+class BlobRepository(BaseRepository):
+    async def put(self, pending: Iterable[PendingBlob | None]) -> None:
+        """blob 저장. 이미 있는 해시는 압축/기록 생략.
+
+        PostgreSQL에서는 있는 blob을 FOR KEY SHARE로 잠가, 이 트랜잭션이 참조를 commit하기 전에
+        delete_unreferenced(후보를 FOR UPDATE SKIP LOCKED로 잠금)가 지우지 못하게 함.
+        SQLite는 쓰기 트랜잭션이 직렬화되므로 잠금 절은 무시됨.
+        """
+        by_hash = {b.hash: b for b in pending if b is not None}
+        if not by_hash:
+            return
+        result = await self.session.execute(
+            select(BlobModel.hash).where(BlobModel.hash.in_(by_hash)).with_for_update(read=True, key_share=True)
+        )
+        for existing in result.scalars():
+            del by_hash[existing]
+        if by_hash:
+            stmt = database.insert_on_conflict(BlobModel)
+            await self.session.execute(
+                # 그 사이 다른 트랜잭션이 같은 해시를 commit했으면 DO NOTHING 대신 no-op UPDATE로 행 잠금까지 잡음
+                stmt.on_conflict_do_update(index_elements=[BlobModel.hash], set_={"hash": stmt.excluded.hash}),
+                [by_hash[h].row() for h in sorted(by_hash)],  # 해시 순서로 잠가 동시 put 간 교착 방지
+            )
+
+    async def get_many(self, hashes: Iterable[str]) -> dict[str, str]:
+        """해시 → 압축 해제한 값"""
+        hashes = set(hashes)
+        if not hashes:
+            return {}
+        result = await self.session.execute(
+            select(BlobModel.hash, BlobModel.codec, BlobModel.data).where(BlobModel.hash.in_(hashes))
+        )
+        return {row.hash: blobs.decode(row.codec, row.data) for row in result}
+
+    async def fill(self, objs: Iterable, *attrs: str) -> None:
+        """`<attr>_blob`으로 분리된 값을 풀어 원래 속성에 채움 (변경으로 추적되지 않게)"""
+        refs = [
+            (obj, attr, ref)
+            for obj in objs
+            for attr in attrs
+            if (ref := getattr(obj, f"{attr}_blob"))
+        ]
+        if not refs:
+            return
+        values = await self.get_many(ref for _, _, ref in refs)
+        for obj, attr, ref in refs:
+            set_committed_value(obj, attr, values.get(ref))
+
+    async def delete_unreferenced(self, after: str, limit: int) -> tuple[str | None, int]:
+        """hash > after인 blob limit개를 검사해 어디서도 참조하지 않는 것을 삭제.
+
+        (마지막으로 검사한 hash, 삭제 수) 반환 — 다음 호출의 after. 더 없으면 None.
+        PostgreSQL에서는 후보를 먼저 잠그고 별도 문장으로 참조를 확인 — put()이 잠근(참조를 쓰는 중인) blob은
+        건너뛰고, 잠근 뒤 commit된 참조는 DELETE 문장의 새 스냅샷에 보임.
+        """
+        result = await self.session.execute(
+            select(BlobModel.hash)
+            .where(BlobModel.hash > after)
+            .order_by(BlobModel.hash)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        scanned = list(result.scalars())
+        if not scanned:
+            return None, 0
+        result = await self.session.execute(
+            delete(BlobModel)
+            .where(
+                BlobModel.hash.in_(scanned),
+                ~exists().where(JobModel.stacktrace_blob == BlobModel.hash),
+                ~exists().where(JobModel.raw_payload_blob == BlobModel.hash),
+                ~exists().where(JobTaskModel.content_blob == BlobModel.hash),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return scanned[-1], result.rowcount
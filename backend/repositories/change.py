@@ -0,0 +1,37 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from core import database
+from core.events import pending_topics
+from models.change import ChangeCounterModel
+from repositories.base import BaseRepository
+
+# 목록 ETag가 읽는 토픽만 카운트 (task.appended처럼 잦은 이벤트는 제외 — job별 마지막 sequence로 검증)
+COUNTED_TOPICS = frozenset({"job", "project", "retention"})
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_change_counters(session: Session) -> None:
+    """이 트랜잭션이 남긴 이벤트 토픽의 카운터를 같은 트랜잭션에서 +1.
+
+    commit 직전에 올리므로 PostgreSQL에서 카운터 행 잠금은 commit까지의 짧은 구간만 잡음.
+    """
+    topics = sorted(pending_topics(session) & COUNTED_TOPICS)  # 노드 간 잠금 순서 고정
+    if not topics:
+        return
+    stmt = database.insert_on_conflict(ChangeCounterModel)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ChangeCounterModel.topic],
+            set_={"version": ChangeCounterModel.version + 1},
+        ),
+        [{"topic": topic, "version": 1} for topic in topics],
+    )
+
+
+class ChangeCounterRepository(BaseRepository):
+    async def version(self, topic: str) -> int:
+        result = await self.session.execute(
+            select(ChangeCounterModel.version).where(ChangeCounterModel.topic == topic)
+        )
+        return result.scalar_one_or_none() or 0
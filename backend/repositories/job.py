@@ -1,48 +1,114 @@
 import json
+import math
 import uuid
+import zlib
 from datetime import UTC, datetime
 
-from datetime import UTC, datetime
-
-from sqlalchemy import case, select, update
+from pydantic import TypeAdapter
+from sqlalchemy import DateTime, Row, case, delete, exists, extract, func, insert, literal, or_, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
-from models.error import ParsedError
-from models.job import JobModel, JobStatus, JobTaskModel, JobTaskType
+from core import blobs, database, events
+from core.config import settings
+from models.error import ParsedError, StackFrame
+from models.job import (
+    JOB_SUMMARY_COLUMNS,
+    BlobModel,
+    IngestResult,
+    JobCheckpointModel,
+    JobModel,
+    JobStatus,
+    JobTaskModel,
+    JobTaskType,
+)
 from models.project import ProjectModel
 from repositories.base import BaseRepository
+from repositories.blob import BlobRepository
+from repositories.search import SearchRepository
+from repositories.stats import StatsRepository, stats_delta, status_moved
+
+
+# stacktrace 컬럼 직렬화 (model_dump + json.dumps 대신 pydantic이 바로 JSON bytes 생성)
+_FRAMES = TypeAdapter(list[StackFrame])
+
+
+def _hours_since(column, now: datetime):
+    if database.is_sqlite():
+        return (func.julianday(now) - func.julianday(column)) * 24
+    return extract("epoch", literal(now, DateTime(timezone=True)) - column) / 3600
+
+
+def _decayed_rate(now: datetime):
+    """event_rate를 현재 시각까지 감쇠 (last_seen 이후 반감기 단위로 절반씩)"""
+    half_life_hours = settings.job_rate_half_life_minutes / 60
+    elapsed = _hours_since(func.coalesce(JobModel.last_seen, JobModel.created_at), now)
+    return JobModel.event_rate * func.exp(-elapsed * math.log(2) / half_life_hours)
+
+
+def _priority_score(now: datetime):
+    """발생 빈도(감쇠) + level 가중치 + 대기 시간. 높을수록 먼저 처리"""
+    level_weights = settings.job_priority_level_weights
+    level = (
+        case(
+            *((JobModel.level == name, weight) for name, weight in level_weights.items()),
+            else_=0.0,
+        )
+        if level_weights else 0.0
+    )
+    return (
+        settings.job_priority_frequency_weight * func.ln(1 + _decayed_rate(now))
+        + level
+        + settings.job_priority_age_weight * _hours_since(JobModel.updated_at, now)
+    )
 
 
 class JobRepository(BaseRepository):
+    blob_repo = BlobRepository()
+    search_repo = SearchRepository()
+    stats_repo = StatsRepository()
+
+    @staticmethod
+    def _new_job_values(parsed_error: ParsedError, job_id: str, now: datetime) -> tuple[dict, list[blobs.PendingBlob]]:
+        """INSERT 값과 따로 저장할 blob (큰 stacktrace/raw_payload)"""
+        stacktrace, stacktrace_blob = blobs.split(_FRAMES.dump_json(parsed_error.frames).decode())
+        raw_payload, raw_payload_blob = blobs.split(parsed_error.raw_payload)
+        values = {
+            "id": job_id,
+            "status": JobStatus.PENDING.value,
+            "source": parsed_error.source.value,
+            "source_project_id": parsed_error.source_project_id,
+            "source_issue_id": parsed_error.source_issue_id,
+            "title": parsed_error.title,
+            "subtitle": parsed_error.subtitle,
+            "message": parsed_error.message,
+            "level": parsed_error.level,
+            "environment": parsed_error.environment,
+            "exception_type": parsed_error.exception_type,
+            "transaction": parsed_error.transaction,
+            "filename": parsed_error.filename,
+            "lineno": parsed_error.lineno,
+            "function": parsed_error.function,
+            "stacktrace": stacktrace,
+            "stacktrace_blob": stacktrace_blob and stacktrace_blob.hash,
+            "source_url": parsed_error.source_url,
+            "raw_payload": raw_payload,
+            "raw_payload_blob": raw_payload_blob and raw_payload_blob.hash,
+            "created_at": now,
+            "updated_at": now,
+            "occurrence_count": 1,
+            "first_seen": now,
+            "last_seen": now,
+            "event_rate": 1.0,
+        }
+        return values, [b for b in (stacktrace_blob, raw_payload_blob) if b]
+
     async def create(self, parsed_error: ParsedError) -> str:
         job_id = str(uuid.uuid4())
-        now = datetime.now(UTC)
-        stacktrace_json = json.dumps(
-            [frame.model_dump() for frame in parsed_error.frames],
-            ensure_ascii=False,
-        )
-        db_job = JobModel(
-            id=job_id,
-            status=JobStatus.PENDING.value,
-            source=parsed_error.source.value,
-            source_project_id=parsed_error.source_project_id,
-            source_issue_id=parsed_error.source_issue_id,
-            title=parsed_error.title,
-            subtitle=parsed_error.subtitle,
-            message=parsed_error.message,
-            level=parsed_error.level,
-            environment=parsed_error.environment,
-            exception_type=parsed_error.exception_type,
-            transaction=parsed_error.transaction,
-            filename=parsed_error.filename,
-            lineno=parsed_error.lineno,
-            function=parsed_error.function,
-            stacktrace=stacktrace_json,
-            source_url=parsed_error.source_url,
-            raw_payload=parsed_error.raw_payload,
-            created_at=now,
-            updated_at=now,
-        )
+        values, pending_blobs = self._new_job_values(parsed_error, job_id, datetime.now(UTC))
+        await self.blob_repo.put(pending_blobs)
+        db_job = JobModel(**values)
         self.session.add(db_job)
         try:
             await self.session.flush()
@@ -51,8 +117,69 @@ class JobRepository(BaseRepository):
                 f"Already exists: source={parsed_error.source.value}, "
                 f"issue_id={parsed_error.source_issue_id}"
             )
+        await self.search_repo.index_jobs([job_id])
+        await self.stats_repo.apply([stats_delta(db_job, db_job.status, 1)])
+        self.queue_event(events.JOB_CREATED, {
+            "id": job_id,
+            "status": db_job.status,
+            "source": db_job.source,
+            "source_project_id": db_job.source_project_id,
+        })
         return job_id
 
+    async def upsert_from_error(self, parsed_error: ParsedError) -> tuple[IngestResult, str]:
+        """INSERT ... ON CONFLICT(source, source_issue_id) DO UPDATE 한 문장으로 생성/재오픈/중복 처리.
+
+        조회 후 생성하는 방식과 달리 동시에 같은 이슈가 들어와도 unique 충돌이 나지 않음.
+        결과는 RETURNING으로 판별: id가 새로 만든 값이면 생성, updated_at이 이번 시각이면 재오픈.
+        중복 수신도 발생 빈도(occurrence_count, last_seen, 감쇠 event_rate)는 갱신.
+        RETURNING은 바뀐 값만 주므로 재오픈 전 상태(job_stats용)는 DO UPDATE에서 previous_status에 남겨 받음.
+        """
+        job_id = str(uuid.uuid4())
+        now = datetime.now(UTC)
+        reopen = JobModel.status.in_([JobStatus.DONE.value, JobStatus.FAILED.value])
+        values, pending_blobs = self._new_job_values(parsed_error, job_id, now)
+        stmt = database.insert_on_conflict(JobModel).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobModel.source, JobModel.source_issue_id],
+            # 처리 중인 job은 그대로 두고 DONE/FAILED만 PENDING으로
+            set_={
+                "status": case((reopen, JobStatus.PENDING.value), else_=JobModel.status),
+                # SET 우변은 모두 갱신 전 값 기준 → 재오픈 전 상태
+                "previous_status": case((reopen, JobModel.status), else_=JobModel.previous_status),
+                "rate_limited_until": case((reopen, None), else_=JobModel.rate_limited_until),
+                "updated_at": case((reopen, now), else_=JobModel.updated_at),
+                "occurrence_count": JobModel.occurrence_count + 1,
+                "last_seen": now,
+                "event_rate": _decayed_rate(now) + 1,
+            },
+        ).returning(
+            JobModel.id,
+            JobModel.status,
+            JobModel.source,
+            JobModel.source_project_id,
+            JobModel.previous_status,
+            (JobModel.updated_at == now).label("touched"),
+        )
+        row = (await self.session.execute(stmt)).one()
+
+        if row.id == job_id:
+            # blob은 새로 만든 job에만 필요 (중복/재오픈은 기존 값 유지) — 압축도 이때만
+            await self.blob_repo.put(pending_blobs)
+            await self.search_repo.index_jobs([row.id])
+            await self.stats_repo.apply([stats_delta(row, row.status, 1)])
+            self.queue_event(events.JOB_CREATED, {
+                "id": row.id, "status": row.status, "source": row.source, "source_project_id": row.source_project_id,
+            })
+            return "created", row.id
+        if row.touched:
+            await self.stats_repo.apply(status_moved(row, row.previous_status, row.status))
+            self._queue_job_updated(row.id, row.status, row.source_project_id)
+            return "reopened", row.id
+        # 상태는 그대로지만 occurrence_count/last_seen이 바뀌었으므로 목록 ETag 갱신
+        self._queue_job_updated(row.id, row.status, row.source_project_id)
+        return "duplicate", row.id
+
     async def exists(self, source: str, source_issue_id: str) -> bool:
         result = await self.session.execute(
             select(JobModel.id).where(
@@ -69,108 +196,170 @@ class JobRepository(BaseRepository):
                 JobModel.source_issue_id == source_issue_id,
             )
         )
-        return result.scalar_one_or_none()
+        return await self._fill_job_blobs(result.scalar_one_or_none())
 
-    async def get(self, job_id: str) -> JobModel | None:
+    async def exists_id(self, job_id: str) -> bool:
+        result = await self.session.execute(select(JobModel.id).where(JobModel.id == job_id))
+        return result.scalar_one_or_none() is not None
+
+    async def get_updated_at(self, job_id: str) -> datetime | None:
+        """job의 마지막 변경 시각 (PK 조회, ETag용). 없으면 None
+
+        중복 수신은 updated_at을 바꾸지 않고 last_seen만 갱신하므로 둘 중 큰 값.
+        """
         result = await self.session.execute(
-            select(JobModel).where(JobModel.id == job_id)
+            select(JobModel.updated_at, JobModel.last_seen).where(JobModel.id == job_id)
         )
-        return result.scalar_one_or_none()
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return max(row.updated_at, row.last_seen or row.updated_at)
 
-    async def get_pending(self) -> JobModel | None:
+    async def get(self, job_id: str) -> JobModel | None:
         result = await self.session.execute(
-            select(JobModel)
-            .where(JobModel.status == JobStatus.PENDING.value)
-            .order_by(JobModel.created_at.asc())
-            .limit(1)
+            select(JobModel).where(JobModel.id == job_id)
         )
-        return result.scalar_one_or_none()
+        return await self._fill_job_blobs(result.scalar_one_or_none())
+
+    async def _fill_job_blobs(self, db_job: JobModel | None) -> JobModel | None:
+        if db_job:
+            await self.blob_repo.fill([db_job], "raw_payload", "stacktrace")
+        return db_job
 
     async def get_next_job(self) -> JobModel | None:
-        """Atomic UPDATE RETURNING으로 다음 job을 가져오며 즉시 PROCESSING으로 전환.
+        """다음 job을 골라 즉시 PROCESSING으로 전환 (고르기 + 전환을 UPDATE ... RETURNING 한 문장으로).
 
-        여러 워커가 동시에 호출해도 같은 job을 가져가지 않음.
+        여러 워커가 동시에 호출해도 같은 job을 가져가지 않음. 이전 상태는 previous_status로 받아 job_stats 갱신에 사용.
+        PostgreSQL에서는 후보를 FOR UPDATE SKIP LOCKED로 잠가, 다른 노드가 잡고 있는 job은 기다리지 않고 건너뜀
+        (SQLite는 FOR UPDATE를 생략 — writer 락이 이미 직렬화).
         등록된 프로젝트가 있는 job만 대상 (projects 조인).
-        우선순위: RATE_LIMITED(대기 완료) > PENDING, FIFO.
+        우선순위: RATE_LIMITED(대기 완료) > PENDING.
+        PENDING 안에서는 JOB_PRIORITY=score면 점수(발생 빈도 + level + 대기 시간) 순, fifo면 생성 순.
         """
         now = datetime.now(UTC)
-        priority = case(
-            (JobModel.status == JobStatus.RATE_LIMITED.value, 0),
-            else_=1,
-        )
-        # 서브쿼리: projects 조인하여 등록된 프로젝트가 있는 job만 선택
-        subq = (
-            select(JobModel.id)
-            .join(
-                ProjectModel,
-                (JobModel.source == ProjectModel.source)
-                & (JobModel.source_project_id == ProjectModel.source_project_id),
-            )
-            .where(
-                (
-                    (JobModel.status == JobStatus.RATE_LIMITED.value)
-                    & (
-                        (JobModel.rate_limited_until == None)  # noqa: E711
-                        | (JobModel.rate_limited_until <= now)
-                    )
+        fifo = (JobModel.created_at.asc(),)
+        pending_order = fifo if settings.job_priority == "fifo" else (_priority_score(now).desc(), *fifo)
+
+        def next_id(*conditions, order_by=fifo):
+            # status별로 따로 조회해야 idx_jobs_queue (status, created_at, ...) 순서대로
+            # 읽고 첫 행에서 멈춤 (OR/CASE 정렬이면 대기 job 전체를 정렬)
+            # score 정렬은 PENDING job만 인덱스로 골라 점수로 정렬
+            return (
+                select(JobModel.id)
+                .join(
+                    ProjectModel,
+                    (JobModel.source == ProjectModel.source)
+                    & (JobModel.source_project_id == ProjectModel.source_project_id),
                 )
-                | (JobModel.status == JobStatus.PENDING.value)
+                .where(*conditions)
+                .order_by(*order_by)
+                .limit(1)
+                .with_for_update(skip_locked=True, of=JobModel)
+                .scalar_subquery()
             )
-            .order_by(priority, JobModel.created_at.asc())
-            .limit(1)
-            .scalar_subquery()
+
+        subq = func.coalesce(
+            next_id(
+                JobModel.status == JobStatus.RATE_LIMITED.value,
+                (JobModel.rate_limited_until == None)  # noqa: E711
+                | (JobModel.rate_limited_until <= now),
+            ),
+            next_id(JobModel.status == JobStatus.PENDING.value, order_by=pending_order),
         )
-        # atomic UPDATE ... RETURNING
         stmt = (
             update(JobModel)
-            .where(JobModel.id == subq)
-            .values(status=JobStatus.PROCESSING.value, updated_at=now)
+            .where(
+                JobModel.id == subq,
+                JobModel.status.in_([JobStatus.RATE_LIMITED.value, JobStatus.PENDING.value]),
+            )
+            # SET 우변은 갱신 전 값 기준 → previous_status에 가져가기 전 상태
+            .values(status=JobStatus.PROCESSING.value, previous_status=JobModel.status, updated_at=now)
             .returning(JobModel)
         )
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        db_job = result.scalar_one_or_none()
+        if db_job:
+            await self.stats_repo.apply(status_moved(db_job, db_job.previous_status, db_job.status))
+            self._queue_job_updated(db_job.id, db_job.status, db_job.source_project_id)
+        return await self._fill_job_blobs(db_job)
 
     async def update_status(
         self,
         job_id: str,
         status: JobStatus,
         *,
+        expected: JobStatus | tuple[JobStatus, ...] | None = None,
         work_branch: str | None = None,
         error_log: str | None = None,
         increment_retry: bool = False,
         rate_limited_until: datetime | None = None,
     ) -> bool:
-        db_job = await self.get(job_id)
-        if not db_job:
-            return False
-        db_job.status = status.value
-        db_job.updated_at = datetime.now(UTC)
+        """UPDATE ... RETURNING으로 상태 전환. 전환됐으면 True.
+
+        expected가 주어지면 현재 상태가 그중 하나일 때만 전환 (compare-and-set, WHERE 조건).
+        조회 없이 한 문장 — 이전 상태는 같은 UPDATE에서 previous_status로 남겨 RETURNING으로 받아 job_stats 갱신에 사용.
+        """
+        conditions = [JobModel.id == job_id]
+        if expected is not None:
+            if isinstance(expected, JobStatus):
+                expected = (expected,)
+            conditions.append(JobModel.status.in_([s.value for s in expected]))
+
+        values: dict = {
+            "status": status.value,
+            "previous_status": JobModel.status,  # SET 우변은 갱신 전 값 기준
+            "updated_at": datetime.now(UTC),
+            # RATE_LIMITED 외 상태로 바뀌면 대기 시각 초기화
+            "rate_limited_until": rate_limited_until if status == JobStatus.RATE_LIMITED else None,
+        }
         if work_branch is not None:
-            db_job.work_branch = work_branch
+            values["work_branch"] = work_branch
         if error_log is not None:
-            db_job.error_log = error_log
+            values["error_log"] = error_log
         if increment_retry:
-            db_job.retry_count += 1
-        if status == JobStatus.RATE_LIMITED:
-            db_job.rate_limited_until = rate_limited_until
-        elif db_job.rate_limited_until is not None:
-            # rate limit 해제 시 초기화
-            db_job.rate_limited_until = None
-        await self.session.flush()
+            values["retry_count"] = JobModel.retry_count + 1
+
+        result = await self.session.execute(
+            update(JobModel)
+            .where(*conditions)
+            .values(**values)
+            .returning(JobModel.id, JobModel.source, JobModel.source_project_id, JobModel.previous_status)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return False
+        await self.stats_repo.apply(status_moved(row, row.previous_status, status.value))
+        self._queue_job_updated(row.id, status.value, row.source_project_id)
         return True
 
-    async def list_jobs(
+    def _queue_job_updated(self, job_id: str, status: str, source_project_id: str | None) -> None:
+        self.queue_event(events.JOB_UPDATED, {
+            "id": job_id, "status": status, "source_project_id": source_project_id,
+        })
+
+    async def list_job_summaries(
         self,
         status: JobStatus | None = None,
         source_project_id: str | None = None,
-        offset: int = 0,
-        limit: int = 100,
+        after: tuple[datetime, str] | None = None,
+        limit: int = 20,
     ) -> list[JobModel]:
-        query = select(JobModel).order_by(JobModel.created_at.desc()).offset(offset).limit(limit)
+        """목록용 조회 - 요약 컬럼만 로드, (created_at, id) 내림차순 keyset 페이징.
+
+        after: 이전 페이지 마지막 행의 (created_at, id). OFFSET 없이 인덱스에서 바로 이어 읽음.
+        """
+        query = (
+            select(JobModel)
+            .options(load_only(*JOB_SUMMARY_COLUMNS))
+            .order_by(JobModel.created_at.desc(), JobModel.id.desc())
+            .limit(limit)
+        )
         if status:
             query = query.where(JobModel.status == status.value)
         if source_project_id:
             query = query.where(JobModel.source_project_id == source_project_id)
+        if after:
+            query = query.where(tuple_(JobModel.created_at, JobModel.id) < tuple_(*after))
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
@@ -194,32 +383,238 @@ class JobRepository(BaseRepository):
         last_seq = result.scalar_one_or_none()
         sequence = (last_seq or 0) + 1
 
+        text = json.dumps(content, ensure_ascii=False) if isinstance(content, dict) else content
+        inline, blob = blobs.split(text)
+        await self.blob_repo.put([blob])
         db_task = JobTaskModel(
             id=str(uuid.uuid4()),
             job_id=job_id,
             sequence=sequence,
             type=type.value,
             label=label,
-            content=json.dumps(content, ensure_ascii=False) if isinstance(content, dict) else content,
+            content=inline,
+            content_blob=blob and blob.hash,
             created_at=datetime.now(UTC),
         )
         self.session.add(db_task)
+        self._queue_task_appended(db_task.job_id, db_task.sequence, db_task.type, db_task.label)
         await self.session.flush()
+        await self.search_repo.index_tasks([db_task.id])
+        if blob:
+            set_committed_value(db_task, "content", text)
         return db_task
 
-    async def add_tokens(self, job_id: str, input_tokens: int, output_tokens: int) -> None:
-        """토큰 사용량 누적"""
-        db_job = await self.get(job_id)
-        if db_job:
-            db_job.input_tokens += input_tokens
-            db_job.output_tokens += output_tokens
-            await self.session.flush()
+    async def last_task_sequence(self, job_id: str) -> int:
+        """job의 마지막 task sequence (없으면 0)"""
+        result = await self.session.execute(
+            select(func.max(JobTaskModel.sequence)).where(JobTaskModel.job_id == job_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def insert_tasks(self, rows: list[dict]) -> None:
+        """sequence가 이미 정해진 task 여러 건을 한 번에 기록 (TaskLogWriter용)"""
+        if rows:
+            pending_blobs = []
+            stored = []
+            for row in rows:
+                inline, blob = blobs.split(row.get("content"))
+                pending_blobs.append(blob)
+                stored.append({**row, "content": inline, "content_blob": blob and blob.hash})
+            await self.blob_repo.put(pending_blobs)
+            await self.session.execute(insert(JobTaskModel), stored)
+            await self.search_repo.index_tasks([row["id"] for row in rows])
+        for row in rows:
+            self._queue_task_appended(row["job_id"], row["sequence"], row["type"], row["label"])
+
+    def _queue_task_appended(self, job_id: str, sequence: int, type: str, label: str | None) -> None:
+        self.queue_event(events.TASK_APPENDED, {
+            "job_id": job_id, "sequence": sequence, "type": type, "label": label,
+        })
 
-    async def list_tasks(self, job_id: str) -> list[JobTaskModel]:
-        """job의 작업 히스토리 순서대로 조회"""
+    async def add_tokens(self, job_id: str, input_tokens: int, output_tokens: int) -> tuple[int, int] | None:
+        """토큰 사용량 누적 (DB에서 더하므로 동시 writer 간 유실 없음, 일별 token_usage도 함께). 누적 합계 반환"""
+        result = await self.session.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id)
+            .values(
+                input_tokens=JobModel.input_tokens + input_tokens,
+                output_tokens=JobModel.output_tokens + output_tokens,
+                updated_at=datetime.now(UTC),
+            )
+            .returning(
+                JobModel.input_tokens, JobModel.output_tokens,
+                JobModel.source, JobModel.source_project_id, JobModel.status,
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        await self.stats_repo.add_tokens(row, input_tokens, output_tokens)
+        self._queue_job_updated(job_id, row.status, row.source_project_id)
+        return row.input_tokens, row.output_tokens
+
+    async def list_tasks(self, job_id: str, after_sequence: int = 0) -> list[JobTaskModel]:
+        """job의 작업 히스토리 순서대로 조회 (after_sequence 이후만)"""
         result = await self.session.execute(
             select(JobTaskModel)
-            .where(JobTaskModel.job_id == job_id)
+            .where(JobTaskModel.job_id == job_id, JobTaskModel.sequence > after_sequence)
             .order_by(JobTaskModel.sequence.asc())
         )
-        return list(result.scalars().all())
+        tasks = list(result.scalars().all())
+        await self.blob_repo.fill(tasks, "content")
+        return tasks
+
+    async def list_task_summaries(self, job_id: str, after_sequence: int = 0) -> list[Row]:
+        """content 대신 content 길이만 조회 (타임라인 목록용)"""
+        result = await self.session.execute(
+            select(
+                JobTaskModel.id,
+                JobTaskModel.job_id,
+                JobTaskModel.sequence,
+                JobTaskModel.type,
+                JobTaskModel.label,
+                func.coalesce(
+                    func.length(JobTaskModel.content),
+                    select(BlobModel.size).where(BlobModel.hash == JobTaskModel.content_blob).scalar_subquery(),
+                    0,
+                ).label("content_length"),
+                JobTaskModel.created_at,
+            )
+            .where(JobTaskModel.job_id == job_id, JobTaskModel.sequence > after_sequence)
+            .order_by(JobTaskModel.sequence.asc())
+        )
+        return list(result.all())
+
+    async def get_task(self, job_id: str, sequence: int) -> JobTaskModel | None:
+        result = await self.session.execute(
+            select(JobTaskModel).where(
+                JobTaskModel.job_id == job_id,
+                JobTaskModel.sequence == sequence,
+            )
+        )
+        db_task = result.scalar_one_or_none()
+        if db_task:
+            await self.blob_repo.fill([db_task], "content")
+        return db_task
+
+    # ── Executor Checkpoints ──────────────────────────────────────
+
+    async def append_checkpoint(self, job_id: str, turn: int, messages: list[dict]) -> None:
+        """해당 턴에 추가된 메시지를 압축해서 append"""
+        raw = json.dumps(messages, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.session.add(JobCheckpointModel(
+            job_id=job_id,
+            turn=turn,
+            data=zlib.compress(raw),
+            created_at=datetime.now(UTC),
+        ))
+        await self.session.flush()
+
+    async def load_checkpoint(self, job_id: str) -> tuple[int, list[dict]] | None:
+        """체크포인트를 이어 붙여 (마지막 턴, 전체 messages) 반환. 없으면 None"""
+        result = await self.session.execute(
+            select(JobCheckpointModel.turn, JobCheckpointModel.data)
+            .where(JobCheckpointModel.job_id == job_id)
+            .order_by(JobCheckpointModel.turn.asc())
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        messages: list[dict] = []
+        for _, data in rows:
+            messages.extend(json.loads(zlib.decompress(data)))
+        return rows[-1].turn, messages
+
+    async def clear_checkpoint(self, job_id: str) -> None:
+        await self.session.execute(
+            delete(JobCheckpointModel).where(JobCheckpointModel.job_id == job_id)
+        )
+
+    # ── Retention ─────────────────────────────────────────────────
+
+    async def prune_task_content(self, before: datetime, limit: int) -> int:
+        """끝난 job의 before 이전 task content 삭제 (sequence/type/label은 유지). 정리한 task 수 반환"""
+        # JOIN 대신 EXISTS → idx_job_tasks_retention(이미 정리된 행은 없음)에서 시작
+        stale = (
+            select(JobTaskModel.id)
+            .where(
+                JobTaskModel.created_at < before,
+                or_(JobTaskModel.content.is_not(None), JobTaskModel.content_blob.is_not(None)),
+                exists().where(
+                    JobModel.id == JobTaskModel.job_id,
+                    JobModel.status.in_([JobStatus.DONE.value, JobStatus.FAILED.value]),
+                ),
+            )
+            .limit(limit)
+        )
+        task_ids = list((await self.session.execute(stale)).scalars())
+        if not task_ids:
+            return 0
+        # 검색 인덱스: 지우기 전 내용으로 빼고 label만 다시 넣음
+        await self.search_repo.unindex_tasks(task_ids)
+        result = await self.session.execute(
+            update(JobTaskModel)
+            .where(JobTaskModel.id.in_(task_ids))
+            .values(content=None, content_blob=None)
+            .returning(JobTaskModel.job_id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.search_repo.index_tasks(task_ids)
+        self.queue_event(events.TASKS_PRUNED, {"job_ids": sorted(set(result.scalars()))})
+        return len(task_ids)
+
+    async def list_archivable(self, before: datetime, limit: int) -> list[dict]:
+        """before 이전에 끝난 DONE job을 task까지 포함한 아카이브 레코드로 (blob 값 복원)"""
+        result = await self.session.execute(
+            select(JobModel)
+            .where(JobModel.status == JobStatus.DONE.value, JobModel.updated_at < before)
+            .order_by(JobModel.created_at, JobModel.id)
+            .limit(limit)
+        )
+        jobs = list(result.scalars().all())
+        if not jobs:
+            return []
+        await self.blob_repo.fill(jobs, "raw_payload", "stacktrace")
+        result = await self.session.execute(
+            select(JobTaskModel)
+            .where(JobTaskModel.job_id.in_([job.id for job in jobs]))
+            .order_by(JobTaskModel.job_id, JobTaskModel.sequence)
+        )
+        tasks = list(result.scalars().all())
+        await self.blob_repo.fill(tasks, "content")
+        tasks_by_job: dict[str, list[dict]] = {}
+        for task in tasks:
+            tasks_by_job.setdefault(task.job_id, []).append(_archive_row(task))
+        return [{**_archive_row(job), "tasks": tasks_by_job.get(job.id, [])} for job in jobs]
+
+    async def delete_archived(self, job_ids: list[str], before: datetime) -> list[str]:
+        """아카이브한 job 삭제 (task/checkpoint 포함). 그 사이 재오픈된 job은 남김. 삭제한 id 반환"""
+        result = await self.session.execute(
+            select(JobModel.id, JobModel.source, JobModel.source_project_id).where(
+                JobModel.id.in_(job_ids),
+                JobModel.status == JobStatus.DONE.value,
+                JobModel.updated_at < before,
+            )
+        )
+        rows = result.all()
+        if not rows:
+            return []
+        deleted = [row.id for row in rows]
+        # 토큰 사용량(token_usage)은 사용일 기록이므로 그대로 둠
+        await self.stats_repo.apply(stats_delta(row, JobStatus.DONE.value, -1) for row in rows)
+        await self.search_repo.unindex_jobs(deleted)
+        await self.search_repo.unindex_tasks_of_jobs(deleted)
+        await self.session.execute(delete(JobModel).where(JobModel.id.in_(deleted)))
+        await self.session.execute(delete(JobTaskModel).where(JobTaskModel.job_id.in_(deleted)))
+        await self.session.execute(delete(JobCheckpointModel).where(JobCheckpointModel.job_id.in_(deleted)))
+        self.queue_event(events.JOBS_ARCHIVED, {"ids": deleted})
+        return deleted
+
+
+def _archive_row(obj: JobModel | JobTaskModel) -> dict:
+    """컬럼 값 dict (*_blob 참조 대신 복원한 값)"""
+    return {
+        column.key: getattr(obj, column.key)
+        for column in obj.__table__.columns
+        if not column.key.endswith("_blob")
+    }
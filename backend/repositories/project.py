@@ -4,6 +4,7 @@ from datetime import UTC, datetime
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
+from core import events
 from models.project import ProjectModel
 from repositories.base import BaseRepository
 
@@ -35,6 +36,7 @@ class ProjectRepository(BaseRepository):
             raise ValueError(
                 f"Already exists: source={source}, project_id={source_project_id}"
             )
+        self.queue_event(events.PROJECT_CREATED, {"source": source, "source_project_id": source_project_id})
         return db_project
 
     async def get(self, source: str, source_project_id: str) -> ProjectModel | None:
@@ -59,4 +61,5 @@ class ProjectRepository(BaseRepository):
             return False
         await self.session.delete(db_project)
         await self.session.flush()
+        self.queue_event(events.PROJECT_DELETED, {"source": source, "source_project_id": source_project_id})
         return True
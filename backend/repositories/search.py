@@ -0,0 +1,214 @@
+import re
+
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.orm import load_only
+
+from core import database
+from core.config import settings
+from models.job import JOB_SUMMARY_COLUMNS, JobModel, JobStatus
+from repositories.base import BaseRepository
+
+# jobs_fts / job_tasks_fts (FTS5 external content, 마이그레이션 v6)
+# 본문은 *_search_source 뷰(blob은 blob_text()로 풀어서)에서 읽고 index에는 토큰만 저장.
+# external content라 삭제/변경 전에 원래 값으로 'delete'를 넣어야 토큰이 빠짐 → 행을 지우기 전에 unindex_*
+# SQLite 전용 — 다른 DB(PostgreSQL)에서는 인덱스 유지를 건너뛰고 검색은 지원하지 않음 (available)
+JOB_COLUMNS = "title, message, exception_type, filename, stacktrace"
+TASK_COLUMNS = "label, content"
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+def to_fts_query(query: str) -> str | None:
+    """사용자 입력 → FTS5 쿼리. 단어/"구문"은 각각 phrase로 감싸 AND (연산자/특수문자 해석 없음).
+
+    `refund.py`처럼 구두점이 섞인 단어는 연속된 토큰 phrase로 일치, 끝의 `*`는 접두어 검색.
+    """
+    terms = []
+    for phrase, word in _TERM.findall(query):
+        prefix = bool(word) and word.endswith("*")
+        term = phrase or word.rstrip("*")
+        if not any(ch.isalnum() for ch in term):
+            continue  # 토큰이 없는 phrase는 전체를 불일치로 만듦
+        terms.append('"%s"%s' % (term.replace('"', '""'), "*" if prefix else ""))
+    return " ".join(terms) or None
+
+
+def _split_highlights(snippet: str) -> tuple[str, list[tuple[int, int]]]:
+    """snippet()의 마커를 떼고 (본문, 일치 구간 [start, end) 목록)"""
+    plain: list[str] = []
+    spans: list[tuple[int, int]] = []
+    length = 0
+    start = None
+    for part in re.split(f"([{_MARK_START}{_MARK_END}])", snippet):
+        if part == _MARK_START:
+            start = length
+        elif part == _MARK_END:
+            if start is not None:
+                spans.append((start, length))
+            start = None
+        else:
+            plain.append(part)
+            length += len(part)
+    return "".join(plain), spans
+
+
+class SearchRepository(BaseRepository):
+    @property
+    def available(self) -> bool:
+        return database.is_sqlite()
+
+    # ── 인덱스 유지 ───────────────────────────────────────────────
+
+    async def index_jobs(self, job_ids: list[str]) -> None:
+        await self._write("jobs_fts", JOB_COLUMNS, "jobs_search_source", "id", job_ids)
+
+    async def unindex_jobs(self, job_ids: list[str]) -> None:
+        await self._write("jobs_fts", JOB_COLUMNS, "jobs_search_source", "id", job_ids, delete=True)
+
+    async def index_tasks(self, task_ids: list[str]) -> None:
+        await self._write("job_tasks_fts", TASK_COLUMNS, "job_tasks_search_source", "id", task_ids)
+
+    async def unindex_tasks(self, task_ids: list[str]) -> None:
+        await self._write("job_tasks_fts", TASK_COLUMNS, "job_tasks_search_source", "id", task_ids, delete=True)
+
+    async def unindex_tasks_of_jobs(self, job_ids: list[str]) -> None:
+        await self._write("job_tasks_fts", TASK_COLUMNS, "job_tasks_search_source", "job_id", job_ids, delete=True)
+
+    async def _write(
+        self, fts: str, columns: str, source: str, key: str, values: list[str], *, delete: bool = False,
+    ) -> None:
+        if not values or not self.available:
+            return
+        if delete:
+            sql = (
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+                f"SELECT 'delete', doc_id, {columns} FROM {source} WHERE {key} IN :values"
+            )
+        else:
+            sql = f"INSERT INTO {fts}(rowid, {columns}) SELECT doc_id, {columns} FROM {source} WHERE {key} IN :values"
+        await self.session.execute(
+            text(sql).bindparams(bindparam("values", expanding=True)), {"values": list(values)},
+        )
+
+    async def rebuild(self) -> None:
+        """원래 테이블에서 인덱스 전체 재생성"""
+        if not self.available:
+            return
+        for fts in ("jobs_fts", "job_tasks_fts"):
+            await self.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+    # ── 검색 ──────────────────────────────────────────────────────
+
+    async def search(
+        self,
+        query: str,
+        status: JobStatus | None = None,
+        source_project_id: str | None = None,
+        limit: int = 20,
+        matches_per_job: int = 3,
+    ) -> list[tuple[JobModel, float, list[dict]]]:
+        """job 필드와 task를 bm25 순으로 검색해 job별로 묶음 → (job, 점수, 일치 목록) 점수 높은 순.
+
+        점수는 -bm25 (높을수록 관련), job 점수는 가장 잘 맞은 문서의 점수.
+        bm25는 일치 행마다 계산되므로 흔한 단어는 (필터를 통과한) 최근 search_rank_window개 일치 문서만
+        순위를 매김 (rowid 역순 탐색은 doclist만 읽어 거의 비용이 없음). snippet은 최종 결과 문서에만 만듦.
+        """
+        filters = ""
+        params: dict = {"q": query, "per_job": matches_per_job, "k": limit * matches_per_job}
+        if status:
+            filters += " AND j.status = :status"
+            params["status"] = status.value
+        if source_project_id:
+            filters += " AND j.source_project_id = :project"
+            params["project"] = source_project_id
+
+        job_rows = await self.session.execute(text(f"""
+            WITH hits AS MATERIALIZED (
+                SELECT rowid AS doc_id, rank FROM jobs_fts WHERE jobs_fts MATCH :q AND rowid >= :start
+            )
+            SELECT h.doc_id, j.id AS job_id, -h.rank AS score
+            FROM hits h JOIN jobs j ON j.rowid = h.doc_id
+            WHERE 1 = 1{filters}
+            ORDER BY h.rank LIMIT :k
+        """), {**params, "start": await self._window_start(
+            "jobs_fts", "JOIN jobs j ON j.rowid = jobs_fts.rowid", filters, params,
+        )})
+        task_rows = await self.session.execute(text(f"""
+            WITH hits AS MATERIALIZED (
+                SELECT rowid AS doc_id, rank FROM job_tasks_fts WHERE job_tasks_fts MATCH :q AND rowid >= :start
+            ), ranked AS (
+                SELECT h.doc_id, t.job_id, t.sequence, t.type, t.label, -h.rank AS score,
+                       ROW_NUMBER() OVER (PARTITION BY t.job_id ORDER BY h.rank) AS n
+                FROM hits h JOIN job_tasks t ON t.rowid = h.doc_id
+                {"JOIN jobs j ON j.id = t.job_id" if filters else ""}
+                WHERE 1 = 1{filters}
+            )
+            SELECT doc_id, job_id, sequence, type, label, score FROM ranked
+            WHERE n <= :per_job ORDER BY score DESC LIMIT :k
+        """), {**params, "start": await self._window_start(
+            "job_tasks_fts",
+            "JOIN job_tasks t ON t.rowid = job_tasks_fts.rowid JOIN jobs j ON j.id = t.job_id",
+            filters, params,
+        )})
+
+        docs = [("jobs_fts", row.doc_id, row.job_id, row.score, {}) for row in job_rows]
+        docs += [
+            ("job_tasks_fts", row.doc_id, row.job_id, row.score,
+             {"sequence": row.sequence, "type": row.type, "label": row.label})
+            for row in task_rows
+        ]
+        docs.sort(key=lambda d: d[3], reverse=True)
+        by_job: dict[str, list[tuple]] = {}
+        for doc in docs:
+            group = by_job.get(doc[2])
+            if group is None and len(by_job) < limit:
+                group = by_job[doc[2]] = []
+            if group is not None and len(group) < matches_per_job:
+                group.append(doc)
+        if not by_job:
+            return []
+
+        snippets: dict[tuple[str, int], str] = {}
+        for fts in ("jobs_fts", "job_tasks_fts"):
+            rowids = [doc[1] for group in by_job.values() for doc in group if doc[0] == fts]
+            if not rowids:
+                continue
+            result = await self.session.execute(
+                text(f"""
+                    SELECT rowid, snippet({fts}, -1, char(2), char(3), '…', 24) AS snippet
+                    FROM {fts} WHERE {fts} MATCH :q AND rowid IN :rowids
+                """).bindparams(bindparam("rowids", expanding=True)),
+                {"q": query, "rowids": rowids},
+            )
+            snippets.update(((fts, row.rowid), row.snippet) for row in result)
+
+        result = await self.session.execute(
+            select(JobModel).options(load_only(*JOB_SUMMARY_COLUMNS)).where(JobModel.id.in_(by_job))
+        )
+        jobs = {job.id: job for job in result.scalars()}
+        hits = []
+        for job_id, group in by_job.items():
+            if job_id not in jobs:
+                continue
+            matches = []
+            for fts, rowid, _, score, task in group:
+                snippet, highlights = _split_highlights(snippets.get((fts, rowid)) or "")
+                matches.append({**task, "score": score, "snippet": snippet, "highlights": highlights})
+            hits.append((jobs[job_id], group[0][3], matches))
+        return hits
+
+    async def _window_start(self, fts: str, join: str, filters: str, params: dict) -> int:
+        """필터를 통과한 최근 search_rank_window번째 일치 문서의 rowid (일치가 그보다 적으면 0)
+
+        필터 전 일치로 창을 자르면 다른 프로젝트/상태의 최근 일치가 창을 채워 결과가 비게 됨.
+        """
+        result = await self.session.execute(
+            text(f"""
+                SELECT {fts}.rowid FROM {fts} {join if filters else ""}
+                WHERE {fts} MATCH :q{filters}
+                ORDER BY {fts}.rowid DESC LIMIT 1 OFFSET :offset
+            """),
+            {**params, "offset": settings.search_rank_window - 1},
+        )
+        return result.scalar() or 0
@@ -0,0 +1,138 @@
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+
+from sqlalchemy import delete, func, insert, literal_column, select
+
+from core import database
+from models.job import JobModel, JobStatsModel, TokenUsageModel
+from repositories.base import BaseRepository
+
+
+def stats_delta(row, status: str, job_count: int) -> dict:
+    """job 행(source, source_project_id)이 속한 job_stats 키의 증감"""
+    return {
+        "source": row.source,
+        "source_project_id": row.source_project_id or "",
+        "status": status,
+        "job_count": job_count,
+    }
+
+
+def status_moved(row, old_status: str, new_status: str) -> list[dict]:
+    """상태 전환: job 수를 이전 상태 키에서 새 상태 키로"""
+    return [stats_delta(row, old_status, -1), stats_delta(row, new_status, 1)]
+
+
+def _project_key(column):
+    return func.coalesce(column, literal_column("''"))
+
+
+def rebuild_statements() -> tuple:
+    """job_stats를 비우고 jobs GROUP BY로 다시 채우는 문장 (마이그레이션에서도 사용)"""
+    keys = (JobModel.source, _project_key(JobModel.source_project_id), JobModel.status)
+    return (
+        delete(JobStatsModel),
+        insert(JobStatsModel).from_select(
+            ["source", "source_project_id", "status", "job_count"],
+            select(*keys, func.count()).group_by(*keys),
+        ),
+    )
+
+
+def backfill_token_usage_statement():
+    """기존 jobs의 누적 토큰을 마지막 변경일(updated_at)에 합산 (v8 마이그레이션용 — 실제 사용일은 알 수 없음)"""
+    keys = (func.date(JobModel.updated_at), JobModel.source, _project_key(JobModel.source_project_id))
+    return insert(TokenUsageModel).from_select(
+        ["day", "source", "source_project_id", "input_tokens", "output_tokens"],
+        select(*keys, func.sum(JobModel.input_tokens), func.sum(JobModel.output_tokens))
+        .where((JobModel.input_tokens > 0) | (JobModel.output_tokens > 0))
+        .group_by(*keys),
+    )
+
+
+class StatsRepository(BaseRepository):
+    async def apply(self, deltas: Iterable[dict]) -> None:
+        """증감을 키별로 합쳐 upsert (상태 전환처럼 서로 상쇄되는 키는 생략)"""
+        merged: dict[tuple, dict] = {}
+        for delta in deltas:
+            key = (delta["source"], delta["source_project_id"], delta["status"])
+            if key in merged:
+                merged[key]["job_count"] += delta["job_count"]
+            else:
+                merged[key] = dict(delta)
+        rows = [row for row in merged.values() if row["job_count"]]
+        if not rows:
+            return
+        stmt = database.insert_on_conflict(JobStatsModel)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[JobStatsModel.source, JobStatsModel.source_project_id, JobStatsModel.status],
+                set_={"job_count": JobStatsModel.job_count + stmt.excluded.job_count},
+            ),
+            rows,
+        )
+
+    async def add_tokens(self, row, input_tokens: int, output_tokens: int) -> None:
+        """오늘(UTC) 사용량에 합산 (job 행의 source, source_project_id 기준)"""
+        if not input_tokens and not output_tokens:
+            return
+        stmt = database.insert_on_conflict(TokenUsageModel).values(
+            day=datetime.now(UTC).date(),
+            source=row.source,
+            source_project_id=row.source_project_id or "",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TokenUsageModel.day, TokenUsageModel.source, TokenUsageModel.source_project_id],
+                set_={
+                    "input_tokens": TokenUsageModel.input_tokens + stmt.excluded.input_tokens,
+                    "output_tokens": TokenUsageModel.output_tokens + stmt.excluded.output_tokens,
+                },
+            )
+        )
+
+    async def rebuild(self) -> None:
+        """jobs 전체를 다시 집계 (어긋난 카운터 복구용). 토큰 사용량은 사용일 기록이라 재계산하지 않음"""
+        for stmt in rebuild_statements():
+            await self.session.execute(stmt)
+
+    async def list_by_project(self, since: date) -> list[dict]:
+        """프로젝트별 상태별 job 수 + since 이후 사용한 토큰 합계.
+
+        job_stats는 프로젝트 × 상태 행만, token_usage는 since 이후 행만 읽으므로 이력이 쌓여도 비용이 늘지 않음.
+        """
+        projects: dict[tuple[str, str], dict] = {}
+
+        def project(source: str, source_project_id: str) -> dict:
+            return projects.setdefault((source, source_project_id), {
+                "source": source,
+                "source_project_id": source_project_id or None,
+                "counts": {},
+                "input_tokens": 0,
+                "output_tokens": 0,
+            })
+
+        counts = await self.session.execute(
+            select(JobStatsModel.source, JobStatsModel.source_project_id, JobStatsModel.status, JobStatsModel.job_count)
+            .where(JobStatsModel.job_count != 0)
+        )
+        for row in counts:
+            project(row.source, row.source_project_id)["counts"][row.status] = row.job_count
+
+        tokens = await self.session.execute(
+            select(
+                TokenUsageModel.source,
+                TokenUsageModel.source_project_id,
+                func.sum(TokenUsageModel.input_tokens).label("input_tokens"),
+                func.sum(TokenUsageModel.output_tokens).label("output_tokens"),
+            )
+            .where(TokenUsageModel.day >= since)
+            .group_by(TokenUsageModel.source, TokenUsageModel.source_project_id)
+        )
+        for row in tokens:
+            totals = project(row.source, row.source_project_id)
+            totals["input_tokens"] += row.input_tokens
+            totals["output_tokens"] += row.output_tokens
+        return [projects[key] for key in sorted(projects)]
@@ -5,6 +5,7 @@ import json
 import logging
 import os
 import subprocess
+from collections.abc import Awaitable
 from pathlib import Path
 
 import anthropic
@@ -14,12 +15,18 @@ from models.job import Job, JobTaskType
 from prompts.fix_error import (
     EXECUTOR_SYSTEM_PROMPT,
     PLANNER_SYSTEM_PROMPT,
-    build_execute_prompt,
+    BudgetedPrompt,
     build_plan_prompt,
+    estimate_tokens,
+    execute_prompt_candidates,
+    plan_prompt_candidates,
 )
 from services.job_queue import JobService
 from services.notifications import DoorayNotificationSender, NotificationMessage
 from services.setting import SettingService
+from services.shell import ShellSession
+from services.task_log import TaskLogWriter
+from services.workspace import WorkspaceService
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +84,9 @@ EXECUTOR_MODEL = "claude-sonnet-4-6"
 MAX_TURNS = 30
 BASH_TIMEOUT = 60  # seconds
 
+# 로컬 추정치가 예산의 이 비율을 넘을 때만 count_tokens 엔드포인트로 정확히 계산
+COUNT_TOKENS_THRESHOLD = 0.7
+
 TOOLS: list[anthropic.types.ToolParam] = [
     {
         "name": "bash",
@@ -121,8 +131,33 @@ TOOLS: list[anthropic.types.ToolParam] = [
 ]
 
 
+def _with_cache_breakpoint(messages: list[dict]) -> list[dict]:
+    """마지막 메시지 끝에 prompt cache breakpoint를 둔 사본 반환.
+
+    저장용 messages는 건드리지 않음 — breakpoint가 누적되면 API 제한(4개)을 넘기 때문.
+    system/tools/이전 턴이 모두 prefix로 캐시되어 다음 턴과 재개 시 재사용됨.
+    """
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = [*content[:-1], {**content[-1], "cache_control": {"type": "ephemeral"}}]
+    return [*messages[:-1], {**last, "content": content}]
+
+
+def _last_assistant_text(messages: list[dict]) -> str:
+    """체크포인트에서 재개할 때 마지막 assistant 텍스트 복원 (완료 요약용)"""
+    for msg in reversed(messages):
+        if msg["role"] != "assistant":
+            continue
+        texts = [b["text"] for b in msg["content"] if b.get("type") == "text" and b.get("text")]
+        if texts:
+            return "\n".join(texts)
+    return ""
+
+
 class AgentService:
-    def __init__(self):
+    def __init__(self, task_log: TaskLogWriter | None = None, workspace_svc: WorkspaceService | None = None):
         mode = settings.agent_mode
 
         if mode == "api":
@@ -138,6 +173,9 @@ class AgentService:
                 raise ValueError("AGENT_MODE=claude-code 이지만 CLAUDE_TOKENS가 설정되지 않았습니다")
             self._client = None  # claude-code 모드에서는 미사용
             self.token_pool = TokenPool(tokens)
+        self.workspace_svc = workspace_svc or WorkspaceService()  # Worker와 공유 (show_file blob 캐시)
+        self._shell: ShellSession | None = None  # bash_persistent_shell 사용 시 Job 단위 셸
+        self.task_log = task_log or TaskLogWriter()  # job_tasks/토큰 기록 (버퍼링)
 
     async def _notify(self, message: NotificationMessage) -> None:
         """설정이 켜져 있으면 Dooray 알림 발송 (실패해도 무시)"""
@@ -160,10 +198,15 @@ class AgentService:
         job_svc: JobService,
         *,
         resume: bool = False,
+        source_ref: str | None = None,
+        workspace_ready: Awaitable[None] | None = None,
     ) -> None:
         """Opus로 플랜 수립 → Sonnet으로 실행. 실패 시 예외 raise.
 
         resume=True이면 이전 task에서 플랜을 복원하고 Sonnet 실행만 수행.
+        workspace_ready가 주어지면 작업 브랜치 체크아웃과 플래닝을 병렬로 진행하고,
+        Sonnet 실행 직전에 체크아웃 완료를 기다림. 이때 API 모드 플래너는
+        source_ref(예: origin/main)에서 git show로 소스 파일을 읽음.
         """
         mode = settings.agent_mode
         logger.info("[agent] Mode: %s | job %s | resume=%s", mode, job.id, resume)
@@ -191,20 +234,29 @@ class AgentService:
         if not plan:
             logger.info("[agent] Phase 1: Planning (Opus) for job %s", job.id)
             if mode == "claude-code":
+                # Claude Code는 워킹 트리를 직접 탐색하므로 체크아웃 완료가 필요
+                if workspace_ready is not None:
+                    await workspace_ready
+                    workspace_ready = None
                 plan = await self._plan_claude_code(job, repo_dir, job_svc)
             else:
-                plan = await self._plan(job, repo_dir, job_svc)
+                plan = await self._plan(job, repo_dir, job_svc, source_ref=source_ref)
+
+        if workspace_ready is not None:
+            await workspace_ready
 
         logger.info("[agent] Phase 2: Executing (Sonnet) for job %s", job.id)
         if mode == "claude-code":
             summary = await self._execute_claude_code(job, repo_dir, work_branch, plan, job_svc)
         else:
-            summary = await self._execute(job, repo_dir, work_branch, plan, job_svc, prev_context=prev_context)
+            summary = await self._execute(
+                job, repo_dir, work_branch, plan, job_svc,
+                prev_context=prev_context, resume=resume,
+            )
 
         if summary:
             logger.info("[agent] Saving summary for job %s", job.id)
-            async with db_context():
-                await job_svc.add_task(job.id, JobTaskType.MESSAGE, content=f"[SUMMARY]\n{summary}", label="최종 완료 요약")
+            await self.task_log.add_task(job.id, JobTaskType.MESSAGE, content=f"[SUMMARY]\n{summary}", label="최종 완료 요약")
 
         # 작업 완료 알림
         await self._notify(NotificationMessage(
@@ -250,10 +302,21 @@ class AgentService:
 
     # ── Phase 1: Planner (Opus) ───────────────────────────────────
 
-    async def _plan(self, job: Job, repo_dir: Path, job_svc: JobService) -> str:
+    async def _plan(
+        self,
+        job: Job,
+        repo_dir: Path,
+        job_svc: JobService,
+        *,
+        source_ref: str | None = None,
+    ) -> str:
         """Opus가 에러를 분석하고 수정 플랜 반환 (도구 없음)"""
-        file_content = self._read_source_file(job, repo_dir)
-        user_prompt = build_plan_prompt(job, file_content)
+        file_content = await self._read_source_file(job, repo_dir, source_ref=source_ref)
+        budgeted = await self._fit_prompt(
+            job.id, "plan", PLANNER_MODEL, PLANNER_SYSTEM_PROMPT,
+            plan_prompt_candidates(job, file_content), job_svc,
+        )
+        user_prompt = budgeted.text
 
         try:
             response = await self._client.messages.create(
@@ -282,16 +345,89 @@ class AgentService:
         )
 
 
-        async with db_context():
-            await job_svc.add_tokens(job.id, response.usage.input_tokens, response.usage.output_tokens)
-            await job_svc.add_task(job.id, JobTaskType.MESSAGE, content=f"[PLAN]\n{plan}", label="Opus 수정 플랜 수립")
+        self.task_log.add_tokens(job.id, response.usage.input_tokens, response.usage.output_tokens)
+        await self.task_log.add_task(job.id, JobTaskType.MESSAGE, content=f"[PLAN]\n{plan}", label="Opus 수정 플랜 수립")
 
         return plan
 
-    def _read_source_file(self, job: Job, repo_dir: Path) -> str | None:
-        """에러 발생 파일 내용 읽기 (Opus 컨텍스트용)"""
+    async def _fit_prompt(
+        self,
+        job_id: str,
+        phase: str,
+        model: str,
+        system: str,
+        candidates: list[tuple[str, str]],
+        job_svc: JobService,
+    ) -> BudgetedPrompt:
+        """(tier, prompt) 후보 중 모델 예산에 맞는 첫 번째 선택 후 결정 내역을 job에 기록.
+
+        로컬 추정치로 먼저 거르고, 예산에 근접한 경우에만 count_tokens 엔드포인트로 확인.
+        모두 초과하면 가장 작은(마지막) 후보 사용.
+        """
+        budget = settings.get_prompt_budget(model)
+        system_tokens = estimate_tokens(system)
+        dropped: list[str] = []
+        counted_by = "estimate"
+        chosen: BudgetedPrompt | None = None
+
+        for i, (tier, text) in enumerate(candidates):
+            tokens = system_tokens + estimate_tokens(text)
+            counted_by = "estimate"
+            if self._client is not None and tokens >= budget * COUNT_TOKENS_THRESHOLD:
+                try:
+                    result = await self._client.messages.count_tokens(
+                        model=model,
+                        system=system,
+                        messages=[{"role": "user", "content": text}],
+                    )
+                    tokens = result.input_tokens
+                    counted_by = "api"
+                except anthropic.APIError as e:
+                    logger.warning("[budget] count_tokens failed, using estimate: %s", e)
+            if tokens <= budget or i == len(candidates) - 1:
+                chosen = BudgetedPrompt(text=text, tier=tier, tokens=tokens, budget=budget, dropped=dropped)
+                break
+            dropped.append(tier)
+
+        logger.info(
+            "[budget] %s prompt: %s (%d/%d tokens, %s)%s",
+            phase, chosen.tier, chosen.tokens, budget, counted_by,
+            f" | dropped: {', '.join(dropped)}" if dropped else "",
+        )
+        await self.task_log.add_task(
+            job_id,
+            JobTaskType.STATUS,
+            content={
+                "phase": phase,
+                "model": model,
+                "tier": chosen.tier,
+                "tokens": chosen.tokens,
+                "budget": budget,
+                "counted_by": counted_by,
+                "dropped": dropped,
+            },
+            label=(
+                f"프롬프트 예산 ({phase}): {chosen.tier} — {chosen.tokens:,}/{budget:,} tokens"
+                + (" (초과)" if not chosen.fits else "")
+            ),
+        )
+        return chosen
+
+    async def _read_source_file(
+        self,
+        job: Job,
+        repo_dir: Path,
+        *,
+        source_ref: str | None = None,
+    ) -> str | None:
+        """에러 발생 파일 내용 읽기 (Opus 컨텍스트용)
+
+        source_ref가 있으면 체크아웃 전이라도 object store에서 직접 읽음.
+        """
         if not job.filename:
             return None
+        if source_ref:
+            return await self.workspace_svc.show_file(repo_dir, source_ref, job.filename)
         filepath = Path(job.filename.replace("\\", "/"))
         full_path = repo_dir / filepath
         if not full_path.exists():
@@ -312,28 +448,50 @@ class AgentService:
         job_svc: JobService,
         *,
         prev_context: str | None = None,
+        resume: bool = False,
     ) -> str:
-        """Sonnet이 플랜을 받아 도구로 코드 수정 + 커밋. 완료 요약 반환."""
-        user_prompt = build_execute_prompt(job, repo_dir, work_branch, plan)
-        if prev_context:
-            user_prompt += (
-                "\n\n## Previous Progress (rate limit로 중단됨)\n"
-                "이전 작업에서 아래 진행 내역이 있습니다. 이어서 작업하세요.\n\n"
-                f"{prev_context}"
+        """Sonnet이 플랜을 받아 도구로 코드 수정 + 커밋. 완료 요약 반환.
+
+        매 턴 종료 시 새 메시지를 체크포인트로 append. resume=True이고 체크포인트가 있으면
+        prev_context 대신 저장된 대화를 그대로 이어서 마지막 턴부터 재개.
+        """
+        checkpoint = None
+        if resume:
+            async with db_context():
+                checkpoint = await job_svc.load_checkpoint(job.id)
+
+        if checkpoint:
+            start_turn, messages = checkpoint
+            logger.info(
+                "[executor] Resuming from checkpoint at turn %d (%d messages)",
+                start_turn + 1, len(messages),
+            )
+        else:
+            # 이전 진행 내역은 후보 본문에 포함 → _fit_prompt가 전체 크기로 예산 판단
+            budgeted = await self._fit_prompt(
+                job.id, "execute", EXECUTOR_MODEL, EXECUTOR_SYSTEM_PROMPT,
+                execute_prompt_candidates(
+                    job, repo_dir, work_branch, plan, settings.get_prompt_budget(EXECUTOR_MODEL),
+                    prev_context=prev_context,
+                ),
+                job_svc,
             )
-        messages: list[anthropic.types.MessageParam] = [
-            {"role": "user", "content": user_prompt},
-        ]
-        last_text = ""
+            user_prompt = budgeted.text
+            start_turn = 0
+            messages = [{"role": "user", "content": user_prompt}]
+            self.task_log.clear_checkpoint(job.id)
+            self.task_log.add_checkpoint(job.id, 0, messages)
+
+        last_text = _last_assistant_text(messages)
 
-        for turn in range(MAX_TURNS):
+        for turn in range(start_turn, MAX_TURNS):
             try:
                 response = await self._client.messages.create(
                     model=EXECUTOR_MODEL,
                     max_tokens=8096,
                     system=EXECUTOR_SYSTEM_PROMPT,
                     tools=TOOLS,
-                    messages=messages,
+                    messages=_with_cache_breakpoint(messages),
                 )
             except anthropic.RateLimitError as e:
                 retry_after = None
@@ -347,10 +505,18 @@ class AgentService:
                 logger.warning("[executor] Rate limited at turn %d (retry_after=%s)", turn + 1, retry_after)
                 raise RateLimitedError(retry_after=retry_after) from e
 
-            async with db_context():
-                await job_svc.add_tokens(job.id, response.usage.input_tokens, response.usage.output_tokens)
+            logger.debug(
+                "[executor] Turn %d | tokens: %d in (%d cached) / %d out",
+                turn + 1, response.usage.input_tokens,
+                response.usage.cache_read_input_tokens or 0, response.usage.output_tokens,
+            )
+            self.task_log.add_tokens(job.id, response.usage.input_tokens, response.usage.output_tokens)
             await self._log_message(job.id, response, job_svc)
-            messages.append({"role": "assistant", "content": response.content})
+            assistant_msg = {
+                "role": "assistant",
+                "content": [b.model_dump(exclude_none=True) for b in response.content],
+            }
+            messages.append(assistant_msg)
 
             texts = [b.text for b in response.content if b.type == "text" and b.text]
             if texts:
@@ -358,6 +524,7 @@ class AgentService:
 
             if response.stop_reason == "end_turn":
                 logger.info("[executor] Completed in %d turns", turn + 1)
+                self.task_log.clear_checkpoint(job.id)
                 return last_text
 
             if response.stop_reason != "tool_use":
@@ -375,7 +542,11 @@ class AgentService:
                     "content": result,
                 })
 
-            messages.append({"role": "user", "content": tool_results})
+            user_msg = {"role": "user", "content": tool_results}
+            messages.append(user_msg)
+            # 턴 단위 체크포인트 — 항상 user 메시지로 끝나므로 그대로 다음 요청에 사용 가능.
+            # task 로그와 같은 flush로 기록, 중단 시 Worker의 상태 전환 트랜잭션에서 남은 분량까지 반영
+            self.task_log.add_checkpoint(job.id, turn + 1, [assistant_msg, user_msg])
 
         raise RuntimeError(f"Agent exceeded max turns ({MAX_TURNS})")
 
@@ -397,8 +568,7 @@ class AgentService:
         plan = result.strip()
         logger.info("[planner/claude-code] Plan created (%d chars)", len(plan))
 
-        async with db_context():
-            await job_svc.add_task(job.id, JobTaskType.MESSAGE, content=f"[PLAN]\n{plan}", label="Opus 수정 플랜 수립")
+        await self.task_log.add_task(job.id, JobTaskType.MESSAGE, content=f"[PLAN]\n{plan}", label="Opus 수정 플랜 수립")
 
         return plan
 
@@ -413,7 +583,14 @@ class AgentService:
         job_svc: JobService,
     ) -> str:
         """claude CLI subprocess로 Sonnet이 플랜 실행. 구독제 사용."""
-        prompt = build_execute_prompt(job, repo_dir, work_branch, plan)
+        budgeted = await self._fit_prompt(
+            job.id, "execute", EXECUTOR_MODEL, EXECUTOR_SYSTEM_PROMPT,
+            execute_prompt_candidates(
+                job, repo_dir, work_branch, plan, settings.get_prompt_budget(EXECUTOR_MODEL),
+            ),
+            job_svc,
+        )
+        prompt = budgeted.text
 
         output = await self._run_claude_cli(
             ["claude", "-p", "--model", EXECUTOR_MODEL, "--dangerously-skip-permissions"],
@@ -423,13 +600,12 @@ class AgentService:
 
         logger.info("[executor/claude-code] Done | output: %d chars", len(output))
 
-        async with db_context():
-            await job_svc.add_task(
-                job.id,
-                JobTaskType.MESSAGE,
-                content=output,
-                label="Claude Code 실행 완료",
-            )
+        await self.task_log.add_task(
+            job.id,
+            JobTaskType.MESSAGE,
+            content=output,
+            label="Claude Code 실행 완료",
+        )
 
         return output
 
@@ -492,11 +668,23 @@ class AgentService:
         repo_dir: Path,
     ) -> str:
         if name == "bash":
-            return await self._run_bash(inputs["command"], repo_dir, inputs.get("timeout", BASH_TIMEOUT))
+            timeout = inputs.get("timeout", BASH_TIMEOUT)
+            if settings.bash_persistent_shell:
+                if self._shell is None or self._shell.cwd != repo_dir:
+                    await self.close_shell()
+                    self._shell = ShellSession(repo_dir)
+                return await self._shell.run(inputs["command"], timeout)
+            return await self._run_bash(inputs["command"], repo_dir, timeout)
         if name == "write_file":
             return self._write_file(inputs["path"], inputs["content"], repo_dir)
         return f"Unknown tool: {name}"
 
+    async def close_shell(self) -> None:
+        """Job 단위 영속 셸 종료 (Worker가 job 처리 종료 시 호출)"""
+        shell, self._shell = self._shell, None
+        if shell is not None:
+            await shell.close()
+
     async def _run_bash(self, command: str, cwd: Path, timeout: int) -> str:
         try:
             result = await asyncio.to_thread(
@@ -537,13 +725,12 @@ class AgentService:
             full_text = "\n".join(texts)
             first_line = full_text.split("\n")[0].strip()[:80]
 
-            async with db_context():
-                await job_svc.add_task(
-                    job_id,
-                    JobTaskType.MESSAGE,
-                    content=full_text,
-                    label=first_line or "Sonnet 응답",
-                )
+            await self.task_log.add_task(
+                job_id,
+                JobTaskType.MESSAGE,
+                content=full_text,
+                label=first_line or "Sonnet 응답",
+            )
 
     async def _log_tool(
         self,
@@ -560,14 +747,13 @@ class AgentService:
             label = block.name
 
 
-        async with db_context():
-            await job_svc.add_task(
-                job_id,
-                JobTaskType.TOOL_USE,
-                content={
-                    "tool": block.name,
-                    "input": block.input,
-                    "output": result,
-                },
-                label=label,
-            )
+        await self.task_log.add_task(
+            job_id,
+            JobTaskType.TOOL_USE,
+            content={
+                "tool": block.name,
+                "input": block.input,
+                "output": result,
+            },
+            label=label,
+        )
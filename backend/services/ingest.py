@@ -0,0 +1,122 @@
+"""웹훅 수신 큐 (WEBHOOK_INGEST_MODE=queue)
+
+요청은 payload 검증 후 bounded 큐에 넣고 바로 202를 반환하고,
+백그라운드 committer가 쌓인 이벤트를 배치로 모아 한 트랜잭션에 기록 (group commit).
+큐가 가득 차면 submit이 거절되어 엔드포인트가 503 + Retry-After로 응답 (backpressure).
+큐는 메모리에만 있으므로 프로세스가 비정상 종료되면 아직 기록되지 않은 이벤트는 유실됨
+(정상 종료 시에는 stop()이 남은 이벤트를 모두 기록).
+"""
+
+import asyncio
+import logging
+
+from core.config import settings
+from core.database import db_write_context
+from models.error import ParsedError
+from services.job_queue import JobService
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookIngestor:
+    def __init__(
+        self,
+        service: JobService | None = None,
+        *,
+        maxsize: int | None = None,
+        batch_size: int | None = None,
+        interval_ms: int | None = None,
+    ):
+        self.service = service or JobService()
+        self.maxsize = maxsize or settings.webhook_queue_size
+        self.batch_size = batch_size or settings.webhook_batch_size
+        self.interval = (interval_ms if interval_ms is not None else settings.webhook_batch_interval_ms) / 1000
+        self._queue: asyncio.Queue[ParsedError | None] | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        # 통계
+        self.accepted = 0
+        self.rejected = 0
+        self.committed = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, parsed: ParsedError) -> bool:
+        """큐에 추가. 가득 찼거나 실행 중이 아니면 False (호출자가 503 응답)"""
+        if not self.is_running or self._stopping:
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(parsed)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def start(self) -> None:
+        if self.is_running:
+            raise RuntimeError("Ingestor is already running")
+        self._queue = asyncio.Queue(self.maxsize)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("Webhook ingestor started (queue=%d, batch=%d)", self.maxsize, self.batch_size)
+
+    async def stop(self) -> None:
+        """새 이벤트를 거절하고, 큐에 남은 이벤트를 모두 기록한 뒤 종료"""
+        if not self.is_running:
+            return
+        self._stopping = True
+        try:
+            self._queue.put_nowait(None)  # 대기 중인 get() 깨우기 (가득 차 있으면 이미 처리 중)
+        except asyncio.QueueFull:
+            pass
+        await self._task
+        logger.info("Webhook ingestor stopped (committed=%d, failed=%d)", self.committed, self.failed)
+
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            first = await self._queue.get()
+            if first is None:
+                continue
+            batch = [first]
+            if self._queue.qsize() < self.batch_size - 1 and not self._stopping:
+                await asyncio.sleep(self.interval)  # 배치 모으기
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            await self._commit(batch)
+
+    async def _commit(self, batch: list[ParsedError]) -> None:
+        try:
+            async with db_write_context():
+                for parsed in batch:
+                    await self.service.ingest_error(parsed)
+        except Exception:
+            # 배치 하나가 실패하면 한 건씩 다시 기록해 문제 이벤트만 버림
+            logger.exception("Webhook batch of %d failed, retrying one by one", len(batch))
+            for parsed in batch:
+                try:
+                    async with db_write_context():
+                        await self.service.ingest_error(parsed)
+                except Exception:
+                    logger.exception("Webhook event dropped: %s/%s", parsed.source.value, parsed.source_issue_id)
+                    self.failed += 1
+                else:
+                    self.committed += 1
+        else:
+            self.committed += len(batch)
+        self.batches += 1
+
+
+# 싱글톤
+webhook_ingestor = WebhookIngestor()
@@ -0,0 +1,127 @@
+"""웹훅 재전송 캐시 - 최근 기록한 (source, issue_id, event_id) → job id
+
+Sentry 재전송/alert rule fan-out은 같은 이벤트를 몇 초 안에 여러 번 보냄.
+이미 기록한 이벤트면 DB 조회 없이 duplicate로 응답하도록 프로세스 메모리에 LRU + TTL로 보관.
+
+- 기록은 트랜잭션 commit 후에만 (rollback된 job을 가리키지 않도록)
+- job이 DONE/FAILED가 되면(job.updated 이벤트) 해당 job의 항목을 제거 → 같은 이벤트가 다시 오면 DB 경로로 재오픈
+- event_id가 다른 새 발생은 캐시 대상이 아님 (occurrence_count 집계를 위해 항상 DB 경로)
+"""
+
+import time
+from collections import OrderedDict
+
+from core import events
+from core.config import settings
+from models.error import ParsedError
+from models.job import JobStatus
+
+CacheKey = tuple[str, str, str]  # (source, issue_id, event_id)
+
+_CLOSED = {JobStatus.DONE.value, JobStatus.FAILED.value}
+
+
+class IngestCache:
+    def __init__(self, maxsize: int | None = None, ttl_seconds: float | None = None):
+        self.maxsize = settings.webhook_dedupe_cache_size if maxsize is None else maxsize
+        self.ttl = settings.webhook_dedupe_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries: OrderedDict[CacheKey, tuple[str, str | None, float]] = OrderedDict()  # → (job_id, status, 만료 시각)
+        self._keys_by_job: dict[str, set[CacheKey]] = {}
+        # 최근 닫힌 job. 기록 commit 직후 worker가 먼저 DONE을 발행한 경우 remember를 무시하기 위함
+        self._closed: OrderedDict[str, None] = OrderedDict()
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.invalidated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    @staticmethod
+    def key_of(parsed: ParsedError) -> CacheKey | None:
+        if not parsed.source_event_id:
+            return None
+        return parsed.source.value, parsed.source_issue_id, parsed.source_event_id
+
+    def lookup(self, key: CacheKey) -> tuple[str, str | None] | None:
+        """이미 기록된 이벤트면 (job_id, status). status는 모르면 None (진행 중인 job)"""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        job_id, status, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return job_id, status
+
+    def remember(self, key: CacheKey, job_id: str, status: str | None = None) -> None:
+        """기록이 commit된 이벤트 등록 (call_after_commit 콜백에서 호출)"""
+        if not self.enabled or job_id in self._closed:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (job_id, status, time.monotonic() + self.ttl)
+        self._keys_by_job.setdefault(job_id, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evicted += 1
+
+    def on_event(self, ev: events.Event) -> None:
+        """job 상태 변경 반영 (event_bus 리스너)"""
+        if ev.type not in (events.JOB_CREATED, events.JOB_UPDATED):
+            return
+        job_id, status = ev.data["id"], ev.data["status"]
+        if status in _CLOSED:
+            self._closed[job_id] = None
+            self._closed.move_to_end(job_id)
+            while len(self._closed) > self.maxsize:
+                self._closed.popitem(last=False)
+            for key in self._keys_by_job.pop(job_id, ()):
+                self._entries.pop(key, None)
+                self.invalidated += 1
+            return
+        self._closed.pop(job_id, None)
+        for key in self._keys_by_job.get(job_id, ()):
+            _, _, expires_at = self._entries[key]
+            self._entries[key] = (job_id, status, expires_at)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_job.clear()
+        self._closed.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "invalidated": self.invalidated,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        job_id, _, _ = self._entries.pop(key)
+        keys = self._keys_by_job.get(job_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_job[job_id]
+
+
+# 싱글톤
+ingest_cache = IngestCache()
+events.event_bus.add_listener(ingest_cache.on_event)
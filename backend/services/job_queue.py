@@ -1,19 +1,52 @@
 """Job Queue 서비스 - JobRepository 위임"""
 
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 
 from models.error import ParsedError
-from models.job import ErrorSource, Job, JobStatus, JobTask, JobTaskType
+from models.job import (
+    ErrorSource,
+    IngestResult,
+    Job,
+    JobSearchHit,
+    JobSearchMatch,
+    JobStatus,
+    JobSummary,
+    JobTask,
+    JobTaskSummary,
+    JobTaskType,
+    ProjectJobStats,
+)
+from repositories.change import ChangeCounterRepository
 from repositories.job import JobRepository
+from repositories.search import SearchRepository, to_fts_query
+from repositories.stats import StatsRepository
+from services.ingest_cache import IngestCache, ingest_cache
 
 
 class JobService:
     def __init__(self, repo: JobRepository | None = None):
         self.repo = repo or JobRepository()
+        self.search_repo = SearchRepository()
+        self.stats_repo = StatsRepository()
+        self.change_repo = ChangeCounterRepository()
 
     async def create_job(self, parsed_error: ParsedError) -> str:
         return await self.repo.create(parsed_error)
 
+    async def ingest_error(self, parsed_error: ParsedError) -> tuple[IngestResult, str]:
+        """웹훅 에러 반영 → (결과, job_id)
+
+        신규면 생성, DONE/FAILED면 PENDING으로 재오픈 (에러 재발생),
+        PENDING/PROCESSING/RATE_LIMITED면 중복으로 무시.
+        commit되면 재전송 캐시에 등록.
+        """
+        result, job_id = await self.repo.upsert_from_error(parsed_error)
+        key = IngestCache.key_of(parsed_error)
+        if key:
+            status = None if result == "duplicate" else JobStatus.PENDING.value
+            self.repo.after_commit(lambda: ingest_cache.remember(key, job_id, status))
+        return result, job_id
+
     async def job_exists(self, source: ErrorSource, source_issue_id: str) -> bool:
         return await self.repo.exists(source.value, source_issue_id)
 
@@ -21,14 +54,16 @@ class JobService:
         db_job = await self.repo.get_by_source(source.value, source_issue_id)
         return Job.from_orm(db_job) if db_job else None
 
+    async def job_id_exists(self, job_id: str) -> bool:
+        return await self.repo.exists_id(job_id)
+
+    async def get_job_updated_at(self, job_id: str) -> datetime | None:
+        return await self.repo.get_updated_at(job_id)
+
     async def get_job(self, job_id: str) -> Job | None:
         db_job = await self.repo.get(job_id)
         return Job.from_orm(db_job) if db_job else None
 
-    async def get_pending_job(self) -> Job | None:
-        db_job = await self.repo.get_pending()
-        return Job.from_orm(db_job) if db_job else None
-
     async def get_next_job(self) -> Job | None:
         """RATE_LIMITED(대기 완료) 우선, PENDING 다음"""
         db_job = await self.repo.get_next_job()
@@ -39,6 +74,7 @@ class JobService:
         job_id: str,
         status: JobStatus,
         *,
+        expected: JobStatus | tuple[JobStatus, ...] | None = None,
         work_branch: str | None = None,
         error_log: str | None = None,
         increment_retry: bool = False,
@@ -46,14 +82,15 @@ class JobService:
     ) -> bool:
         return await self.repo.update_status(
             job_id, status,
+            expected=expected,
             work_branch=work_branch,
             error_log=error_log,
             increment_retry=increment_retry,
             rate_limited_until=rate_limited_until,
         )
 
-    async def add_tokens(self, job_id: str, input_tokens: int, output_tokens: int) -> None:
-        await self.repo.add_tokens(job_id, input_tokens, output_tokens)
+    async def add_tokens(self, job_id: str, input_tokens: int, output_tokens: int) -> tuple[int, int] | None:
+        return await self.repo.add_tokens(job_id, input_tokens, output_tokens)
 
     async def add_task(
         self,
@@ -65,18 +102,92 @@ class JobService:
         db_task = await self.repo.add_task(job_id, type, content, label=label)
         return JobTask.from_orm(db_task)
 
-    async def list_tasks(self, job_id: str) -> list[JobTask]:
-        db_tasks = await self.repo.list_tasks(job_id)
+    async def last_task_sequence(self, job_id: str) -> int:
+        return await self.repo.last_task_sequence(job_id)
+
+    async def list_tasks(self, job_id: str, after_sequence: int = 0) -> list[JobTask]:
+        db_tasks = await self.repo.list_tasks(job_id, after_sequence=after_sequence)
         return [JobTask.from_orm(t) for t in db_tasks]
 
-    async def list_jobs(
+    async def list_task_summaries(self, job_id: str, after_sequence: int = 0) -> list[JobTaskSummary]:
+        rows = await self.repo.list_task_summaries(job_id, after_sequence=after_sequence)
+        return [JobTaskSummary.from_row(r) for r in rows]
+
+    async def get_task(self, job_id: str, sequence: int) -> JobTask | None:
+        db_task = await self.repo.get_task(job_id, sequence)
+        return JobTask.from_orm(db_task) if db_task else None
+
+    async def append_checkpoint(self, job_id: str, turn: int, messages: list[dict]) -> None:
+        await self.repo.append_checkpoint(job_id, turn, messages)
+
+    async def load_checkpoint(self, job_id: str) -> tuple[int, list[dict]] | None:
+        return await self.repo.load_checkpoint(job_id)
+
+    async def clear_checkpoint(self, job_id: str) -> None:
+        await self.repo.clear_checkpoint(job_id)
+
+    async def list_version(self) -> int:
+        """job 목록 변경 카운터 (생성/상태 변경/아카이브 commit마다 +1)"""
+        return await self.change_repo.version("job")
+
+    async def retention_version(self) -> int:
+        """보존 정리 카운터 (task content가 지워질 때마다 +1)"""
+        return await self.change_repo.version("retention")
+
+    async def list_job_summaries(
+        self,
+        status: JobStatus | None = None,
+        source_project_id: str | None = None,
+        after: tuple[datetime, str] | None = None,
+        limit: int = 20,
+    ) -> list[JobSummary]:
+        db_jobs = await self.repo.list_job_summaries(
+            status=status, source_project_id=source_project_id, after=after, limit=limit,
+        )
+        return [JobSummary.from_orm(j) for j in db_jobs]
+
+    @property
+    def search_available(self) -> bool:
+        return self.search_repo.available
+
+    async def search(
         self,
+        query: str,
         status: JobStatus | None = None,
         source_project_id: str | None = None,
-        offset: int = 0,
-        limit: int = 100,
-    ) -> list[Job]:
-        db_jobs = await self.repo.list_jobs(
-            status=status, source_project_id=source_project_id, offset=offset, limit=limit,
+        limit: int = 20,
+    ) -> list[JobSearchHit] | None:
+        """전문 검색. 검색어에 단어가 없으면 None"""
+        fts_query = to_fts_query(query)
+        if fts_query is None:
+            return None
+        hits = await self.search_repo.search(
+            fts_query, status=status, source_project_id=source_project_id, limit=limit,
         )
-        return [Job.from_orm(j) for j in db_jobs]
+        return [
+            JobSearchHit(
+                job=JobSummary.from_orm(job),
+                score=score,
+                matches=[JobSearchMatch(**m) for m in matches],
+            )
+            for job, score, matches in hits
+        ]
+
+    async def project_stats(self, days: int = 7) -> list[ProjectJobStats]:
+        """프로젝트별 상태별 job 수 + 오늘 포함 최근 days일 동안 사용한 토큰 합계"""
+        since = datetime.now(UTC).date() - timedelta(days=days - 1)
+        return [ProjectJobStats(**row) for row in await self.stats_repo.list_by_project(since)]
+
+    async def rebuild_stats(self) -> None:
+        await self.stats_repo.rebuild()
+
+    # ── Retention (services/maintenance.py) ───────────────────────
+
+    async def prune_task_content(self, before: datetime, limit: int) -> int:
+        return await self.repo.prune_task_content(before, limit)
+
+    async def list_archivable(self, before: datetime, limit: int) -> list[dict]:
+        return await self.repo.list_archivable(before, limit)
+
+    async def delete_archived(self, job_ids: list[str], before: datetime) -> list[str]:
+        return await self.repo.delete_archived(job_ids, before)
@@ -0,0 +1,220 @@
+"""보존 정책 백그라운드 정리 (task content 삭제, DONE job 아카이브, incremental vacuum)
+
+maintenance_interval_minutes마다 한 번씩:
+1. retention_archive_days 지난 DONE job을 task와 함께 archive_dir/jobs-YYYY-MM-DD.ndjson.gz에 추가하고 DB에서 삭제
+2. 끝난 job의 retention_task_content_days 지난 task content 삭제 (label은 남아 타임라인은 유지)
+3. 참조가 없어진 blob 삭제
+4. PRAGMA incremental_vacuum으로 free 페이지를 파일에서 반환
+
+모든 쓰기는 maintenance_batch_size 단위의 짧은 db_write_context 트랜잭션으로 나누고
+배치 사이에 writer 락을 내려놓으므로 worker/webhook 쓰기는 한 배치 이상 기다리지 않음.
+아카이브는 파일에 먼저 기록(fsync)한 뒤 삭제 — 중간에 죽으면 같은 job이 다음 실행에서 한 번 더 기록될 수 있음.
+
+실행 방법 (backend 디렉토리에서):
+    목록 ETag는 DB 변경 카운터로 반영되지만, CLI가 발행하는 job/retention 이벤트는 이 프로세스의 event_bus에만
+    전달되어 서버의 /api/events 구독자는 받지 못함. 서버 실행 중에는 MAINTENANCE_INTERVAL_MINUTES 백그라운드 정리를 권장.
+    uv run python -m services.maintenance            # 정리 1회
+    uv run python -m services.maintenance --vacuum   # 정리 후 전체 VACUUM (기존 DB에 auto_vacuum 적용, 서버 중지 후)
+    uv run python -m services.maintenance --rebuild-search  # 전문 검색 인덱스 재생성
+    uv run python -m services.maintenance --rebuild-stats   # 대시보드 집계(job_stats)를 jobs에서 다시 계산
+"""
+
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import orjson
+
+from core import database
+from core.config import settings
+from core.database import db_context, db_write_context
+from repositories.blob import BlobRepository
+from repositories.search import SearchRepository
+from services.job_queue import JobService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MaintenanceReport:
+    tasks_pruned: int = 0
+    jobs_archived: int = 0
+    blobs_deleted: int = 0
+    free_pages: int | None = None  # 정리 후 남은 free 페이지 (auto_vacuum이 꺼진 DB면 None)
+
+
+class MaintenanceRunner:
+    def __init__(
+        self,
+        service: JobService | None = None,
+        *,
+        batch_size: int | None = None,
+        interval_minutes: float | None = None,
+        archive_dir: Path | None = None,
+    ):
+        self.service = service or JobService()
+        self.blob_repo = BlobRepository()
+        self.batch_size = batch_size or settings.maintenance_batch_size
+        self.interval = (interval_minutes or settings.maintenance_interval_minutes) * 60
+        self.archive_dir = archive_dir or settings.archive_dir
+        self._task: asyncio.Task | None = None
+        self._warned_auto_vacuum = False
+        self.last_report: MaintenanceReport | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.retention_task_content_days > 0 or settings.retention_archive_days > 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.is_running:
+            raise RuntimeError("Maintenance is already running")
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Maintenance started (task content %dd, archive %dd, every %.0f min)",
+            settings.retention_task_content_days, settings.retention_archive_days, self.interval / 60,
+        )
+
+    async def stop(self) -> None:
+        """진행 중인 배치는 트랜잭션 단위로 끝나므로 취소해도 반쯤 지운 상태는 남지 않음"""
+        if not self.is_running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Maintenance run failed")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self, now: datetime | None = None) -> MaintenanceReport:
+        now = now or datetime.now(UTC)
+        report = MaintenanceReport()
+        # 아카이브 먼저 — 같은 실행에서 content를 지운 뒤 아카이브하지 않도록
+        if settings.retention_archive_days > 0:
+            report.jobs_archived = await self.archive_jobs(now - timedelta(days=settings.retention_archive_days))
+        if settings.retention_task_content_days > 0:
+            report.tasks_pruned = await self.prune_task_content(
+                now - timedelta(days=settings.retention_task_content_days)
+            )
+        # 참조를 지운 게 없으면 새 고아 blob도 없음
+        if report.tasks_pruned or report.jobs_archived:
+            report.blobs_deleted = await self.delete_unreferenced_blobs()
+        report.free_pages = await self.reclaim_free_pages()
+        self.last_report = report
+        if report.tasks_pruned or report.jobs_archived or report.blobs_deleted:
+            logger.info("Maintenance: %s", asdict(report))
+        return report
+
+    async def prune_task_content(self, before: datetime) -> int:
+        total = 0
+        while True:
+            async with db_write_context():
+                pruned = await self.service.prune_task_content(before, self.batch_size)
+            total += pruned
+            if pruned < self.batch_size:
+                return total
+            await asyncio.sleep(0)  # 대기 중인 writer에게 락 양보
+
+    async def archive_jobs(self, before: datetime) -> int:
+        total = 0
+        while True:
+            async with db_context():
+                records = await self.service.list_archivable(before, self.batch_size)
+            if not records:
+                return total
+            await asyncio.to_thread(self._append_archive, records)
+            async with db_write_context():
+                deleted = await self.service.delete_archived([r["id"] for r in records], before)
+            total += len(deleted)
+            if len(records) < self.batch_size:
+                return total
+            await asyncio.sleep(0)
+
+    def _append_archive(self, records: list[dict]) -> None:
+        """gzip member를 이어 붙여 기록 (gzip/zcat은 여러 member를 하나의 스트림으로 읽음)"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"jobs-{datetime.now(UTC):%Y-%m-%d}.ndjson.gz"
+        lines = b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in records)
+        with open(path, "ab") as f:
+            f.write(gzip.compress(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def delete_unreferenced_blobs(self) -> int:
+        total = 0
+        after: str | None = ""
+        while after is not None:
+            async with db_write_context():
+                after, deleted = await self.blob_repo.delete_unreferenced(after, self.batch_size)
+            total += deleted
+            await asyncio.sleep(0)
+        return total
+
+    async def reclaim_free_pages(self) -> int | None:
+        if not database.is_sqlite():
+            return None  # PostgreSQL은 autovacuum이 처리
+        while True:
+            free_pages = await database.incremental_vacuum(settings.maintenance_vacuum_pages)
+            if free_pages is None:
+                if not self._warned_auto_vacuum:
+                    self._warned_auto_vacuum = True
+                    logger.warning(
+                        "auto_vacuum is not INCREMENTAL on this DB; freed pages are reused but the file won't shrink. "
+                        "Run `python -m services.maintenance --vacuum` once with the server stopped."
+                    )
+                return None
+            if free_pages == 0:
+                return 0
+            await asyncio.sleep(0)
+
+
+# 싱글톤
+maintenance = MaintenanceRunner()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="보존 정리 1회 실행 (서버의 /api/events 구독자는 이 프로세스의 이벤트를 받지 못함)",
+    )
+    parser.add_argument("--vacuum", action="store_true", help="정리 후 전체 VACUUM (auto_vacuum=INCREMENTAL 적용)")
+    parser.add_argument("--rebuild-search", action="store_true", help="전문 검색 인덱스 재생성")
+    parser.add_argument("--rebuild-stats", action="store_true", help="대시보드 집계(job_stats) 재계산")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    await database.init_db()
+    report = await maintenance.run_once()
+    print(asdict(report))
+    if args.vacuum and not database.is_sqlite():
+        print("--vacuum is SQLite-only (PostgreSQL relies on autovacuum)")
+    elif args.vacuum:
+        await database.vacuum()
+        print("VACUUM done")
+    # 검색 인덱스는 rowid로 원래 행을 가리킴 — VACUUM은 보통 rowid를 유지하지만 보장되지 않으므로 다시 생성
+    if (args.vacuum or args.rebuild_search) and database.is_sqlite():
+        async with db_write_context():
+            await SearchRepository().rebuild()
+        print("Search index rebuilt")
+    if args.rebuild_stats:
+        async with db_write_context():
+            await JobService().rebuild_stats()
+        print("Job stats rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
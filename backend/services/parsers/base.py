@@ -1,6 +1,7 @@
-import json
 from abc import ABC, abstractmethod
 
+import orjson
+
 from models.error import ParsedError
 from models.job import ErrorSource
 
@@ -15,19 +16,28 @@ class ErrorParser(ABC):
         pass
 
     @abstractmethod
-    def parse(self, payload: dict) -> ParsedError:
+    def parse(self, payload: dict, raw: bytes | None = None) -> ParsedError:
         """
         webhook payload → ParsedError 변환
 
         Args:
             payload: 원본 webhook payload (dict)
+            raw: 원본 요청 body (있으면 재직렬화 없이 raw_payload로 저장)
 
         Returns:
             ParsedError: 파싱된 에러 정보
         """
         pass
 
-    def _attach_raw_payload(self, parsed: ParsedError, payload: dict) -> ParsedError:
-        """원본 payload 첨부"""
-        parsed.raw_payload = json.dumps(payload, ensure_ascii=False)
+    def parse_json(self, raw: bytes) -> ParsedError:
+        """요청 body(JSON bytes) → ParsedError. 소스별로 bytes에서 바로 검증하도록 override
+
+        Raises:
+            ValidationError: JSON이 아니거나 payload 형식이 맞지 않을 때
+        """
+        return self.parse(orjson.loads(raw), raw=raw)
+
+    def _attach_raw_payload(self, parsed: ParsedError, payload: dict, raw: bytes | None = None) -> ParsedError:
+        """원본 payload 첨부 (요청 body가 있으면 그대로, 없으면 payload 직렬화)"""
+        parsed.raw_payload = (raw or orjson.dumps(payload)).decode()
         return parsed
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing_extensions import TypedDict  # pydantic은 3.12 미만에서 typing.TypedDict 미지원
 
 from models.error import ParsedError, StackFrame
 from models.job import ErrorSource
@@ -6,18 +7,18 @@ from services.parsers.base import ErrorParser
 
 
 # Sentry 전용 Pydantic 모델 (파싱용)
-class SentryStacktraceFrame(BaseModel):
-    filename: str | None = None
-    abs_path: str | None = None
-    function: str | None = None
-    lineno: int | None = None
-    colno: int | None = None
-    context_line: str | None = None
-    pre_context: list[str] | None = None
-    post_context: list[str] | None = None
-    in_app: bool | None = None  # 사용자 코드 여부
-
-    model_config = {"extra": "ignore"}
+# 사용하는 필드만 선언 — model_validate_json은 선언되지 않은 키(spans, contexts 등)를 객체로 만들지 않고 건너뜀
+class SentryStacktraceFrame(TypedDict, total=False):
+    """프레임은 수백 개일 수 있어 모델 인스턴스 대신 dict로 검증 (in_app 프레임만 StackFrame 생성)"""
+    filename: str | None
+    abs_path: str | None
+    function: str | None
+    lineno: int | None
+    colno: int | None
+    context_line: str | None
+    pre_context: list[str] | None
+    post_context: list[str] | None
+    in_app: bool | None  # 사용자 코드 여부
 
 
 class SentryStacktrace(BaseModel):
@@ -46,8 +47,6 @@ class SentryOccurrence(BaseModel):
     """performance issue 등 occurrence 기반 이벤트"""
     issueTitle: str | None = None       # "N+1 Query"
     subtitle: str | None = None         # 실제 쿼리/설명
-    culprit: str | None = None
-    evidenceDisplay: list[dict] | None = None
 
     model_config = {"extra": "ignore"}
 
@@ -57,10 +56,7 @@ class SentryEvent(BaseModel):
     project: int | str | None = None  # Sentry project ID (projects 테이블 조회용)
     issue_id: str | None = None
     title: str | None = None
-    message: str | None = None
-    platform: str | None = None
     level: str | None = None
-    culprit: str | None = None
     environment: str | None = None
     transaction: str | None = None
     web_url: str | None = None
@@ -72,7 +68,6 @@ class SentryEvent(BaseModel):
 
 class SentryWebhookData(BaseModel):
     event: SentryEvent
-    triggered_rule: str | None = None
 
     model_config = {"extra": "ignore"}
 
@@ -91,8 +86,16 @@ class SentryParser(ErrorParser):
     def source(self) -> ErrorSource:
         return ErrorSource.SENTRY
 
-    def parse(self, payload: dict) -> ParsedError:
-        webhook = SentryWebhookPayload.model_validate(payload)
+    def parse(self, payload: dict, raw: bytes | None = None) -> ParsedError:
+        parsed = self._to_parsed(SentryWebhookPayload.model_validate(payload))
+        return self._attach_raw_payload(parsed, payload, raw)
+
+    def parse_json(self, raw: bytes) -> ParsedError:
+        parsed = self._to_parsed(SentryWebhookPayload.model_validate_json(raw))
+        parsed.raw_payload = raw.decode()
+        return parsed
+
+    def _to_parsed(self, webhook: SentryWebhookPayload) -> ParsedError:
         event = webhook.data.event
 
         # exception.values[-1]에서 실제 예외 정보 추출
@@ -110,21 +113,7 @@ class SentryParser(ErrorParser):
                 all_frames = last_exc.stacktrace.frames
 
         # in_app=True 프레임만 필터링 (사용자 코드만)
-        in_app_frames: list[StackFrame] = []
-        for f in all_frames:
-            if f.in_app:
-                in_app_frames.append(
-                    StackFrame(
-                        filename=f.filename,
-                        abs_path=f.abs_path,
-                        function=f.function,
-                        lineno=f.lineno,
-                        colno=f.colno,
-                        context_line=f.context_line,
-                        pre_context=f.pre_context,
-                        post_context=f.post_context,
-                    )
-                )
+        in_app_frames: list[StackFrame] = [StackFrame.model_validate(f) for f in all_frames if f.get("in_app")]
 
         # 마지막 in_app 프레임이 에러 발생 위치
         last_frame = in_app_frames[-1] if in_app_frames else None
@@ -145,10 +134,11 @@ class SentryParser(ErrorParser):
         # message: exception_message가 없으면 subtitle 사용
         message = exception_message or subtitle
 
-        parsed = ParsedError(
+        return ParsedError(
             source=self.source,
             source_project_id=str(event.project) if event.project else None,
             source_issue_id=event.issue_id or event.event_id or "unknown",
+            source_event_id=event.event_id,
             title=title or "Unknown Error",
             subtitle=subtitle,
             message=message,
@@ -162,5 +152,3 @@ class SentryParser(ErrorParser):
             exception_type=exception_type,
             transaction=event.transaction,
         )
-
-        return self._attach_raw_payload(parsed, payload)
@@ -1,10 +1,12 @@
 from models.project import Project, ProjectModel, RepoPlatform
+from repositories.change import ChangeCounterRepository
 from repositories.project import ProjectRepository
 
 
 class ProjectService:
     def __init__(self, repo: ProjectRepository | None = None):
         self.repo = repo or ProjectRepository()
+        self.change_repo = ChangeCounterRepository()
 
     async def create(
         self,
@@ -27,6 +29,10 @@ class ProjectService:
         db_project = await self.repo.get(source, source_project_id)
         return Project.from_orm(db_project) if db_project else None
 
+    async def list_version(self) -> int:
+        """프로젝트 목록 변경 카운터 (생성/수정/삭제 commit마다 +1)"""
+        return await self.change_repo.version("project")
+
     async def list(self, source: str | None = None) -> list[Project]:
         db_projects = await self.repo.list(source=source)
         return [Project.from_orm(p) for p in db_projects]
@@ -0,0 +1,138 @@
+"""bash 도구용 영속 셸 세션 - Job 단위로 하나의 셸 프로세스를 재사용"""
+
+import asyncio
+import logging
+import os
+import shutil
+import signal
+import tempfile
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 셸에 그대로 넘겨줄 환경변수 (API 키/토큰 등은 전달하지 않음)
+_ENV_ALLOWLIST = ("PATH", "LANG", "LC_ALL", "TERM", "TZ", "TMPDIR")
+
+# HOME 아래로 캐시/설정을 쓰는 도구들 — 명시적으로 세션 HOME 안을 가리키게 함
+_HOME_DIRS = {
+    "XDG_CACHE_HOME": ".cache",
+    "XDG_CONFIG_HOME": ".config",
+    "XDG_DATA_HOME": ".local/share",
+    "PIP_CACHE_DIR": ".cache/pip",
+    "UV_CACHE_DIR": ".cache/uv",
+    "npm_config_cache": ".npm",
+    "YARN_CACHE_FOLDER": ".cache/yarn",
+}
+
+_READ_CHUNK = 65536
+
+
+class ShellSession:
+    """파이프로 제어하는 장기 실행 bash 프로세스.
+
+    - 명령마다 고유 sentinel을 출력하게 해서 출력 경계와 exit code를 구분
+    - cwd, export한 환경변수, 활성화한 virtualenv 등이 호출 간에 유지됨
+    - 타임아웃 시 프로세스 그룹째 종료, 다음 호출 때 자동으로 재시작
+    - 환경변수는 allowlist만 전달 (워커의 API 키/토큰 노출 방지)
+    - HOME/캐시 디렉토리는 레포 밖 세션 전용 임시 디렉토리 (작업 트리에 dotfile이 생겨 PR에 섞이지 않도록)
+    """
+
+    def __init__(self, cwd: Path, shell: str = "/bin/bash"):
+        self.cwd = cwd
+        self.shell = shell
+        self._proc: asyncio.subprocess.Process | None = None
+        self._sentinel = f"__PRBOT_{uuid.uuid4().hex}__"
+        self._lock = asyncio.Lock()
+        self._starts = 0
+        self._home: Path | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    def _make_env(self, home: Path) -> dict[str, str]:
+        env = {k: os.environ[k] for k in _ENV_ALLOWLIST if k in os.environ}
+        env["HOME"] = str(home)
+        env.update({name: str(home / sub) for name, sub in _HOME_DIRS.items()})
+        env["GIT_TERMINAL_PROMPT"] = "0"
+        return env
+
+    async def _start(self) -> None:
+        self._home = Path(tempfile.mkdtemp(prefix="pr-bot-shell-home-"))
+        self._proc = await asyncio.create_subprocess_exec(
+            self.shell, "--noprofile", "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=self.cwd,
+            env=self._make_env(self._home),
+            start_new_session=True,  # 타임아웃 시 자식 프로세스까지 한 번에 종료
+        )
+        self._starts += 1
+        logger.info("[shell] Started persistent shell (pid=%d, cwd=%s)", self._proc.pid, self.cwd)
+
+    async def run(self, command: str, timeout: int) -> str:
+        """명령 실행 후 출력 반환. 형식은 기존 bash 도구와 동일."""
+        async with self._lock:
+            restarted = False
+            if not self.alive:
+                restarted = self._starts > 0
+                await self.close()  # 스스로 죽은 이전 셸의 HOME 정리
+                await self._start()
+
+            prefix = "[shell restarted — previous state lost]\n" if restarted else ""
+            # stdin은 /dev/null로 막아 명령이 sentinel 스크립트를 읽어가지 않게 함
+            script = (
+                f"{{ {command}\n}} < /dev/null 2>&1\n"
+                f"printf '\\n{self._sentinel} %d\\n' $?\n"
+            )
+            try:
+                self._proc.stdin.write(script.encode())
+                await self._proc.stdin.drain()
+                output, exit_code = await asyncio.wait_for(self._read_until_sentinel(), timeout)
+            except asyncio.TimeoutError:
+                await self.close()
+                return f"{prefix}[timeout after {timeout}s]"
+            except (BrokenPipeError, ConnectionResetError):
+                await self.close()
+                return f"{prefix}[error] shell process died"
+
+            if exit_code is None:
+                # 명령이 셸 자체를 종료시킴 (exit 등) — 다음 호출에서 재시작
+                await self.close()
+                return f"{prefix}[shell exited]\n{output}"
+            if exit_code != 0:
+                return f"{prefix}[exit {exit_code}]\n{output}"
+            return prefix + (output or "(no output)")
+
+    async def _read_until_sentinel(self) -> tuple[str, int | None]:
+        marker = f"\n{self._sentinel} ".encode()
+        buf = bytearray()
+        scan_from = 0
+        while True:
+            idx = buf.find(marker, scan_from)
+            if idx != -1:
+                end = buf.find(b"\n", idx + len(marker))
+                if end != -1:
+                    exit_code = int(buf[idx + len(marker):end])
+                    return buf[:idx].decode(errors="replace"), exit_code
+            chunk = await self._proc.stdout.read(_READ_CHUNK)
+            if not chunk:
+                return buf.decode(errors="replace"), None
+            scan_from = max(0, len(buf) - len(marker))
+            buf += chunk
+
+    async def close(self) -> None:
+        """셸 프로세스 그룹 종료, 세션 HOME 삭제"""
+        proc, self._proc = self._proc, None
+        home, self._home = self._home, None
+        if proc is not None and proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+            logger.info("[shell] Closed persistent shell (pid=%d)", proc.pid)
+        if home is not None:
+            shutil.rmtree(home, ignore_errors=True)
@@ -0,0 +1,299 @@
+"""에러 발생 지점 소스 컨텍스트 추출 - 전체 파일 대신 필요한 부분만 플래너에 전달
+
+- Python: ast로 에러 줄을 감싸는 함수/클래스, 모듈 import, 영역에서 참조하는 정의 추출
+- 그 외 언어: 들여쓰기/중괄호 휴리스틱
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+
+REGION_MAX_LINES = 200       # 감싸는 함수/클래스 최대 줄 수 (넘으면 에러 줄 중심으로 자름)
+DEFINITION_MAX_LINES = 60    # 참조 정의 하나당 최대 줄 수
+DEFINITIONS_MAX_LINES = 300  # 참조 정의 전체 최대 줄 수
+
+# 확장자 → 코드 블록 언어
+_LANGUAGES = {
+    ".py": "python", ".pyi": "python",
+    ".js": "javascript", ".jsx": "jsx", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "tsx",
+    ".java": "java", ".kt": "kotlin", ".kts": "kotlin", ".scala": "scala",
+    ".go": "go", ".rs": "rust", ".rb": "ruby", ".php": "php", ".swift": "swift",
+    ".c": "c", ".h": "c", ".cc": "cpp", ".cpp": "cpp", ".hpp": "cpp", ".cs": "csharp",
+}
+_BRACE_LANGUAGES = {
+    "javascript", "jsx", "typescript", "tsx", "java", "kotlin", "scala",
+    "go", "rust", "php", "swift", "c", "cpp", "csharp",
+}
+
+_IMPORT_RE = re.compile(
+    r"^\s*(import\b|from\s+\S+\s+import\b|#include\b|using\b|package\b|use\b|require\b"
+    r"|(const|let|var)\s+.+=\s*require\()"
+)
+_BLOCK_START_RE = re.compile(
+    r"^\s*(export\s+)?(default\s+)?(public\s+|private\s+|protected\s+|internal\s+|static\s+|abstract\s+"
+    r"|final\s+|async\s+|pub\s+|override\s+)*"
+    r"(def|class|function|func|fn|interface|struct|enum|impl|trait|object|module)\b"
+)
+_DEFINITION_RE = re.compile(
+    r"^(export\s+)?(default\s+)?(pub\s+)?(async\s+)?"
+    r"(def|class|function|func|fn|interface|struct|enum|trait|type|const|let|var)\s+(\w+)"
+)
+_IDENT_RE = re.compile(r"[A-Za-z_]\w*")
+
+
+@dataclass
+class Definition:
+    name: str
+    start: int  # 1-based
+    code: str
+
+
+@dataclass
+class SourceContext:
+    """플래너용 소스 컨텍스트"""
+
+    language: str
+    total_lines: int
+    region_start: int            # 1-based
+    region: str                  # 에러 줄을 감싸는 함수/클래스 (없으면 주변 줄)
+    region_name: str | None = None
+    imports: str | None = None
+    definitions: list[Definition] = field(default_factory=list)
+
+    @property
+    def region_end(self) -> int:
+        return self.region_start + self.region.count("\n")
+
+
+def detect_language(filename: str | None) -> str:
+    """파일 확장자로 코드 블록 언어 추정 (모르면 빈 문자열)"""
+    if not filename:
+        return ""
+    return _LANGUAGES.get(PurePosixPath(filename.replace("\\", "/")).suffix.lower(), "")
+
+
+def extract_context(source: str, lineno: int | None, filename: str | None = None) -> SourceContext | None:
+    """lineno 주변 소스 컨텍스트 추출. lineno가 파일 범위를 벗어나면 None"""
+    lines = source.splitlines()
+    if not lineno or lineno > len(lines):
+        return None
+    language = detect_language(filename)
+    if language == "python":
+        try:
+            return _extract_python(source, lines, lineno)
+        except (SyntaxError, ValueError):
+            pass  # 문법 오류 (Python 2 코드 등) → 휴리스틱
+    return _extract_heuristic(lines, lineno, language)
+
+
+# ── Python (ast) ──────────────────────────────────────────────────
+
+_DEF_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _node_start(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", None) or []
+    return min([node.lineno] + [d.lineno for d in decorators])
+
+
+def _extract_python(source: str, lines: list[str], lineno: int) -> SourceContext:
+    tree = ast.parse(source)
+
+    imports = [
+        "\n".join(lines[node.lineno - 1:node.end_lineno])
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+
+    # 에러 줄을 감싸는 가장 안쪽 def/class 탐색 (바깥 클래스는 메서드 참조 해석용으로 보관)
+    path: list[ast.AST] = []
+    nodes = tree.body
+    while True:
+        inner = next(
+            (n for n in nodes if isinstance(n, _DEF_NODES) and _node_start(n) <= lineno <= n.end_lineno),
+            None,
+        )
+        if inner is None:
+            break
+        path.append(inner)
+        nodes = inner.body
+    region_node = path[-1] if path else None
+    enclosing_class = next((n for n in reversed(path) if isinstance(n, ast.ClassDef)), None)
+
+    if region_node is not None:
+        start, end = _clip(_node_start(region_node), region_node.end_lineno, lineno)
+        region_name = ".".join(n.name for n in path)
+    else:
+        start, end = _clip(max(1, lineno - REGION_MAX_LINES // 2), len(lines), lineno)
+        region_name = None
+
+    # 영역에서 참조하는 이름 → 모듈/클래스 수준 정의
+    module_defs = _python_module_definitions(tree)
+    class_defs = {
+        n.name: n for n in (enclosing_class.body if enclosing_class else [])
+        if isinstance(n, _DEF_NODES)
+    }
+    if region_node is not None:
+        scopes = [region_node]
+    else:
+        scopes = [n for n in tree.body if n.lineno <= end and n.end_lineno >= start]
+    referenced: list[ast.AST] = []
+    for node in (n for scope in scopes for n in ast.walk(scope)):
+        target = None
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            target = module_defs.get(node.id)
+        elif (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in ("self", "cls")
+        ):
+            target = class_defs.get(node.attr)
+        if target is not None and target not in referenced:
+            referenced.append(target)
+
+    definitions = []
+    for node in sorted(referenced, key=_node_start):
+        d_start, d_end = _node_start(node), node.end_lineno
+        if d_start <= lineno <= d_end or (start <= d_start and d_end <= end):
+            continue  # 이미 영역에 포함됨
+        name = getattr(node, "name", None) or _assign_name(node)
+        definitions.append(Definition(name, d_start, _head(lines, d_start, d_end)))
+
+    return SourceContext(
+        language="python",
+        total_lines=len(lines),
+        region_start=start,
+        region="\n".join(lines[start - 1:end]).rstrip(),
+        region_name=region_name,
+        imports="\n".join(imports) or None,
+        definitions=_limit(definitions),
+    )
+
+
+def _python_module_definitions(tree: ast.Module) -> dict[str, ast.AST]:
+    defs: dict[str, ast.AST] = {}
+    for node in tree.body:
+        if isinstance(node, _DEF_NODES):
+            defs[node.name] = node
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for t in targets:
+                if isinstance(t, ast.Name):
+                    defs[t.id] = node
+    return defs
+
+
+def _assign_name(node: ast.AST) -> str:
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return ", ".join(t.id for t in targets if isinstance(t, ast.Name))
+
+
+# ── 그 외 언어 (휴리스틱) ─────────────────────────────────────────
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def _block_end(lines: list[str], start: int, braces: bool) -> int:
+    """start(0-based) 줄에서 시작하는 블록의 끝 (exclusive, 0-based)"""
+    if braces:
+        depth = 0
+        opened = False
+        for i in range(start, len(lines)):
+            code = lines[i].split("//")[0]
+            depth += code.count("{") - code.count("}")
+            opened = opened or "{" in code
+            if opened and depth <= 0:
+                return i + 1
+    base = _indent(lines[start])
+    end = start + 1
+    while end < len(lines) and (not lines[end].strip() or _indent(lines[end]) > base):
+        end += 1
+    # 닫는 괄호 줄(`}`, `end`)까지 포함
+    if end < len(lines) and _indent(lines[end]) == base and lines[end].strip() in ("}", "};", "end"):
+        end += 1
+    return end
+
+
+def _extract_heuristic(lines: list[str], lineno: int, language: str) -> SourceContext:
+    braces = language in _BRACE_LANGUAGES
+    idx = lineno - 1
+
+    # 위로 올라가며 더 얕은 블록 시작(def/function/class 등) 탐색
+    start = None
+    limit = _indent(lines[idx]) + 1
+    for i in range(idx, -1, -1):
+        line = lines[i]
+        if not line.strip() or _indent(line) >= limit:
+            continue
+        limit = _indent(line)
+        if _BLOCK_START_RE.match(line):
+            start = i
+            break
+        if limit == 0:
+            break
+
+    if start is not None:
+        end = _block_end(lines, start, braces)
+        region_name = _DEFINITION_RE.match(lines[start].strip())
+        region_name = region_name.group(6) if region_name else None
+    else:
+        start, end = max(0, idx - REGION_MAX_LINES // 2), len(lines)
+        region_name = None
+    start, end = _clip(start + 1, end, lineno)
+    region = "\n".join(lines[start - 1:end]).rstrip()
+
+    imports = [line for line in lines[:200] if _IMPORT_RE.match(line)]
+
+    referenced = set(_IDENT_RE.findall(region))
+    definitions = []
+    for i, line in enumerate(lines):
+        if _indent(line) != 0 or start - 1 <= i < end:
+            continue
+        m = _DEFINITION_RE.match(line)
+        if m and m.group(6) in referenced and m.group(6) != region_name:
+            d_end = _block_end(lines, i, braces)
+            definitions.append(Definition(m.group(6), i + 1, _head(lines, i + 1, d_end)))
+
+    return SourceContext(
+        language=language,
+        total_lines=len(lines),
+        region_start=start,
+        region=region,
+        region_name=region_name,
+        imports="\n".join(imports) or None,
+        definitions=_limit(definitions),
+    )
+
+
+# ── 공통 ──────────────────────────────────────────────────────────
+
+def _clip(start: int, end: int, lineno: int) -> tuple[int, int]:
+    """[start, end] (1-based, inclusive)를 REGION_MAX_LINES 이내로, lineno 중심으로 자름"""
+    if end - start + 1 <= REGION_MAX_LINES:
+        return start, end
+    start = max(start, lineno - REGION_MAX_LINES // 2)
+    return start, min(end, start + REGION_MAX_LINES - 1)
+
+
+def _head(lines: list[str], start: int, end: int) -> str:
+    """정의 코드 (DEFINITION_MAX_LINES 초과 시 앞부분만)"""
+    clipped = end > start + DEFINITION_MAX_LINES - 1
+    end = min(end, start + DEFINITION_MAX_LINES - 1)
+    code = "\n".join(lines[start - 1:end]).rstrip()
+    if clipped:
+        code += "\n    ..."
+    return code
+
+
+def _limit(definitions: list[Definition]) -> list[Definition]:
+    kept, total = [], 0
+    for d in definitions:
+        n = d.code.count("\n") + 1
+        if total + n > DEFINITIONS_MAX_LINES:
+            break
+        kept.append(d)
+        total += n
+    return kept
@@ -0,0 +1,215 @@
+"""Job 작업 히스토리 버퍼링 writer - job_tasks/토큰 기록을 모아서 한 트랜잭션으로 flush"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import event
+
+from core.config import settings
+from core.database import db_context, db_write_context
+from models.job import JobTaskType
+from repositories.job import JobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TaskLogWriter:
+    """add_task/add_tokens/add_checkpoint를 메모리에 모았다가 flush.
+
+    - sequence는 job별로 메모리에서 발급 (첫 사용 시 DB의 마지막 sequence에서 이어감)
+    - max_events건이 쌓이거나 첫 이벤트 후 interval_ms가 지나면 flush
+    - 토큰 사용량도 같은 flush에서 job별로 합산해 한 번에 반영
+    - executor 체크포인트 append/clear도 같은 트랜잭션에서 순서대로 반영 (턴마다 별도 commit 없음)
+    - job 종료/Worker 종료 시 flush()/close()로 남은 이벤트를 반드시 기록
+    - 기록한 트랜잭션이 rollback되면 이벤트를 버퍼로 되돌림 (타이머 재시도는 flush_retries회까지)
+    """
+
+    def __init__(
+        self,
+        repo: JobRepository | None = None,
+        *,
+        max_events: int | None = None,
+        interval_ms: int | None = None,
+        flush_retries: int | None = None,
+    ):
+        self.repo = repo or JobRepository()
+        self.max_events = max_events or settings.task_log_flush_events
+        self.interval = (interval_ms or settings.task_log_flush_interval_ms) / 1000
+        self.flush_retries = settings.task_log_flush_retries if flush_retries is None else flush_retries
+        self._sequences: dict[str, int] = {}
+        self._tasks: list[dict] = []
+        self._tokens: dict[str, list[int]] = {}
+        self._checkpoints: list[tuple[str, int | None, list[dict] | None]] = []  # (job_id, turn, messages), turn=None은 clear
+        self._timer: asyncio.Task | None = None
+        self._failures = 0  # 타이머 flush 연속 실패 횟수
+        self.flushes = 0  # 통계 (벤치마크/테스트용)
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def add_task(
+        self,
+        job_id: str,
+        type: JobTaskType,
+        content: dict | str | None = None,
+        label: str | None = None,
+    ) -> int:
+        """이벤트를 버퍼에 추가하고 발급한 sequence 반환"""
+        sequence = await self._next_sequence(job_id)
+        self._tasks.append({
+            "id": str(uuid.uuid4()),
+            "job_id": job_id,
+            "sequence": sequence,
+            "type": type.value,
+            "label": label,
+            "content": json.dumps(content, ensure_ascii=False) if isinstance(content, dict) else content,
+            "created_at": datetime.now(UTC),
+        })
+        if len(self._tasks) >= self.max_events:
+            await self.flush()
+        else:
+            self._schedule()
+        return sequence
+
+    def add_tokens(self, job_id: str, input_tokens: int, output_tokens: int) -> None:
+        """토큰 사용량 누적 (다음 flush에 반영)"""
+        totals = self._tokens.setdefault(job_id, [0, 0])
+        totals[0] += input_tokens
+        totals[1] += output_tokens
+        self._schedule()
+
+    def add_checkpoint(self, job_id: str, turn: int, messages: list[dict]) -> None:
+        """executor 체크포인트 append (다음 flush에 반영)"""
+        self._checkpoints.append((job_id, turn, list(messages)))  # 호출자가 이후 messages에 append하므로 복사
+        self._schedule()
+
+    def clear_checkpoint(self, job_id: str) -> None:
+        """executor 체크포인트 삭제 (다음 flush에 반영, 앞서 쌓인 append 이후 순서대로)"""
+        self._checkpoints.append((job_id, None, None))
+        self._schedule()
+
+    async def write_pending(self) -> int:
+        """버퍼를 현재 세션(db_session)에 기록. 호출자 트랜잭션과 함께 commit됨.
+
+        상태 전환과 마지막 이벤트를 한 트랜잭션으로 묶을 때 사용.
+        트랜잭션이 commit되지 않고 끝나면(rollback) 꺼낸 이벤트를 버퍼로 되돌림.
+        """
+        tasks, tokens, checkpoints = self._take()
+        if not tasks and not tokens and not checkpoints:
+            return 0
+        outcome = self._watch_transaction(tasks, tokens, checkpoints)
+        try:
+            await self.repo.insert_tasks(tasks)
+            for job_id, (input_tokens, output_tokens) in tokens.items():
+                await self.repo.add_tokens(job_id, input_tokens, output_tokens)
+            for job_id, turn, messages in checkpoints:
+                if turn is None:
+                    await self.repo.clear_checkpoint(job_id)
+                else:
+                    await self.repo.append_checkpoint(job_id, turn, messages)
+        except Exception:
+            outcome["done"] = True  # 여기서 되돌렸으므로 rollback hook은 무시
+            self._restore(tasks, tokens, checkpoints)
+            raise
+        self.flushes += 1
+        return len(tasks)
+
+    async def flush(self) -> int:
+        """버퍼를 별도 쓰기 트랜잭션으로 기록. 기록한 task 수 반환"""
+        if not self._tasks and not self._tokens and not self._checkpoints:
+            return 0
+        async with db_write_context():
+            return await self.write_pending()
+
+    def release(self, job_id: str) -> None:
+        """job 처리 종료 후 sequence 캐시 해제 (다음 처리 때 DB에서 다시 읽음).
+
+        flush 실패로 sequence를 발급한 task가 버퍼에 남아 있으면 유지 — DB에서 다시 읽으면 같은 번호를 또 발급함.
+        """
+        if any(task["job_id"] == job_id for task in self._tasks):
+            return
+        self._sequences.pop(job_id, None)
+
+    async def close(self) -> None:
+        """타이머 정리 후 남은 이벤트 flush (Worker 종료 시)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+    async def _next_sequence(self, job_id: str) -> int:
+        if job_id not in self._sequences:
+            async with db_context():
+                last = await self.repo.last_task_sequence(job_id)
+            # 아직 commit 안 된 버퍼(재시도 대기)의 sequence 이후부터
+            last = max([last, *(task["sequence"] for task in self._tasks if task["job_id"] == job_id)])
+            self._sequences.setdefault(job_id, last)  # await 중 다른 호출이 먼저 채웠으면 유지
+        self._sequences[job_id] += 1
+        return self._sequences[job_id]
+
+    def _take(self) -> tuple[list[dict], dict[str, list[int]], list[tuple]]:
+        tasks, self._tasks = self._tasks, []
+        tokens, self._tokens = self._tokens, {}
+        checkpoints, self._checkpoints = self._checkpoints, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return tasks, tokens, checkpoints
+
+    def _watch_transaction(self, tasks: list[dict], tokens: dict[str, list[int]], checkpoints: list[tuple]) -> dict:
+        """현재 트랜잭션이 commit 없이 끝나면 꺼낸 버퍼를 되돌리는 session hook"""
+        session = self.repo.session.sync_session
+        outcome = {"committed": False, "done": False}
+
+        @event.listens_for(session, "after_commit")
+        def committed(_session) -> None:
+            outcome["committed"] = True
+
+        @event.listens_for(session, "after_transaction_end")
+        def ended(_session, transaction) -> None:
+            if transaction.parent is not None or outcome["done"]:
+                return
+            outcome["done"] = True
+            if outcome["committed"]:
+                self._failures = 0
+            else:
+                logger.warning("[task-log] Transaction rolled back, re-buffering %d events", len(tasks))
+                self._restore(tasks, tokens, checkpoints)
+
+        return outcome
+
+    def _restore(self, tasks: list[dict], tokens: dict[str, list[int]], checkpoints: list[tuple]) -> None:
+        """기록 실패 시 버퍼로 되돌림 (다음 flush에서 재시도)"""
+        self._tasks[:0] = tasks
+        self._checkpoints[:0] = checkpoints
+        for job_id, (input_tokens, output_tokens) in tokens.items():
+            totals = self._tokens.setdefault(job_id, [0, 0])
+            totals[0] += input_tokens
+            totals[1] += output_tokens
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            self._failures += 1
+            if self._failures <= self.flush_retries:
+                logger.exception("[task-log] Flush failed (%d/%d), will retry", self._failures, self.flush_retries)
+                self._schedule()
+                return
+            tasks, tokens, checkpoints = self._take()
+            self._failures = 0
+            logger.exception(
+                "[task-log] Flush failed %d times, dropping %d events, token usage of %d jobs and %d checkpoints",
+                self.flush_retries + 1, len(tasks), len(tokens), len(checkpoints),
+            )
@@ -4,6 +4,8 @@ import asyncio
 import logging
 from datetime import UTC, datetime
 
+from core.events import WORKER_STATUS, event_bus
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +39,7 @@ class WorkerManager:
                 task_status = "running"
 
         return {
+            "running": task_status == "running",
             "status": task_status,
             "current_job_id": self.current_job_id,
             "started_at": self.started_at,
@@ -56,6 +59,7 @@ class WorkerManager:
         self.stopped_at = None
         self._task = asyncio.create_task(self._run_worker())
         logger.info("Worker started")
+        self._publish_status()
 
     async def stop(self, timeout: float = 30.0) -> None:
         if not self.is_running:
@@ -70,6 +74,7 @@ class WorkerManager:
 
         self.stopped_at = datetime.now(UTC)
         logger.info("Worker stopped")
+        self._publish_status()
 
     async def _run_worker(self) -> None:
         try:
@@ -78,6 +83,10 @@ class WorkerManager:
             self.error = str(e)
             self.stopped_at = datetime.now(UTC)
             logger.error("Worker crashed: %s", e)
+            self._publish_status()
+
+    def _publish_status(self) -> None:
+        event_bus.publish(WORKER_STATUS, self.status())
 
 
 # 싱글톤
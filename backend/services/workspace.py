@@ -3,11 +3,14 @@
 import asyncio
 import re
 import subprocess
+from collections import OrderedDict
 from pathlib import Path
 
 from core.config import settings
 from models.project import RepoPlatform
 
+BLOB_CACHE_SIZE = 32  # show_file LRU 캐시 (blob SHA → 내용)
+
 
 class WorkspaceService:
     """레포별 git 워크스페이스 관리.
@@ -19,6 +22,7 @@ class WorkspaceService:
 
     def __init__(self):
         self._cache: dict[str, Path] = {}  # repo_url → cloned path
+        self._blobs: OrderedDict[str, str] = OrderedDict()  # blob SHA → 파일 내용
 
     def _repo_dir(self, repo_url: str) -> Path:
         safe_name = re.sub(r"[^\w.-]", "_", repo_url.split("://")[-1])
@@ -35,7 +39,11 @@ class WorkspaceService:
         return repo_url
 
     async def prepare(self, repo_url: str, platform: str, token: str | None = None) -> Path:
-        """레포 clone 또는 pull 후 워크스페이스 경로 반환"""
+        """레포 clone 또는 fetch 후 워크스페이스 경로 반환.
+
+        워킹 트리 체크아웃은 하지 않음 (create_work_branch에서 수행).
+        그 사이 플래너는 show_file로 object store에서 직접 소스를 읽을 수 있음.
+        """
         repo_dir = self._repo_dir(repo_url)
         auth_url = self._authenticated_url(repo_url, platform, token)
 
@@ -48,7 +56,7 @@ class WorkspaceService:
             await self._run(["git", "-C", str(repo_dir), "fetch", "--all", "--prune"])
         else:
             settings.workspace_dir.mkdir(parents=True, exist_ok=True)
-            await self._run(["git", "clone", auth_url, str(repo_dir)])
+            await self._run(["git", "clone", "--no-checkout", auth_url, str(repo_dir)])
 
         # 봇 전용 커밋 author 설정
         await self._run(["git", "-C", str(repo_dir), "config", "user.name", settings.bot_git_name])
@@ -81,6 +89,27 @@ class WorkspaceService:
             "checkout", "-B", work_branch, f"origin/{base_branch}",
         ])
 
+    async def show_file(self, repo_dir: Path, ref: str, path: str) -> str | None:
+        """체크아웃 없이 ref 시점의 파일 내용 조회. 없으면 None
+
+        blob SHA 기준 LRU 캐시 — 같은 파일을 여러 job이 참조해도 내용이 같으면 재사용.
+        """
+        rel = path.replace("\\", "/").lstrip("/")
+        if rel.startswith("./"):
+            rel = rel[2:]
+        try:
+            sha = (await self._run(["git", "-C", str(repo_dir), "rev-parse", f"{ref}:{rel}"])).strip()
+            if sha in self._blobs:
+                self._blobs.move_to_end(sha)
+                return self._blobs[sha]
+            content = await self._run(["git", "-C", str(repo_dir), "cat-file", "blob", sha])
+        except RuntimeError:
+            return None
+        self._blobs[sha] = content
+        if len(self._blobs) > BLOB_CACHE_SIZE:
+            self._blobs.popitem(last=False)
+        return content
+
     async def commit_all(self, repo_dir: Path, message: str) -> str | None:
         """변경사항 전체 커밋. 변경 없으면 None 반환"""
         status = await self._run(["git", "-C", str(repo_dir), "status", "--porcelain"])
@@ -109,4 +138,4 @@ class WorkspaceService:
             raise RuntimeError(
                 f"Git command failed: {' '.join(cmd)}\n{result.stderr.decode().strip()}"
             )
-        return result.stdout.decode()
+        return result.stdout.decode(errors="replace")
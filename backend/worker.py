@@ -8,15 +8,17 @@ import asyncio
 import logging
 import signal
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
 import anthropic
 
 from core.config import settings
-from core.database import db_context, init_db
+from core.database import db_context, db_write_context, init_db
 from models.job import Job, JobStatus, JobTaskType
 from services.agent import AgentService, RateLimitedError
 from services.job_queue import JobService
 from services.project import ProjectService
+from services.task_log import TaskLogWriter
 from services.workspace import WorkspaceService
 
 logging.basicConfig(
@@ -50,25 +52,30 @@ class Worker:
         self.job_svc = JobService()
         self.project_svc = ProjectService()
         self.workspace_svc = WorkspaceService()
-        self.agent_svc = AgentService()
+        self.task_log = TaskLogWriter()
+        self.agent_svc = AgentService(task_log=self.task_log, workspace_svc=self.workspace_svc)
         self._running = True
         self.current_job_id: str | None = None  # WorkerManager가 상태 노출에 사용
 
     async def run(self):
         logger.info("Worker started (poll_interval=%ds)", settings.worker_poll_interval)
-        while self._running:
-            try:
-                async with db_context():
-                    job = await self.job_svc.get_next_job()
-
-                if job:
-                    await self._process(job)
-                else:
+        try:
+            while self._running:
+                try:
+                    async with db_write_context():
+                        job = await self.job_svc.get_next_job()
+
+                    if job:
+                        await self._process(job)
+                    else:
+                        await asyncio.sleep(settings.worker_poll_interval)
+
+                except Exception:
+                    logger.exception("Unexpected worker error")
                     await asyncio.sleep(settings.worker_poll_interval)
-
-            except Exception:
-                logger.exception("Unexpected worker error")
-                await asyncio.sleep(settings.worker_poll_interval)
+        finally:
+            # 종료(취소 포함) 시 버퍼에 남은 작업 히스토리 기록
+            await self.task_log.close()
 
     async def _process(self, job: Job) -> None:
         self.current_job_id = job.id
@@ -77,10 +84,10 @@ class Worker:
         logger.info("Processing job %s: %s (resume=%s)", job.id, job.title, resume)
 
         # ── 1. 작업 시작 기록 (PROCESSING 전환은 get_next_job에서 atomic하게 처리됨)
-        async with db_context():
-            label = "작업 재개 (rate limit 해제)" if resume else "작업 처리 시작"
-            await self.job_svc.add_task(job.id, JobTaskType.STATUS, content="processing", label=label)
+        label = "작업 재개 (rate limit 해제)" if resume else "작업 처리 시작"
+        await self.task_log.add_task(job.id, JobTaskType.STATUS, content="processing", label=label)
 
+        checkout: asyncio.Task | None = None
         try:
             # ── 2. 프로젝트 정보 조회 (get_next_job에서 projects 조인으로 보장됨)
             async with db_context():
@@ -91,7 +98,7 @@ class Worker:
                     f"No project registered for {job.source.value}/{job.source_project_id}"
                 )
 
-            # ── 3. 워크스페이스 준비 (clone/fetch) ────────────────────
+            # ── 3. 워크스페이스 준비 (clone/fetch, 체크아웃 없음) ──────
             repo_dir = await self.workspace_svc.prepare(
                 project.repo_url, project.repo_platform.value, token=project.repo_token,
             )
@@ -103,45 +110,59 @@ class Worker:
             else:
                 base_branch = await self.workspace_svc.get_default_branch(repo_dir)
             work_branch = f"fix/{job.id[:8]}"
-            await self.workspace_svc.create_work_branch(repo_dir, base_branch, work_branch)
-
-            logger.info("Branch ready: %s (base: %s)", work_branch, base_branch)
+            # 체크아웃은 백그라운드로 진행 — 그동안 Opus가 object store에서 읽은 소스로 플래닝
+            checkout = asyncio.create_task(
+                self._checkout_work_branch(repo_dir, base_branch, work_branch)
+            )
 
             # ── 5. Claude 에이전트 실행 ───────────────────────────────
-            await self.agent_svc.run(job, repo_dir, work_branch, self.job_svc, resume=resume)
+            await self.agent_svc.run(
+                job, repo_dir, work_branch, self.job_svc,
+                resume=resume,
+                source_ref=f"origin/{base_branch}",
+                workspace_ready=checkout,
+            )
 
             # ── 6. 변경사항 push ──────────────────────────────────────
             await self.workspace_svc.push_branch(repo_dir, work_branch)
 
-            # ── 7. DONE 처리 ──────────────────────────────────────────
-            async with db_context():
-                await self.job_svc.update_job_status(
+            # ── 7. DONE 처리 (남은 작업 히스토리와 같은 트랜잭션) ─────
+            await self.task_log.add_task(job.id, JobTaskType.STATUS, content="done", label="작업 완료 — PR 브랜치 생성됨")
+            async with db_write_context():
+                updated = await self.job_svc.update_job_status(
                     job.id,
                     JobStatus.DONE,
+                    expected=JobStatus.PROCESSING,
                     work_branch=work_branch,
                 )
-                await self.job_svc.add_task(job.id, JobTaskType.STATUS, content="done", label="작업 완료 — PR 브랜치 생성됨")
-
-            logger.info("Job %s done → branch: %s", job.id, work_branch)
+                await self.task_log.write_pending()
+            if not updated:
+                logger.warning("Job %s is no longer PROCESSING, DONE transition skipped", job.id)
+            else:
+                logger.info("Job %s done → branch: %s", job.id, work_branch)
 
         except RateLimitedError as e:
             wait_seconds = e.retry_after or DEFAULT_RATE_LIMIT_WAIT
             until = datetime.now(UTC) + timedelta(seconds=wait_seconds)
             logger.warning("Job %s rate limited → wait until %s (%ds)", job.id, until.isoformat(), wait_seconds)
 
-            async with db_context():
-                await self.job_svc.update_job_status(
+            await self.task_log.add_task(
+                job.id,
+                JobTaskType.ERROR,
+                content={"error": str(e), "retry_after": wait_seconds},
+                label=f"Rate limited — {wait_seconds}초 후 재개",
+            )
+            async with db_write_context():
+                updated = await self.job_svc.update_job_status(
                     job.id,
                     JobStatus.RATE_LIMITED,
+                    expected=JobStatus.PROCESSING,
                     error_log=str(e),
                     rate_limited_until=until,
                 )
-                await self.job_svc.add_task(
-                    job.id,
-                    JobTaskType.ERROR,
-                    content={"error": str(e), "retry_after": wait_seconds},
-                    label=f"Rate limited — {wait_seconds}초 후 재개",
-                )
+                await self.task_log.write_pending()
+            if not updated:
+                logger.warning("Job %s is no longer PROCESSING, RATE_LIMITED transition skipped", job.id)
 
         except Exception as e:
             error_msg = str(e)
@@ -152,32 +173,49 @@ class Worker:
             if fatal:
                 logger.critical("Fatal error (no retry): %s", error_msg)
 
-            async with db_context():
-                new_retry = (job.retry_count or 0) + 1
-                if fatal or new_retry >= MAX_RETRY:
-                    next_status = JobStatus.FAILED
-                else:
-                    next_status = JobStatus.PENDING
+            new_retry = (job.retry_count or 0) + 1
+            if fatal or new_retry >= MAX_RETRY:
+                next_status = JobStatus.FAILED
+            else:
+                next_status = JobStatus.PENDING
 
-                await self.job_svc.update_job_status(
+            await self.task_log.add_task(
+                job.id,
+                JobTaskType.ERROR,
+                content={"error": error_msg, "retry": new_retry, "fatal": fatal},
+                label=f"{'치명적 오류' if fatal else f'오류 (재시도 {new_retry}/{MAX_RETRY})'}: {error_msg[:60]}",
+            )
+            async with db_write_context():
+                updated = await self.job_svc.update_job_status(
                     job.id,
                     next_status,
+                    expected=JobStatus.PROCESSING,
                     error_log=error_msg,
                     increment_retry=True,
                 )
-                await self.job_svc.add_task(
-                    job.id,
-                    JobTaskType.ERROR,
-                    content={"error": error_msg, "retry": new_retry, "fatal": fatal},
-                    label=f"{'치명적 오류' if fatal else f'오류 (재시도 {new_retry}/{MAX_RETRY})'}: {error_msg[:60]}",
-                )
+                await self.task_log.write_pending()
 
-            if next_status == JobStatus.PENDING:
+            if not updated:
+                logger.warning("Job %s is no longer PROCESSING, %s transition skipped", job.id, next_status.value)
+            elif next_status == JobStatus.PENDING:
                 logger.info("Job %s → retrying (%d/%d)", job.id, new_retry, MAX_RETRY)
 
         finally:
+            # 플래닝이 먼저 실패해도 체크아웃이 끝난 뒤 다음 job으로 넘어감 (같은 레포 동시 git 조작 방지)
+            if checkout is not None:
+                await asyncio.gather(checkout, return_exceptions=True)
+            await self.agent_svc.close_shell()
+            try:
+                await self.task_log.flush()  # 상태 전환 실패 등으로 남은 이벤트
+            except Exception:
+                logger.exception("Job %s: failed to flush task log", job.id)
+            self.task_log.release(job.id)
             self.current_job_id = None
 
+    async def _checkout_work_branch(self, repo_dir: Path, base_branch: str, work_branch: str) -> None:
+        await self.workspace_svc.create_work_branch(repo_dir, base_branch, work_branch)
+        logger.info("Branch ready: %s (base: %s)", work_branch, base_branch)
+
     def stop(self):
         logger.info("Worker stopping...")
         self._running = False
@@ -1,6 +1,15 @@
-import type { Job, JobTask, Project, WorkerStatus, JobStatus } from '@/types/models'
+import type {
+  Job,
+  JobPage,
+  JobStatus,
+  JobTask,
+  JobTaskSummary,
+  Project,
+  ProjectStats,
+  WorkerStatus,
+} from '@/types/models'
 
-const BASE = import.meta.env.VITE_API_URL || 'http://localhost:8000/api'
+export const BASE = import.meta.env.VITE_API_URL || 'http://localhost:8000/api'
 
 async function fetchJSON<T>(url: string, init?: RequestInit): Promise<T> {
   const res = await fetch(`${BASE}${url}`, {
@@ -34,22 +43,32 @@ export const deleteProject = (source: string, sourceProjectId: string) =>
 export const listJobs = (params?: {
   status?: JobStatus
   source_project_id?: string
-  page?: number
+  cursor?: string
   limit?: number
 }) => {
   const qs = new URLSearchParams()
   if (params?.status) qs.set('status', params.status)
   if (params?.source_project_id) qs.set('source_project_id', params.source_project_id)
-  if (params?.page) qs.set('page', String(params.page))
+  if (params?.cursor) qs.set('cursor', params.cursor)
   if (params?.limit) qs.set('limit', String(params.limit))
   const q = qs.toString()
-  return fetchJSON<Job[]>(`/jobs${q ? `?${q}` : ''}`)
+  return fetchJSON<JobPage>(`/jobs${q ? `?${q}` : ''}`)
 }
 
 export const getJob = (id: string) => fetchJSON<Job>(`/jobs/${id}`)
 
-export const listJobTasks = (jobId: string) =>
-  fetchJSON<JobTask[]>(`/jobs/${jobId}/tasks`)
+export const listJobTasks = (jobId: string, afterSequence = 0) =>
+  fetchJSON<JobTask[]>(`/jobs/${jobId}/tasks?after_sequence=${afterSequence}`)
+
+// content 없이 라벨/타입/크기만 (afterSequence 이후 증분)
+export const listJobTaskSummaries = (jobId: string, afterSequence = 0) =>
+  fetchJSON<JobTaskSummary[]>(`/jobs/${jobId}/tasks?slim=true&after_sequence=${afterSequence}`)
+
+export const getJobTask = (jobId: string, sequence: number) =>
+  fetchJSON<JobTask>(`/jobs/${jobId}/tasks/${sequence}`)
+
+// Stats (프로젝트별 상태 카운트 + 최근 days일 토큰)
+export const getProjectStats = (days = 7) => fetchJSON<ProjectStats[]>(`/stats?days=${days}`)
 
 // Worker
 export const getWorkerStatus = () => fetchJSON<WorkerStatus>('/worker/status')
@@ -0,0 +1,54 @@
+import { useEffect, useRef } from 'react'
+import { BASE } from '@/api/client'
+import type { JobStatus, JobTaskType, WorkerStatus } from '@/types/models'
+
+// 서버 이벤트 (GET /events, SSE)
+export type ServerEvent =
+  | { type: 'job.created'; data: { id: string; status: JobStatus; source: string; source_project_id: string | null } }
+  | { type: 'job.updated'; data: { id: string; status: JobStatus; source_project_id: string | null } }
+  | { type: 'task.appended'; data: { job_id: string; sequence: number; type: JobTaskType; label: string | null } }
+  | { type: 'worker.status'; data: WorkerStatus }
+  | { type: 'reset'; data: Record<string, never> } // 놓친 이벤트를 재생할 수 없음 → 전체 재조회
+
+const EVENT_TYPES: ServerEvent['type'][] = [
+  'job.created',
+  'job.updated',
+  'task.appended',
+  'worker.status',
+  'reset',
+]
+
+type Handler = (event: ServerEvent) => void
+
+// 탭당 EventSource 하나를 공유. 끊기면 브라우저가 Last-Event-ID로 자동 재접속
+let source: EventSource | null = null
+const handlers = new Set<Handler>()
+
+function connect() {
+  if (source) return
+  source = new EventSource(`${BASE}/events`)
+  for (const type of EVENT_TYPES) {
+    source.addEventListener(type, (e) => {
+      const event = { type, data: JSON.parse((e as MessageEvent).data) } as ServerEvent
+      handlers.forEach((h) => h(event))
+    })
+  }
+}
+
+export function useServerEvents(handler: Handler) {
+  const ref = useRef(handler)
+  ref.current = handler
+
+  useEffect(() => {
+    const h: Handler = (event) => ref.current(event)
+    handlers.add(h)
+    connect()
+    return () => {
+      handlers.delete(h)
+      if (handlers.size === 0) {
+        source?.close()
+        source = null
+      }
+    }
+  }, [])
+}
@@ -1,12 +1,13 @@
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useRef, useState } from 'react'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Separator } from '@/components/ui/separator'
 import { StatusBadge } from '@/components/StatusBadge'
 import { StacktraceView } from '@/components/StacktraceView'
 import { TaskTimeline } from '@/components/TaskTimeline'
-import { listJobTasks } from '@/api/client'
-import type { Job, JobTask } from '@/types/models'
+import { getJob, listJobTaskSummaries } from '@/api/client'
+import { useServerEvents } from '@/api/events'
+import type { Job, JobSummary, JobTaskSummary } from '@/types/models'
 import { FileCode, Coins, GitBranch, ExternalLink } from 'lucide-react'
 
 function InfoRow({ label, value }: { label: string; value: React.ReactNode }) {
@@ -25,12 +26,53 @@ function formatTokens(n: number): string {
   return String(n)
 }
 
-export function JobDetail({ job }: { job: Job }) {
-  const [tasks, setTasks] = useState<JobTask[]>([])
+export function JobDetail({ summary }: { summary: JobSummary }) {
+  const [job, setJob] = useState<Job | null>(null)
+  const [tasks, setTasks] = useState<JobTaskSummary[]>([])
+  const currentJobId = useRef(summary.id)
+  const lastSequence = useRef(0)
 
+  // 새 task만 증분 조회 (content 제외)
+  const fetchNewTasks = useCallback(async () => {
+    const jobId = summary.id
+    const fresh = await listJobTaskSummaries(jobId, lastSequence.current)
+    // 응답 전에 다른 job을 선택했거나, 동시에 나간 요청이 이미 반영한 task는 무시
+    const added = fresh.filter((t) => t.sequence > lastSequence.current)
+    if (jobId !== currentJobId.current || added.length === 0) return
+    lastSequence.current = added[added.length - 1].sequence
+    setTasks((prev) => [...prev, ...added])
+  }, [summary.id])
+
+  useEffect(() => {
+    currentJobId.current = summary.id
+    lastSequence.current = 0
+    setTasks([])
+  }, [summary.id])
+
+  // 목록은 요약만 가지고 있으므로 상세(stacktrace 등)는 선택/변경 시에 조회
   useEffect(() => {
-    listJobTasks(job.id).then(setTasks).catch(() => {})
-  }, [job.id])
+    getJob(summary.id).then(setJob).catch(() => {})
+    fetchNewTasks().catch(() => {})
+  }, [summary.id, summary.updated_at, fetchNewTasks])
+
+  // task.appended 이벤트가 오면 새 task만 조회 (flush 한 번에 여러 건 → 묶어서 한 번)
+  const fetchTimer = useRef<ReturnType<typeof setTimeout> | null>(null)
+  useServerEvents((event) => {
+    const relevant =
+      event.type === 'reset' || (event.type === 'task.appended' && event.data.job_id === summary.id)
+    if (!relevant || fetchTimer.current) return
+    fetchTimer.current = setTimeout(() => {
+      fetchTimer.current = null
+      fetchNewTasks().catch(() => {})
+    }, 200)
+  })
+  useEffect(() => () => {
+    if (fetchTimer.current) clearTimeout(fetchTimer.current)
+  }, [])
+
+  if (!job || job.id !== summary.id) {
+    return <p className="py-8 text-center text-sm text-muted-foreground">Loading...</p>
+  }
 
   return (
     <div className="space-y-4">
@@ -128,6 +170,10 @@ export function JobDetail({ job }: { job: Job }) {
             label="Tokens"
             value={`${formatTokens(job.input_tokens)} in / ${formatTokens(job.output_tokens)} out`}
           />
+          <InfoRow
+            label="Occurrences"
+            value={job.occurrence_count > 1 ? String(job.occurrence_count) : null}
+          />
           <InfoRow label="Retries" value={job.retry_count > 0 ? String(job.retry_count) : null} />
           {job.error_log && (
             <>
@@ -151,7 +197,7 @@ export function JobDetail({ job }: { job: Job }) {
           </CardTitle>
         </CardHeader>
         <CardContent className="pt-0">
-          <TaskTimeline tasks={tasks} />
+          <TaskTimeline jobId={summary.id} tasks={tasks} />
         </CardContent>
       </Card>
     </div>
@@ -1,5 +1,5 @@
 import { StatusBadge } from '@/components/StatusBadge'
-import type { Job } from '@/types/models'
+import type { JobSummary } from '@/types/models'
 import { cn } from '@/lib/utils'
 
 function timeAgo(iso: string): string {
@@ -14,7 +14,7 @@ function timeAgo(iso: string): string {
 }
 
 interface Props {
-  job: Job
+  job: JobSummary
   selected: boolean
   onClick: () => void
 }
@@ -1,7 +1,7 @@
 import { useNavigate } from 'react-router-dom'
 import { Card } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
-import type { Project } from '@/types/models'
+import type { JobStatus, Project, ProjectStats } from '@/types/models'
 import { ChevronRight, Github, GitlabIcon } from 'lucide-react'
 
 function extractRepoName(url: string): string {
@@ -27,12 +27,23 @@ const sourceColors: Record<string, string> = {
   datadog: 'bg-purple-50 text-purple-700 border-purple-200',
 }
 
+const countColors: [JobStatus, string][] = [
+  ['pending', 'text-slate-600'],
+  ['processing', 'text-blue-600'],
+  ['failed', 'text-red-600'],
+  ['done', 'text-emerald-600'],
+]
+
+function formatTokens(n: number): string {
+  return n >= 1000 ? `${(n / 1000).toFixed(1)}k` : String(n)
+}
+
 const platformIcon: Record<string, React.ReactNode> = {
   github: <Github className="h-3.5 w-3.5" />,
   gitlab: <GitlabIcon className="h-3.5 w-3.5" />,
 }
 
-export function ProjectCard({ project }: { project: Project }) {
+export function ProjectCard({ project, stats }: { project: Project; stats?: ProjectStats }) {
   const navigate = useNavigate()
   const repoName = extractRepoName(project.repo_url)
 
@@ -60,6 +71,19 @@ export function ProjectCard({ project }: { project: Project }) {
         <p className="truncate text-sm font-semibold text-foreground">{repoName}</p>
         <p className="mt-1 text-xs text-muted-foreground">{formatDate(project.created_at)}</p>
       </div>
+
+      <div className="flex items-center justify-between text-xs text-muted-foreground">
+        <div className="flex gap-3">
+          {countColors.map(([status, color]) => (
+            <span key={status} title={status}>
+              <span className={`font-semibold ${color}`}>{stats?.counts[status] ?? 0}</span> {status}
+            </span>
+          ))}
+        </div>
+        <span title="최근 7일 토큰 (input + output)">
+          {formatTokens((stats?.input_tokens ?? 0) + (stats?.output_tokens ?? 0))} tok
+        </span>
+      </div>
     </Card>
   )
 }
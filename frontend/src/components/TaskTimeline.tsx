@@ -1,7 +1,8 @@
 import { useState } from 'react'
+import { getJobTask } from '@/api/client'
 import { Badge } from '@/components/ui/badge'
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from '@/components/ui/collapsible'
-import type { JobTask, JobTaskType } from '@/types/models'
+import type { JobTaskSummary, JobTaskType } from '@/types/models'
 import { ChevronDown, ChevronRight, MessageSquare, Terminal, AlertCircle, Info } from 'lucide-react'
 
 const typeConfig: Record<JobTaskType, { icon: React.ReactNode; className: string }> = {
@@ -31,10 +32,35 @@ function formatTime(iso: string): string {
   })
 }
 
-function TaskItem({ task }: { task: JobTask }) {
+function formatSize(n: number): string {
+  if (n >= 1_000_000) return `${(n / 1_000_000).toFixed(1)}M`
+  if (n >= 1_000) return `${(n / 1_000).toFixed(1)}K`
+  return String(n)
+}
+
+function formatContent(content: string): string {
+  try {
+    return JSON.stringify(JSON.parse(content), null, 2)
+  } catch {
+    return content
+  }
+}
+
+function TaskItem({ jobId, task }: { jobId: string; task: JobTaskSummary }) {
   const [open, setOpen] = useState(false)
+  const [content, setContent] = useState<string | null>(null)
   const config = typeConfig[task.type]
-  const hasContent = !!task.content
+  const hasContent = task.content_length > 0
+
+  // content는 처음 펼칠 때 조회
+  const onOpenChange = (next: boolean) => {
+    setOpen(next)
+    if (next && content === null) {
+      getJobTask(jobId, task.sequence)
+        .then((t) => setContent(t.content ?? ''))
+        .catch(() => setContent('(failed to load)'))
+    }
+  }
 
   return (
     <div className="relative flex gap-3 pb-4">
@@ -46,7 +72,7 @@ function TaskItem({ task }: { task: JobTask }) {
 
       {/* Content */}
       <div className="flex-1 min-w-0">
-        <Collapsible open={open} onOpenChange={setOpen}>
+        <Collapsible open={open} onOpenChange={onOpenChange}>
           <CollapsibleTrigger className="flex w-full items-center gap-2 text-left">
             {hasContent && (
               open ? <ChevronDown className="h-3 w-3 shrink-0 text-muted-foreground" /> : <ChevronRight className="h-3 w-3 shrink-0 text-muted-foreground" />
@@ -56,6 +82,9 @@ function TaskItem({ task }: { task: JobTask }) {
               {task.type}
             </Badge>
             <span className="truncate text-sm text-foreground">{task.label ?? task.type}</span>
+            {hasContent && (
+              <span className="shrink-0 text-xs text-muted-foreground">{formatSize(task.content_length)}</span>
+            )}
             <span className="ml-auto shrink-0 text-xs text-muted-foreground">
               {formatTime(task.created_at)}
             </span>
@@ -63,13 +92,7 @@ function TaskItem({ task }: { task: JobTask }) {
           {hasContent && (
             <CollapsibleContent>
               <pre className="mt-2 max-h-60 overflow-auto rounded border border-border bg-slate-50 p-3 text-xs whitespace-pre-wrap">
-                {(() => {
-                  try {
-                    return JSON.stringify(JSON.parse(task.content!), null, 2)
-                  } catch {
-                    return task.content
-                  }
-                })()}
+                {content === null ? 'Loading...' : formatContent(content)}
               </pre>
             </CollapsibleContent>
           )}
@@ -79,7 +102,7 @@ function TaskItem({ task }: { task: JobTask }) {
   )
 }
 
-export function TaskTimeline({ tasks }: { tasks: JobTask[] }) {
+export function TaskTimeline({ jobId, tasks }: { jobId: string; tasks: JobTaskSummary[] }) {
   if (tasks.length === 0) {
     return <p className="text-sm text-muted-foreground">No agent tasks yet</p>
   }
@@ -87,7 +110,7 @@ export function TaskTimeline({ tasks }: { tasks: JobTask[] }) {
   return (
     <div>
       {tasks.map((task) => (
-        <TaskItem key={task.id} task={task} />
+        <TaskItem key={task.id} jobId={jobId} task={task} />
       ))}
     </div>
   )
@@ -2,6 +2,7 @@ import { useEffect, useState, useCallback } from 'react'
 import { Badge } from '@/components/ui/badge'
 import { Button } from '@/components/ui/button'
 import { getWorkerStatus, startWorker, stopWorker } from '@/api/client'
+import { useServerEvents } from '@/api/events'
 import type { WorkerStatus } from '@/types/models'
 import { Play, Square } from 'lucide-react'
 
@@ -19,10 +20,14 @@ export function WorkerControl() {
 
   useEffect(() => {
     refresh()
-    const id = setInterval(refresh, 5000)
-    return () => clearInterval(id)
   }, [refresh])
 
+  // 상태 변경은 이벤트 스트림으로 수신 (폴링 없음)
+  useServerEvents((event) => {
+    if (event.type === 'worker.status') setStatus(event.data)
+    else if (event.type === 'reset') refresh()
+  })
+
   const toggle = async () => {
     setLoading(true)
     try {
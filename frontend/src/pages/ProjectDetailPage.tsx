@@ -1,4 +1,4 @@
-import { useEffect, useState, useCallback } from 'react'
+import { useEffect, useRef, useState, useCallback } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
 import { Button } from '@/components/ui/button'
 import { Tabs, TabsList, TabsTrigger } from '@/components/ui/tabs'
@@ -6,7 +6,8 @@ import { ScrollArea } from '@/components/ui/scroll-area'
 import { JobListItem } from '@/components/JobListItem'
 import { JobDetail } from '@/components/JobDetail'
 import { listJobs } from '@/api/client'
-import type { Job, JobStatus } from '@/types/models'
+import { useServerEvents } from '@/api/events'
+import type { JobStatus, JobSummary } from '@/types/models'
 import { ArrowLeft, Inbox } from 'lucide-react'
 
 const STATUS_FILTERS: { value: string; label: string }[] = [
@@ -17,6 +18,18 @@ const STATUS_FILTERS: { value: string; label: string }[] = [
   { value: 'failed', label: 'Failed' },
 ]
 
+const PAGE_SIZE = 50
+
+const isOlder = (a: JobSummary, b: JobSummary) =>
+  a.created_at < b.created_at || (a.created_at === b.created_at && a.id < b.id)
+
+// 첫 페이지 새로고침 결과 + 이미 "더 보기"로 불러온 이전 항목
+function mergeFirstPage(first: JobSummary[], prev: JobSummary[]): JobSummary[] {
+  if (first.length === 0) return first
+  const last = first[first.length - 1]
+  return [...first, ...prev.filter((j) => isOlder(j, last))]
+}
+
 export function ProjectDetailPage() {
   const { source, sourceProjectId } = useParams<{
     source: string
@@ -24,38 +37,74 @@ export function ProjectDetailPage() {
   }>()
   const navigate = useNavigate()
 
-  const [jobs, setJobs] = useState<Job[]>([])
+  const [jobs, setJobs] = useState<JobSummary[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [selectedId, setSelectedId] = useState<string | null>(null)
   const [statusFilter, setStatusFilter] = useState('all')
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+
+  const status = statusFilter === 'all' ? undefined : (statusFilter as JobStatus)
 
   const refresh = useCallback(async () => {
     if (!sourceProjectId) return
     try {
-      const result = await listJobs({
-        source_project_id: sourceProjectId,
-        status: statusFilter === 'all' ? undefined : (statusFilter as JobStatus),
-        limit: 100,
-      })
-      setJobs(result)
-      if (result.length > 0 && !selectedId) {
-        setSelectedId(result[0].id)
+      const page = await listJobs({ source_project_id: sourceProjectId, status, limit: PAGE_SIZE })
+      setJobs((prev) => mergeFirstPage(page.items, prev))
+      // 더 불러온 항목이 있으면 기존 커서 유지
+      setNextCursor((prev) => prev ?? page.next_cursor)
+      if (page.items.length > 0 && !selectedId) {
+        setSelectedId(page.items[0].id)
       }
     } finally {
       setLoading(false)
     }
-  }, [sourceProjectId, statusFilter, selectedId])
+  }, [sourceProjectId, status, selectedId])
+
+  const loadMore = async () => {
+    if (!sourceProjectId || !nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await listJobs({
+        source_project_id: sourceProjectId,
+        status,
+        cursor: nextCursor,
+        limit: PAGE_SIZE,
+      })
+      setJobs((prev) => [...prev, ...page.items.filter((j) => !prev.some((p) => p.id === j.id))])
+      setNextCursor(page.next_cursor)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  // 필터 변경 시 처음부터 다시 로드
+  useEffect(() => {
+    setJobs([])
+    setNextCursor(null)
+  }, [sourceProjectId, statusFilter])
 
   useEffect(() => {
     setLoading(true)
     refresh()
   }, [refresh])
 
-  // Auto-refresh
-  useEffect(() => {
-    const id = setInterval(refresh, 10000)
-    return () => clearInterval(id)
-  }, [refresh])
+  // 이 프로젝트의 job 생성/상태 변경 이벤트가 오면 첫 페이지 재조회 (연속 이벤트는 묶어서 한 번)
+  const refreshTimer = useRef<ReturnType<typeof setTimeout> | null>(null)
+  useServerEvents((event) => {
+    const relevant =
+      event.type === 'reset' ||
+      ((event.type === 'job.created' || event.type === 'job.updated') &&
+        event.data.source_project_id === sourceProjectId)
+    if (!relevant || refreshTimer.current) return
+    refreshTimer.current = setTimeout(() => {
+      refreshTimer.current = null
+      refresh()
+    }, 300)
+  })
+  useEffect(() => () => {
+    if (refreshTimer.current) clearTimeout(refreshTimer.current)
+  }, [])
 
   const selectedJob = jobs.find((j) => j.id === selectedId)
 
@@ -103,14 +152,27 @@ export function ProjectDetailPage() {
                   <p className="text-sm">No jobs found</p>
                 </div>
               ) : (
-                jobs.map((job) => (
-                  <JobListItem
-                    key={job.id}
-                    job={job}
-                    selected={job.id === selectedId}
-                    onClick={() => setSelectedId(job.id)}
-                  />
-                ))
+                <>
+                  {jobs.map((job) => (
+                    <JobListItem
+                      key={job.id}
+                      job={job}
+                      selected={job.id === selectedId}
+                      onClick={() => setSelectedId(job.id)}
+                    />
+                  ))}
+                  {nextCursor && (
+                    <Button
+                      variant="ghost"
+                      size="sm"
+                      className="w-full text-xs text-muted-foreground"
+                      disabled={loadingMore}
+                      onClick={loadMore}
+                    >
+                      {loadingMore ? 'Loading...' : 'Load more'}
+                    </Button>
+                  )}
+                </>
               )}
             </div>
           </ScrollArea>
@@ -119,7 +181,7 @@ export function ProjectDetailPage() {
         {/* Right main: Job detail */}
         <div className="flex-1 overflow-y-auto rounded-lg border border-border bg-white p-6">
           {selectedJob ? (
-            <JobDetail job={selectedJob} />
+            <JobDetail summary={selectedJob} />
           ) : (
             <div className="flex h-full items-center justify-center text-sm text-muted-foreground">
               Select a job to view details
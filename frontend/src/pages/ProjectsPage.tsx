@@ -2,17 +2,20 @@ import { useEffect, useState, useCallback } from 'react'
 import { Badge } from '@/components/ui/badge'
 import { ProjectCard } from '@/components/ProjectCard'
 import { CreateProjectModal } from '@/components/CreateProjectModal'
-import { listProjects } from '@/api/client'
-import type { Project } from '@/types/models'
+import { getProjectStats, listProjects } from '@/api/client'
+import type { Project, ProjectStats } from '@/types/models'
 import { FolderKanban } from 'lucide-react'
 
 export function ProjectsPage() {
   const [projects, setProjects] = useState<Project[]>([])
+  const [stats, setStats] = useState<Record<string, ProjectStats>>({})
   const [loading, setLoading] = useState(true)
 
   const refresh = useCallback(async () => {
     try {
-      setProjects(await listProjects())
+      const [projectList, statList] = await Promise.all([listProjects(), getProjectStats()])
+      setProjects(projectList)
+      setStats(Object.fromEntries(statList.map((s) => [`${s.source}/${s.source_project_id}`, s])))
     } finally {
       setLoading(false)
     }
@@ -50,7 +53,7 @@ export function ProjectsPage() {
       ) : (
         <div className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4">
           {projects.map((p) => (
-            <ProjectCard key={p.id} project={p} />
+            <ProjectCard key={p.id} project={p} stats={stats[`${p.source}/${p.source_project_id}`]} />
           ))}
         </div>
       )}
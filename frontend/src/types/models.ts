@@ -28,10 +28,34 @@ export interface Job {
   retry_count: number
   source_url: string | null
   raw_payload: string | null
+  occurrence_count: number
+  first_seen: string | null
+  last_seen: string | null
   created_at: string
   updated_at: string
 }
 
+// 목록용 요약 (GET /jobs)
+export interface JobSummary {
+  id: string
+  status: JobStatus
+  source: ErrorSource
+  source_project_id: string | null
+  source_issue_id: string
+  title: string
+  exception_type: string | null
+  level: string | null
+  environment: string | null
+  retry_count: number
+  created_at: string
+  updated_at: string
+}
+
+export interface JobPage {
+  items: JobSummary[]
+  next_cursor: string | null
+}
+
 export interface JobTask {
   id: string
   job_id: string
@@ -42,6 +66,17 @@ export interface JobTask {
   created_at: string
 }
 
+// 타임라인 목록용 (slim=true) — content는 펼칠 때 따로 조회
+export interface JobTaskSummary {
+  id: string
+  job_id: string
+  sequence: number
+  type: JobTaskType
+  label: string | null
+  content_length: number
+  created_at: string
+}
+
 export interface Project {
   id: string
   source: string
@@ -53,6 +88,15 @@ export interface Project {
   updated_at: string
 }
 
+// 프로젝트별 집계 (GET /stats)
+export interface ProjectStats {
+  source: string
+  source_project_id: string | null
+  counts: Partial<Record<JobStatus, number>>
+  input_tokens: number
+  output_tokens: number
+}
+
 export interface WorkerStatus {
   running: boolean
   current_job_id: string | null
@@ -1,5 +1,8 @@
 import asyncio
 import os
+import shutil
+import socket
+import subprocess
 import tempfile
 from pathlib import Path
 
@@ -10,24 +13,114 @@ from fastapi.testclient import TestClient
 from app.core.config import settings
 
 
+# ── DB 백엔드 선택 ────────────────────────────────────────────────
+# uv run pytest                 # SQLite (기본)
+# uv run pytest --db postgres   # PostgreSQL: TEST_DATABASE_URL, 없으면 로컬 initdb/pg_ctl로 임시 클러스터 시작
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--db", choices=("sqlite", "postgres"), default=os.environ.get("TEST_DB", "sqlite"),
+        help="테스트 DB 백엔드",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "sqlite_only: SQLite 전용 기능 (PRAGMA, FTS5, 실행 계획, 마이그레이션)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--db") != "postgres":
+        return
+    skip = pytest.mark.skip(reason="SQLite 전용")
+    for item in items:
+        if "sqlite_only" in item.keywords:
+            item.add_marker(skip)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _pg_binary(bindir: str, name: str) -> str | None:
+    """pg_config --bindir의 실행 파일 (클라이언트 패키지만 있으면 서버 바이너리가 없음), 없으면 PATH에서"""
+    if bindir and (path := Path(bindir, name)).exists():
+        return str(path)
+    return shutil.which(name)
+
+
+def _start_local_postgres(workdir: Path) -> tuple[str, Path, Path]:
+    """initdb로 임시 클러스터를 만들고 unix socket으로 시작 → (URL, pg_ctl, data 디렉토리)"""
+    bindir = ""
+    if shutil.which("pg_config"):
+        bindir = subprocess.run(["pg_config", "--bindir"], capture_output=True, text=True).stdout.strip()
+    initdb = _pg_binary(bindir, "initdb")
+    pg_ctl = _pg_binary(bindir, "pg_ctl")
+    if not initdb or not pg_ctl:
+        pytest.exit("--db postgres: TEST_DATABASE_URL을 설정하거나 PostgreSQL 서버(initdb, pg_ctl)를 설치하세요")
+
+    data = workdir / "data"
+    port = _free_port()
+    subprocess.run(
+        [initdb, "-D", data, "-U", "postgres", "--auth=trust", "-E", "UTF8"], check=True, capture_output=True,
+    )
+    subprocess.run(
+        [pg_ctl, "-D", data, "-l", workdir / "postgres.log", "-w",
+         "-o", f"-p {port} -k {workdir} -c listen_addresses='' -c fsync=off", "start"],
+        check=True, capture_output=True,
+    )
+    return f"postgresql+asyncpg://postgres@/postgres?host={workdir}&port={port}", Path(pg_ctl), data
+
+
+@pytest.fixture(scope="session")
+def database_url(request):
+    """--db postgres일 때 테스트 DB URL (세션 동안 하나의 클러스터, 테스트마다 스키마 재생성). SQLite면 None"""
+    if request.config.getoption("--db") != "postgres":
+        yield None
+        return
+    if url := os.environ.get("TEST_DATABASE_URL"):
+        yield url
+        return
+    workdir = Path(tempfile.mkdtemp(prefix="pr-bot-pg-"))
+    url, pg_ctl, data = _start_local_postgres(workdir)
+    try:
+        yield url
+    finally:
+        subprocess.run([pg_ctl, "-D", data, "-m", "immediate", "stop"], capture_output=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
 @pytest_asyncio.fixture(scope="function")
-async def test_db_path():
-    """테스트용 임시 DB 경로 설정 + 테이블 생성"""
+async def test_db_path(database_url):
+    """테스트용 임시 DB 경로 설정 + 테이블 생성 (PostgreSQL이면 스키마를 비우고 다시 생성)"""
     fd, db_path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
     db_path = Path(db_path)
 
-    original_path = settings.database_path
+    original_path, original_url = settings.database_path, settings.database_url
     settings.database_path = db_path
+    settings.database_url = database_url
 
+    from app.core import database
     from app.core.database import reset_engine, init_db
+    from app.models import change, project, setting  # noqa: F401 - drop_all 대상에 포함
+    from app.models.job import Base
+    from app.services.ingest_cache import ingest_cache
 
     reset_engine()
+    ingest_cache.clear()  # 이전 테스트 DB의 job id를 가리키지 않도록
+    if database_url:
+        async with database.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
     await init_db()
 
     yield db_path
 
-    settings.database_path = original_path
+    if database_url:
+        await database.engine.dispose()
+    settings.database_path, settings.database_url = original_path, original_url
     reset_engine()
 
     if db_path.exists():
@@ -47,12 +140,18 @@ async def db_session(test_db_path):
 
 
 @pytest_asyncio.fixture
-async def client(test_db_path):
+async def client(test_db_path, database_url):
     """FastAPI TestClient (DB 초기화 포함, 미들웨어가 세션 관리)"""
+    from app.core import database
     from app.main import app
 
+    if database_url:
+        # TestClient는 별도 이벤트 루프에서 앱을 실행 — 이 루프에서 연 asyncpg 커넥션을 넘기지 않도록 풀을 비움
+        await database.engine.dispose()
     with TestClient(app) as c:
         yield c
+    if database_url:
+        await database.engine.dispose(close=False)  # 앱 루프는 이미 닫힘 — 그 루프의 커넥션은 닫지 않고 버림
 
 
 @pytest.fixture
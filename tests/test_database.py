@@ -0,0 +1,83 @@
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import text
+
+from core import database
+from core.middleware import DBSessionMiddleware
+
+
+@pytest.mark.sqlite_only
+class TestSqlitePragmas:
+    """커넥션마다 PRAGMA 적용"""
+
+    async def test_wal_and_busy_timeout(self, db_session):
+        journal_mode = (await db_session.execute(text("PRAGMA journal_mode"))).scalar()
+        busy_timeout = (await db_session.execute(text("PRAGMA busy_timeout"))).scalar()
+        synchronous = (await db_session.execute(text("PRAGMA synchronous"))).scalar()
+
+        assert journal_mode == "wal"
+        assert busy_timeout == database.settings.sqlite_busy_timeout_ms
+        assert synchronous == 1  # NORMAL
+
+
+class TestDbWriteContext:
+    """직렬화된 writer 경로"""
+
+    async def test_commits_on_success(self, test_db_path):
+        async with database.db_write_context() as session:
+            await session.execute(text("INSERT INTO settings (key, value, updated_at) VALUES ('k', 'v', '2026-01-01')"))
+
+        async with database.db_context() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM settings"))).scalar()
+        assert count == 1
+
+    async def test_rolls_back_on_error(self, test_db_path):
+        with pytest.raises(RuntimeError):
+            async with database.db_write_context() as session:
+                await session.execute(text("INSERT INTO settings (key, value, updated_at) VALUES ('k', 'v', '2026-01-01')"))
+                raise RuntimeError("boom")
+
+        async with database.db_context() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM settings"))).scalar()
+        assert count == 0
+
+
+class TestDBSessionMiddleware:
+    """요청 스코프 세션: 지연 생성, 상태 코드로 commit/rollback"""
+
+    @pytest.fixture
+    async def client(self, test_db_path):
+        app = FastAPI()
+        app.add_middleware(DBSessionMiddleware)
+
+        @app.get("/none")
+        async def no_db():
+            return {"session": database.request_session.get().session is not None}
+
+        @app.post("/insert/{status}")
+        async def insert(status: int):
+            await database.current_session().execute(
+                text("INSERT INTO settings (key, value, updated_at) VALUES (:k, 'v', '2026-01-01')"), {"k": str(status)},
+            )
+            if status >= 400:
+                raise HTTPException(status_code=status)
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+    async def _keys(self) -> list[str]:
+        async with database.db_context() as session:
+            return list((await session.execute(text("SELECT key FROM settings"))).scalars())
+
+    async def test_no_session_without_db_access(self, client):
+        assert (await client.get("/none")).json() == {"session": False}
+
+    async def test_commit_on_success_rollback_on_error(self, client):
+        assert (await client.post("/insert/200")).status_code == 200
+        assert (await client.post("/insert/409")).status_code == 409
+
+        assert await self._keys() == ["200"]
+
@@ -0,0 +1,91 @@
+import pytest
+
+from core import database
+from models.error import ParsedError
+from models.job import ErrorSource
+from repositories.change import ChangeCounterRepository
+from services.job_queue import JobService
+
+
+class TestConditionalGet:
+    """ETag / If-None-Match → 304"""
+
+    def _revalidate(self, client, url: str):
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        return etag, client.get(url, headers={"If-None-Match": etag})
+
+    def test_job_list_and_detail(self, client, sentry_payload):
+        etag, response = self._revalidate(client, "/api/jobs")
+        assert response.status_code == 304
+        assert response.content == b""
+
+        job_id = client.post("/api/webhook/sentry", json=sentry_payload).json()["job_id"]
+        changed = client.get("/api/jobs", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert [j["id"] for j in changed.json()["items"]] == [job_id]
+
+        _, response = self._revalidate(client, f"/api/jobs/{job_id}")
+        assert response.status_code == 304
+
+        _, response = self._revalidate(client, f"/api/jobs/{job_id}/tasks?slim=true")
+        assert response.status_code == 304
+
+    def test_job_list_changes_on_duplicate_webhook(self, client, sentry_payload):
+        client.post("/api/webhook/sentry", json=sentry_payload)
+        etag = client.get("/api/jobs").headers["etag"]
+
+        sentry_payload["data"]["event"]["event_id"] = "new-occurrence"  # 같은 이벤트 재전송은 캐시에서 끝남
+        client.post("/api/webhook/sentry", json=sentry_payload)  # occurrence_count/last_seen만 갱신
+        changed = client.get("/api/jobs", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+
+    def test_projects(self, client):
+        etag, response = self._revalidate(client, "/api/projects")
+        assert response.status_code == 304
+
+        client.post("/api/projects", json={
+            "source": "sentry",
+            "source_project_id": "p1",
+            "repo_url": "https://github.com/org/repo",
+            "repo_platform": "github",
+        })
+        assert client.get("/api/projects", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_missing_job_is_404(self, client):
+        assert client.get("/api/jobs/missing", headers={"If-None-Match": "*"}).status_code == 404
+
+
+async def test_add_tokens_bumps_job_version(test_db_path):
+    svc = JobService()
+    async with database.db_write_context():
+        job_id = await svc.create_job(ParsedError(source=ErrorSource.SENTRY, source_issue_id="1", title="t"))
+    async with database.db_context():
+        version = await svc.list_version()
+
+    async with database.db_write_context():
+        await svc.add_tokens(job_id, 100, 10)
+
+    async with database.db_context():
+        assert await svc.list_version() == version + 1
+
+
+async def test_job_version_shared_through_db(test_db_path):
+    """카운터는 DB에 있음 — 다른 프로세스(Worker/CLI)의 commit도 반영, rollback은 반영 안 됨"""
+    svc = JobService()
+    async with database.db_context():
+        assert await svc.list_version() == 0
+
+    with pytest.raises(RuntimeError):
+        async with database.db_write_context():
+            await svc.create_job(ParsedError(source=ErrorSource.SENTRY, source_issue_id="1", title="t"))
+            raise RuntimeError("boom")
+
+    async with database.db_write_context():
+        await svc.create_job(ParsedError(source=ErrorSource.SENTRY, source_issue_id="2", title="t"))
+        await svc.create_job(ParsedError(source=ErrorSource.SENTRY, source_issue_id="3", title="t"))
+
+    async with database.db_context():
+        assert await svc.list_version() == 1  # 트랜잭션당 한 번
+        assert await ChangeCounterRepository().version("task") == 0
@@ -0,0 +1,74 @@
+import pytest
+
+from core import database, events
+from core.events import EventBus
+from models.error import ParsedError
+from models.job import ErrorSource, JobStatus
+from services.job_queue import JobService
+
+
+def _drain(sub) -> list:
+    items = []
+    while not sub.queue.empty():
+        items.append(sub.queue.get_nowait())
+    return items
+
+
+class TestEventBus:
+    def test_resume_from_last_event_id(self):
+        bus = EventBus(history_size=10)
+        first = bus.publish(events.JOB_CREATED, {"id": "a"})
+        bus.publish(events.JOB_UPDATED, {"id": "a"})
+        bus.publish(events.TASK_APPENDED, {"job_id": "a"})
+
+        sub = bus.subscribe(first.id)
+        assert [e.type for e in _drain(sub)] == [events.JOB_UPDATED, events.TASK_APPENDED]
+
+    def test_reset_when_history_lost(self):
+        bus = EventBus(history_size=2)
+        first = bus.publish(events.JOB_CREATED, {"id": "a"})
+        for _ in range(3):
+            bus.publish(events.JOB_UPDATED, {"id": "a"})
+
+        assert [e.type for e in _drain(bus.subscribe(first.id))] == [events.RESET]
+        assert [e.type for e in _drain(bus.subscribe("other-epoch-1"))] == [events.RESET]
+
+    def test_slow_subscriber_overflows(self, monkeypatch):
+        monkeypatch.setattr(events.settings, "event_queue_size", 2)
+        bus = EventBus()
+        sub = bus.subscribe()
+        for _ in range(3):
+            bus.publish(events.JOB_UPDATED, {"id": "a"})
+
+        assert sub.overflowed
+        assert sub.queue.qsize() == 2
+
+
+class TestCommitGatedPublish:
+    @pytest.fixture
+    def received(self, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr(events, "event_bus", bus)
+        return bus.subscribe()
+
+    async def test_published_after_commit(self, test_db_path, received):
+        async with database.db_write_context():
+            job_id = await JobService().create_job(
+                ParsedError(source=ErrorSource.SENTRY, source_issue_id="ev", title="t")
+            )
+            assert received.queue.empty()
+
+        [created] = _drain(received)
+        assert created.type == events.JOB_CREATED
+        assert created.data["id"] == job_id
+
+    async def test_not_published_on_rollback(self, test_db_path, received):
+        with pytest.raises(RuntimeError):
+            async with database.db_write_context():
+                job_id = await JobService().create_job(
+                    ParsedError(source=ErrorSource.SENTRY, source_issue_id="ev", title="t")
+                )
+                await JobService().update_job_status(job_id, JobStatus.PROCESSING)
+                raise RuntimeError("boom")
+
+        assert _drain(received) == []
@@ -0,0 +1,83 @@
+import time
+
+from core import database
+from models.error import ParsedError
+from models.job import ErrorSource
+from models.job import JobStatus
+from services.ingest import WebhookIngestor
+from services.ingest_cache import IngestCache, ingest_cache
+from services.job_queue import JobService
+
+
+def _error(issue_id: str, event_id: str | None = None) -> ParsedError:
+    return ParsedError(
+        source=ErrorSource.SENTRY, source_issue_id=issue_id, source_event_id=event_id, title="Test Error",
+    )
+
+
+class TestWebhookIngestor:
+    async def test_group_commit_on_stop(self, test_db_path):
+        ingestor = WebhookIngestor(batch_size=10, interval_ms=0)
+        ingestor.start()
+        for i in range(25):
+            assert ingestor.submit(_error(f"issue-{i % 20}"))  # 5건은 같은 배치/다음 배치의 중복
+        await ingestor.stop()
+
+        async with database.db_context():
+            jobs = await JobService().list_job_summaries(limit=100)
+        assert len(jobs) == 20
+        assert ingestor.committed == 25
+        assert ingestor.batches == 3
+
+    async def test_backpressure_when_full(self, test_db_path):
+        ingestor = WebhookIngestor(maxsize=2)
+        ingestor.start()
+
+        assert ingestor.submit(_error("a"))
+        assert ingestor.submit(_error("b"))
+        assert not ingestor.submit(_error("c"))
+        assert ingestor.rejected == 1
+
+        await ingestor.stop()
+        assert not ingestor.submit(_error("d"))
+
+
+class TestIngestCache:
+    async def test_remembered_after_commit_and_invalidated_on_close(self, test_db_path):
+        parsed = _error("issue-1", "event-1")
+        key = IngestCache.key_of(parsed)
+
+        async with database.db_context() as session:
+            await JobService().ingest_error(_error("issue-2", "event-2"))
+            await session.rollback()
+        assert ingest_cache.lookup(IngestCache.key_of(_error("issue-2", "event-2"))) is None
+
+        async with database.db_context():
+            _, job_id = await JobService().ingest_error(parsed)
+        assert ingest_cache.lookup(key) == (job_id, JobStatus.PENDING.value)
+
+        async with database.db_context():
+            await JobService().update_job_status(job_id, JobStatus.PROCESSING)
+        assert ingest_cache.lookup(key) == (job_id, JobStatus.PROCESSING.value)
+
+        async with database.db_context():
+            await JobService().update_job_status(job_id, JobStatus.DONE)
+        assert ingest_cache.lookup(key) is None
+        assert ingest_cache.stats()["invalidated"] == 1
+
+    def test_lru_and_ttl(self, monkeypatch):
+        cache = IngestCache(maxsize=2, ttl_seconds=10)
+        a, b, c = (("sentry", i, f"e{i}") for i in "abc")
+        cache.remember(a, "job-a")
+        cache.remember(b, "job-b")
+        assert cache.lookup(a) == ("job-a", None)  # a가 최근 사용 → b가 밀려남
+        cache.remember(c, "job-c")
+        assert cache.lookup(b) is None
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.lookup(a) is None
+        assert cache.stats() | {"size": None} == {
+            "size": None, "maxsize": 2, "hits": 1, "misses": 2, "hit_rate": 0.3333,
+            "expired": 1, "evicted": 1, "invalidated": 0,
+        }
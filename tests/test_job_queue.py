@@ -1,8 +1,16 @@
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+
 import pytest
+from sqlalchemy import func, inspect, select, update
 
 from app.models.error import ParsedError, StackFrame
-from app.models.job import ErrorSource, JobStatus
+from app.core.config import settings
+from app.models.job import JOB_SUMMARY_COLUMNS, BlobModel, ErrorSource, JobModel, JobStatus, JobTaskType
+from app.models.project import RepoPlatform
 from app.services.job_queue import JobService
+from app.services.project import ProjectService
 
 
 @pytest.fixture
@@ -72,30 +80,100 @@ class TestJobExists:
         assert exists is True
 
 
-class TestGetPendingJob:
-    async def test_get_pending_job_returns_none_when_empty(self, db_session, svc):
-        job = await svc.get_pending_job()
+class TestIngestError:
+    async def test_created_duplicate_reopened(self, db_session, svc, sample_parsed_error):
+        result, job_id = await svc.ingest_error(sample_parsed_error)
+        assert result == "created"
+        assert (await svc.get_job(job_id)).title == "Test Error"
+
+        assert await svc.ingest_error(sample_parsed_error) == ("duplicate", job_id)
+
+        await svc.update_job_status(job_id, JobStatus.DONE)
+        assert await svc.ingest_error(sample_parsed_error) == ("reopened", job_id)
+        assert (await svc.get_job(job_id)).status == JobStatus.PENDING
+
+        assert await svc.ingest_error(sample_parsed_error) == ("duplicate", job_id)
+
+    async def test_concurrent_deliveries_do_not_conflict(self, test_db_path, sample_parsed_error):
+        from app.core import database
+
+        async def deliver():
+            async with database.db_context():
+                return await JobService().ingest_error(sample_parsed_error)
+
+        results = await asyncio.gather(*(deliver() for _ in range(5)))
+        assert sorted(r for r, _ in results) == ["created"] + ["duplicate"] * 4
+        assert len({job_id for _, job_id in results}) == 1
+
+
+class TestOccurrences:
+    async def test_duplicates_count_occurrences(self, db_session, svc, sample_parsed_error):
+        _, job_id = await svc.ingest_error(sample_parsed_error)
+        before = await svc.get_job_updated_at(job_id)
+        await svc.ingest_error(sample_parsed_error)
+        await svc.ingest_error(sample_parsed_error)
+
+        job = await svc.get_job(job_id)
+        assert job.occurrence_count == 3
+        assert job.first_seen <= job.last_seen
+        # 중복 수신도 상세 ETag가 바뀌도록
+        assert await svc.get_job_updated_at(job_id) > before
+
+    async def test_score_prefers_frequent_issue(self, db_session, svc, sample_parsed_error, monkeypatch):
+        monkeypatch.setattr(settings, "job_priority", "score")
+        await ProjectService().create("sentry", "p1", "https://github.com/o/r", RepoPlatform.GITHUB)
+        sample_parsed_error.source_project_id = "p1"
+
+        sample_parsed_error.source_issue_id = "rare"
+        _, rare_id = await svc.ingest_error(sample_parsed_error)
+        sample_parsed_error.source_issue_id = "frequent"
+        for _ in range(20):
+            _, frequent_id = await svc.ingest_error(sample_parsed_error)
+        # rare가 먼저 들어왔지만 발생 빈도 차이가 대기 시간 가산점보다 큼
+        await db_session.execute(
+            update(JobModel).where(JobModel.id == rare_id)
+            .values(created_at=datetime.now(UTC) - timedelta(minutes=10))
+        )
+
+        assert (await svc.get_next_job()).id == frequent_id
+
+        monkeypatch.setattr(settings, "job_priority", "fifo")
+        assert (await svc.get_next_job()).id == rare_id
+
+
+class TestGetNextJob:
+    @pytest.fixture
+    async def project_error(self, db_session, sample_parsed_error):
+        """get_next_job은 등록된 프로젝트의 job만 가져감"""
+        await ProjectService().create("sentry", "p1", "https://github.com/o/r", RepoPlatform.GITHUB)
+        sample_parsed_error.source_project_id = "p1"
+        return sample_parsed_error
+
+    async def test_get_next_job_returns_none_when_empty(self, db_session, svc):
+        job = await svc.get_next_job()
         assert job is None
 
-    async def test_get_pending_job_returns_oldest_first(self, db_session, svc, sample_parsed_error):
-        sample_parsed_error.source_issue_id = "issue-1"
-        job_id_1 = await svc.create_job(sample_parsed_error)
+    async def test_get_next_job_returns_oldest_first(self, db_session, svc, project_error, monkeypatch):
+        monkeypatch.setattr(settings, "job_priority", "fifo")
+        project_error.source_issue_id = "issue-1"
+        job_id_1 = await svc.create_job(project_error)
 
-        sample_parsed_error.source_issue_id = "issue-2"
-        await svc.create_job(sample_parsed_error)
+        project_error.source_issue_id = "issue-2"
+        await svc.create_job(project_error)
 
-        job = await svc.get_pending_job()
+        job = await svc.get_next_job()
         assert job.id == job_id_1
+        assert job.status == JobStatus.PROCESSING
 
-    async def test_get_pending_job_skips_processing(self, db_session, svc, sample_parsed_error):
-        sample_parsed_error.source_issue_id = "issue-1"
-        job_id_1 = await svc.create_job(sample_parsed_error)
+    async def test_get_next_job_skips_processing(self, db_session, svc, project_error):
+        project_error.source_issue_id = "issue-1"
+        job_id_1 = await svc.create_job(project_error)
         await svc.update_job_status(job_id_1, JobStatus.PROCESSING)
 
-        sample_parsed_error.source_issue_id = "issue-2"
-        job_id_2 = await svc.create_job(sample_parsed_error)
+        project_error.source_issue_id = "issue-2"
+        job_id_2 = await svc.create_job(project_error)
 
-        job = await svc.get_pending_job()
+        job = await svc.get_next_job()
         assert job.id == job_id_2
 
 
@@ -134,23 +212,51 @@ class TestUpdateJobStatus:
         job = await svc.get_job(job_id)
         assert job.retry_count == 2
 
+    async def test_update_status_compare_and_set(self, db_session, svc, sample_parsed_error):
+        job_id = await svc.create_job(sample_parsed_error)
+
+        assert not await svc.update_job_status(job_id, JobStatus.DONE, expected=JobStatus.PROCESSING)
+        assert (await svc.get_job(job_id)).status == JobStatus.PENDING
+
+        assert await svc.update_job_status(
+            job_id, JobStatus.PROCESSING, expected=(JobStatus.PENDING, JobStatus.RATE_LIMITED),
+        )
+        assert (await svc.get_job(job_id)).status == JobStatus.PROCESSING
+
+    async def test_update_status_missing_job(self, db_session, svc):
+        assert not await svc.update_job_status("missing", JobStatus.DONE)
+
 
-class TestListJobs:
-    async def test_list_jobs_empty(self, db_session, svc):
-        jobs = await svc.list_jobs()
+class TestAddTokens:
+    async def test_add_tokens_accumulates(self, db_session, svc, sample_parsed_error):
+        job_id = await svc.create_job(sample_parsed_error)
+
+        assert await svc.add_tokens(job_id, 100, 10) == (100, 10)
+        assert await svc.add_tokens(job_id, 50, 5) == (150, 15)
+
+        job = await svc.get_job(job_id)
+        assert (job.input_tokens, job.output_tokens) == (150, 15)
+
+    async def test_add_tokens_missing_job(self, db_session, svc):
+        assert await svc.add_tokens("missing", 1, 1) is None
+
+
+class TestListJobSummaries:
+    async def test_list_empty(self, db_session, svc):
+        jobs = await svc.list_job_summaries()
         assert jobs == []
 
-    async def test_list_jobs_returns_all(self, db_session, svc, sample_parsed_error):
+    async def test_list_returns_all(self, db_session, svc, sample_parsed_error):
         sample_parsed_error.source_issue_id = "issue-1"
         await svc.create_job(sample_parsed_error)
 
         sample_parsed_error.source_issue_id = "issue-2"
         await svc.create_job(sample_parsed_error)
 
-        jobs = await svc.list_jobs()
+        jobs = await svc.list_job_summaries()
         assert len(jobs) == 2
 
-    async def test_list_jobs_filter_by_status(self, db_session, svc, sample_parsed_error):
+    async def test_list_filter_by_status(self, db_session, svc, sample_parsed_error):
         sample_parsed_error.source_issue_id = "issue-1"
         job_id_1 = await svc.create_job(sample_parsed_error)
         await svc.update_job_status(job_id_1, JobStatus.DONE)
@@ -158,5 +264,102 @@ class TestListJobs:
         sample_parsed_error.source_issue_id = "issue-2"
         await svc.create_job(sample_parsed_error)
 
-        assert len(await svc.list_jobs(status=JobStatus.PENDING)) == 1
-        assert len(await svc.list_jobs(status=JobStatus.DONE)) == 1
+        assert len(await svc.list_job_summaries(status=JobStatus.PENDING)) == 1
+        assert len(await svc.list_job_summaries(status=JobStatus.DONE)) == 1
+
+    async def test_keyset_pages_cover_all_jobs(self, db_session, svc, sample_parsed_error):
+        for i in range(5):
+            await svc.create_job(sample_parsed_error.model_copy(update={"source_issue_id": f"issue-{i}"}))
+
+        seen, after = [], None
+        while True:
+            page = await svc.list_job_summaries(after=after, limit=2)
+            if not page:
+                break
+            seen.extend(page)
+            after = (page[-1].created_at, page[-1].id)
+
+        assert len(seen) == 5
+        assert len({j.id for j in seen}) == 5
+        keys = [(j.created_at, j.id) for j in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    async def test_summary_excludes_heavy_fields(self, db_session, svc, sample_parsed_error):
+        await svc.create_job(sample_parsed_error)
+
+        db_session.expunge_all()  # create_job이 남긴 완전히 로드된 객체 대신 목록 쿼리 결과를 보도록
+
+        [row] = await svc.repo.list_job_summaries()
+        assert row.title == "Test Error"
+        unloaded = inspect(row).unloaded
+        assert {"raw_payload", "stacktrace", "message", "error_log", "raw_payload_blob", "stacktrace_blob"} <= unloaded
+        assert not {c.key for c in JOB_SUMMARY_COLUMNS} & unloaded
+
+
+class TestBlobStorage:
+    async def test_large_values_compressed_and_deduplicated(self, db_session, svc, sample_parsed_error):
+        payload = '{"spans": [%s]}' % ",".join(['{"op": "db.sql.query"}'] * 2000)
+        sample_parsed_error.raw_payload = payload
+        job_ids = []
+        for i in range(2):
+            sample_parsed_error.source_issue_id = f"issue-{i}"
+            _, job_id = await svc.ingest_error(sample_parsed_error)
+            job_ids.append(job_id)
+        output = {"tool": "bash", "output": "y" * 10_000}
+        await svc.add_task(job_ids[0], JobTaskType.TOOL_USE, content=output)
+
+        inline = (await db_session.execute(select(JobModel.raw_payload).where(JobModel.id == job_ids[0]))).scalar()
+        assert inline is None
+        assert (await db_session.execute(select(func.count()).select_from(BlobModel))).scalar() == 2
+
+        db_session.expunge_all()  # 캐시된 ORM 객체 대신 DB에서 다시 읽기
+        assert (await svc.get_job(job_ids[1])).raw_payload == payload
+        assert (await svc.get_job(job_ids[1])).stacktrace.startswith("[{")
+        [task] = await svc.list_tasks(job_ids[0])
+        assert task.content == json.dumps(output, ensure_ascii=False)
+        [summary] = await svc.list_task_summaries(job_ids[0])
+        assert summary.content_length == len(task.content)
+
+
+class TestTaskHistory:
+    async def test_incremental_and_slim(self, db_session, svc, sample_parsed_error):
+        job_id = await svc.create_job(sample_parsed_error)
+        await svc.add_task(job_id, JobTaskType.STATUS, content="processing")
+        await svc.add_task(job_id, JobTaskType.TOOL_USE, content={"tool": "bash", "output": "x" * 1000})
+
+        assert [t.sequence for t in await svc.list_tasks(job_id, after_sequence=1)] == [2]
+
+        slim = await svc.list_task_summaries(job_id)
+        assert [t.sequence for t in slim] == [1, 2]
+        assert slim[0].content_length == len("processing")
+        assert slim[1].content_length > 1000
+
+        task = await svc.get_task(job_id, 2)
+        assert "bash" in task.content
+        assert await svc.get_task(job_id, 3) is None
+
+
+class TestExecutorCheckpoint:
+    async def test_load_checkpoint_returns_none_when_empty(self, db_session, svc, sample_parsed_error):
+        job_id = await svc.create_job(sample_parsed_error)
+        assert await svc.load_checkpoint(job_id) is None
+
+    async def test_checkpoint_roundtrip_concatenates_turns(self, db_session, svc, sample_parsed_error):
+        job_id = await svc.create_job(sample_parsed_error)
+        prompt = [{"role": "user", "content": "fix it"}]
+        turn1 = [
+            {"role": "assistant", "content": [{"type": "tool_use", "id": "t1", "name": "bash", "input": {"command": "ls"}}]},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t1", "content": "a.py\n" * 1000}]},
+        ]
+        await svc.append_checkpoint(job_id, 0, prompt)
+        await svc.append_checkpoint(job_id, 1, turn1)
+
+        turn, messages = await svc.load_checkpoint(job_id)
+        assert turn == 1
+        assert messages == prompt + turn1
+
+    async def test_clear_checkpoint(self, db_session, svc, sample_parsed_error):
+        job_id = await svc.create_job(sample_parsed_error)
+        await svc.append_checkpoint(job_id, 0, [{"role": "user", "content": "fix it"}])
+        await svc.clear_checkpoint(job_id)
+        assert await svc.load_checkpoint(job_id) is None
@@ -0,0 +1,77 @@
+import gzip
+from datetime import UTC, datetime, timedelta
+
+import orjson
+import pytest
+from sqlalchemy import func, select
+
+from core import database
+from core.config import settings
+from models.error import ParsedError
+from models.job import BlobModel, ErrorSource, JobStatus, JobTaskType
+from services.job_queue import JobService
+from services.maintenance import MaintenanceRunner
+
+
+@pytest.fixture
+def retention(monkeypatch):
+    monkeypatch.setattr(settings, "retention_task_content_days", 30)
+    monkeypatch.setattr(settings, "retention_archive_days", 90)
+
+
+async def _job(issue_id: str, status: JobStatus, content: str) -> str:
+    svc = JobService()
+    async with database.db_write_context():
+        _, job_id = await svc.ingest_error(ParsedError(
+            source=ErrorSource.SENTRY, source_issue_id=issue_id, title="Test Error",
+            raw_payload='{"spans": [%s]}' % ",".join([f'"{issue_id}"'] * 1000),
+        ))
+        await svc.add_task(job_id, JobTaskType.TOOL_USE, content=content, label="bash")
+        if status != JobStatus.PENDING:
+            await svc.update_job_status(job_id, status)
+    return job_id
+
+
+class TestMaintenance:
+    @pytest.mark.sqlite_only  # incremental vacuum
+    async def test_prune_archive_and_vacuum(self, test_db_path, tmp_path, retention):
+        svc = JobService()
+        done = await _job("done", JobStatus.DONE, "x" * 10_000)
+        failed = await _job("failed", JobStatus.FAILED, "y" * 10_000)
+        pending = await _job("pending", JobStatus.PENDING, "z" * 10_000)
+
+        runner = MaintenanceRunner(batch_size=1, archive_dir=tmp_path)
+        report = await runner.run_once(now=datetime.now(UTC) + timedelta(days=100))
+
+        assert report.jobs_archived == 1
+        assert report.tasks_pruned == 1  # failed (done은 아카이브로 삭제, pending은 유지)
+        assert report.blobs_deleted == 3  # done의 payload/task, failed의 task
+        assert report.free_pages == 0
+
+        async with database.db_context() as session:
+            assert await svc.get_job(done) is None
+            [task] = await svc.list_tasks(failed)
+            assert (task.label, task.content) == ("bash", None)
+            [task] = await svc.list_tasks(pending)
+            assert task.content == "z" * 10_000
+            assert (await session.execute(select(func.count()).select_from(BlobModel))).scalar() == 3
+
+        [archive] = tmp_path.glob("jobs-*.ndjson.gz")
+        [record] = [orjson.loads(line) for line in gzip.decompress(archive.read_bytes()).splitlines()]
+        assert record["id"] == done
+        assert record["raw_payload"].startswith('{"spans"')
+        assert [t["content"] for t in record["tasks"]] == ["x" * 10_000]
+
+    async def test_reopened_job_not_deleted(self, test_db_path, tmp_path, retention):
+        svc = JobService()
+        job_id = await _job("issue", JobStatus.DONE, "output")
+        before = datetime.now(UTC) + timedelta(days=1)
+
+        async with database.db_context():
+            [record] = await svc.list_archivable(before, 10)
+        async with database.db_write_context():
+            await svc.ingest_error(ParsedError(source=ErrorSource.SENTRY, source_issue_id="issue", title="Again"))
+        async with database.db_write_context():
+            assert await svc.delete_archived([record["id"]], before) == []
+        async with database.db_context():
+            assert (await svc.get_job(job_id)).status == JobStatus.PENDING
@@ -1,4 +1,7 @@
+import json
+
 import pytest
+from pydantic import ValidationError
 
 from models.job import ErrorSource
 from services.parsers import get_parser
@@ -73,6 +76,13 @@ class TestSentryParser:
         assert parsed.raw_payload is not None
         assert "7241469116" in parsed.raw_payload
 
+    def test_parse_keeps_raw_body_verbatim(self, sentry_payload):
+        """요청 body가 있으면 재직렬화 없이 그대로 저장"""
+        body = json.dumps(sentry_payload, indent=2).encode()
+        parsed = SentryParser().parse(sentry_payload, raw=body)
+
+        assert parsed.raw_payload == body.decode()
+
     def test_parse_minimal_payload(self, sentry_payload_minimal):
         """최소 payload 파싱 (stacktrace 없음)"""
         parser = SentryParser()
@@ -92,6 +102,19 @@ class TestSentryParser:
 
         assert parsed.source_issue_id == "abc123"
 
+    def test_parse_json_matches_dict_parse(self, sentry_payload):
+        """bytes에서 바로 파싱해도 결과가 같고, body는 그대로 raw_payload"""
+        body = json.dumps(sentry_payload, indent=2).encode()
+        parsed = SentryParser().parse_json(body)
+
+        assert parsed == SentryParser().parse(sentry_payload, raw=body)
+        assert parsed.raw_payload == body.decode()
+        assert [f.filename for f in parsed.frames] == ["app/utils.py", "app/main.py"]
+
+    def test_parse_json_invalid(self):
+        with pytest.raises(ValidationError, match="json_invalid|Invalid JSON"):
+            SentryParser().parse_json(b"{not json")
+
 
 class TestParserRegistry:
     """파서 레지스트리 테스트"""
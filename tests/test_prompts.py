@@ -0,0 +1,124 @@
+from pathlib import Path
+
+from models.job import ErrorSource, Job
+from prompts.fix_error import (
+    EXECUTOR_SYSTEM_PROMPT,
+    TIER_FRAME_CONTEXT,
+    TIER_FULL_FILE,
+    TIER_FULL_PLAN,
+    TIER_FUNCTION_WINDOW,
+    TIER_SOURCE_CONTEXT,
+    TIER_TRUNCATED_PLAN,
+    estimate_tokens,
+    execute_prompt_candidates,
+    plan_prompt_candidates,
+)
+
+SOURCE = "\n".join(
+    ["import os", ""]
+    + [f"def filler_{i}():\n    return {i}\n" for i in range(50)]
+    + [
+        "class Handler:",
+        "    def handle(self, data):",
+        "        total = sum(data)",
+        "        return total / len(data)",
+        "",
+        "    def other(self):",
+        "        return None",
+    ]
+)
+
+
+def _lineno(text: str) -> int:
+    return SOURCE.splitlines().index(text) + 1
+
+
+def _job(**kwargs) -> Job:
+    return Job(
+        id="job-1",
+        source=ErrorSource.SENTRY,
+        source_issue_id="issue-1",
+        title="ZeroDivisionError: division by zero",
+        filename="app/handler.py",
+        **kwargs,
+    )
+
+
+class TestEstimateTokens:
+    """로컬 토큰 추정 테스트"""
+
+    def test_ascii_is_about_four_chars_per_token(self):
+        assert 240 <= estimate_tokens("a" * 1000) <= 260
+
+    def test_non_ascii_counts_per_char(self):
+        assert estimate_tokens("한글" * 100) >= 200
+
+
+class TestPlanPromptCandidates:
+    """플랜 프롬프트 예산 단계 테스트"""
+
+    def test_tiers_shrink_in_priority_order(self):
+        job = _job(lineno=_lineno("        return total / len(data)"))
+        candidates = plan_prompt_candidates(job, SOURCE)
+
+        assert [tier for tier, _ in candidates] == [
+            TIER_FULL_FILE, TIER_SOURCE_CONTEXT, TIER_FUNCTION_WINDOW, TIER_FRAME_CONTEXT,
+        ]
+        sizes = [estimate_tokens(text) for _, text in candidates]
+        assert sizes == sorted(sizes, reverse=True)
+        assert "def filler_0" in candidates[0][1]
+        assert "def filler_0" not in candidates[1][1]
+        assert "import os" in candidates[1][1]
+        assert "def handle" in candidates[2][1]
+        assert "```python" in candidates[2][1]
+
+    def test_large_file_skips_full_file(self):
+        source = SOURCE + "\n" + "\n".join(f"X_{i} = {i}" for i in range(5000))
+        job = _job(lineno=_lineno("        return total / len(data)"))
+        candidates = plan_prompt_candidates(job, source)
+
+        assert candidates[0][0] == TIER_SOURCE_CONTEXT
+        assert estimate_tokens(candidates[0][1]) * 10 < estimate_tokens(source)
+
+    def test_without_file_content_single_candidate(self):
+        candidates = plan_prompt_candidates(_job(lineno=3), None)
+        assert len(candidates) == 1
+
+
+class TestExecutePromptCandidates:
+    """실행 프롬프트 플랜 절단 테스트"""
+
+    def test_small_plan_is_not_truncated(self):
+        candidates = execute_prompt_candidates(_job(), Path("/repo"), "fix/abc", "짧은 플랜", budget=10_000)
+        assert [tier for tier, _ in candidates] == [TIER_FULL_PLAN]
+
+    def test_large_plan_is_truncated_to_budget(self):
+        plan = "step\n" * 20_000
+        candidates = execute_prompt_candidates(_job(), Path("/repo"), "fix/abc", plan, budget=2_000)
+
+        assert [tier for tier, _ in candidates] == [TIER_FULL_PLAN, TIER_TRUNCATED_PLAN]
+        assert estimate_tokens(candidates[1][1]) <= 2_000
+
+    def test_previous_progress_counts_against_budget(self):
+        plan = "step\n" * 2_000  # 이전 진행 내역 없이는 예산 안 (~2,800 tokens)
+        progress = "[이전 도구 호출] bash: pytest\n" * 40
+        assert [t for t, _ in execute_prompt_candidates(_job(), Path("/repo"), "fix/abc", plan, 3_000)] == [
+            TIER_FULL_PLAN,
+        ]
+
+        candidates = execute_prompt_candidates(_job(), Path("/repo"), "fix/abc", plan, 3_000, prev_context=progress)
+
+        assert [tier for tier, _ in candidates] == [TIER_FULL_PLAN, TIER_TRUNCATED_PLAN]
+        assert all(text.endswith(progress) for _, text in candidates)
+        assert estimate_tokens(EXECUTOR_SYSTEM_PROMPT) + estimate_tokens(candidates[1][1]) <= 3_000
+
+    def test_long_progress_keeps_latest(self):
+        progress = "\n".join(f"[이전 도구 호출] bash: step {i}" for i in range(1_000))
+        candidates = execute_prompt_candidates(
+            _job(), Path("/repo"), "fix/abc", "step\n" * 1_000, 3_000, prev_context=progress,
+        )
+
+        text = candidates[-1][1]
+        assert text.endswith("step 999")
+        assert "step 0\n" not in text
+        assert estimate_tokens(EXECUTOR_SYSTEM_PROMPT) + estimate_tokens(text) <= 3_000
@@ -0,0 +1,311 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from core import blobs, database
+from core.config import settings
+from core.migrations import MIGRATIONS
+from models.job import JobStatus
+from repositories.blob import BlobRepository
+from repositories.job import JobRepository
+
+
+pytestmark = pytest.mark.sqlite_only  # EXPLAIN QUERY PLAN, PRAGMA user_version
+
+
+async def _plans(db_session, call) -> list[str]:
+    """repository 호출이 실행한 SQL의 EXPLAIN QUERY PLAN 상세 목록"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("EXPLAIN"):
+            statements.append((statement, parameters))
+
+    sync_engine = database.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await call()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    conn = await db_session.connection()
+    plans = []
+    for statement, parameters in statements:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plans.append("\n".join(row[-1] for row in result))
+    return plans
+
+
+class TestQueryPlans:
+    """주요 조회가 인덱스를 타는지 (jobs 전체 SCAN / 임시 정렬 없음)"""
+
+    async def test_get_next_job_uses_queue_index(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "job_priority", "fifo")
+        [plan] = await _plans(db_session, JobRepository().get_next_job)  # 고르기 + 전환이 UPDATE 한 문장
+
+        assert plan.count("idx_jobs_queue") == 2  # RATE_LIMITED, PENDING 각각
+        assert "SCAN jobs" not in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_update_status_single_statement(self, db_session):
+        update_status = JobRepository().update_status
+        [plan] = await _plans(
+            db_session, lambda: update_status("missing", JobStatus.DONE, expected=JobStatus.PROCESSING),
+        )
+
+        assert plan == "SEARCH jobs USING INDEX sqlite_autoindex_jobs_1 (id=?)"  # 이전 상태 조회 없이 PK UPDATE 한 번
+
+    async def test_get_next_job_score_reads_pending_from_index(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "job_priority", "score")
+        [plan] = await _plans(db_session, JobRepository().get_next_job)
+
+        # 점수 정렬은 임시 정렬이 필요하지만 대상은 인덱스로 고른 PENDING job만
+        assert plan.count("idx_jobs_queue") == 2
+        assert "SCAN jobs" not in plan
+
+    @pytest.mark.parametrize(
+        "kwargs, index",
+        [
+            ({}, "idx_jobs_created_at"),
+            ({"source_project_id": "p1"}, "idx_jobs_project_created_at"),
+            ({"status": JobStatus.DONE}, "idx_jobs_queue"),
+        ],
+    )
+    async def test_list_job_summaries_keyset(self, db_session, kwargs, index):
+        after = (datetime(2026, 1, 1), "job-1")
+        [plan] = await _plans(
+            db_session, lambda: JobRepository().list_job_summaries(after=after, **kwargs),
+        )
+
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_list_tasks_uses_sequence_index(self, db_session):
+        repo = JobRepository()
+        plans = await _plans(db_session, lambda: repo.list_tasks("job-1", after_sequence=10))
+        plans += await _plans(db_session, lambda: repo.list_task_summaries("job-1", after_sequence=10))
+
+        for plan in plans:
+            assert "uq_job_tasks_job_sequence (job_id=? AND sequence>?)" in plan
+            assert "TEMP B-TREE" not in plan
+
+    async def test_retention_uses_partial_indexes(self, db_session):
+        await BlobRepository().put([blobs.split("x" * 10_000)[1]])
+        plans = await _plans(db_session, lambda: JobRepository().prune_task_content(datetime(2026, 1, 1), 100))
+        plans += await _plans(db_session, lambda: BlobRepository().delete_unreferenced("", 100))
+        plan = "\n".join(plans)
+
+        assert "idx_job_tasks_retention (created_at<?)" in plan
+        for index in ("idx_jobs_stacktrace_blob", "idx_jobs_raw_payload_blob", "idx_job_tasks_content_blob"):
+            assert index in plan
+        assert "SCAN job" not in plan
+
+
+class TestMigrations:
+    """기존 DB (구 인덱스, sequence 중복) → 복합 인덱스"""
+
+    async def test_upgrades_old_schema(self, test_db_path):
+        conn = sqlite3.connect(test_db_path)
+        conn.executescript("""
+            DROP INDEX idx_jobs_queue;
+            DROP INDEX uq_job_tasks_job_sequence;
+            CREATE INDEX idx_jobs_status ON jobs (status);
+            CREATE INDEX idx_job_tasks_job_id ON job_tasks (job_id);
+            INSERT INTO job_tasks (id, job_id, sequence, type, created_at) VALUES
+                ('t1', 'j1', 1, 'status', '2026-01-01 00:00:01'),
+                ('t2', 'j1', 1, 'status', '2026-01-01 00:00:02'),
+                ('t3', 'j1', 2, 'status', '2026-01-01 00:00:03');
+            PRAGMA user_version = 0;
+        """)
+        conn.close()
+
+        database.reset_engine()
+        await database.init_db()
+
+        async with database.db_context() as session:
+            version = (await session.execute(text("PRAGMA user_version"))).scalar()
+            indexes = set((await session.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            )).scalars())
+            sequences = (await session.execute(
+                text("SELECT id, sequence FROM job_tasks ORDER BY sequence")
+            )).all()
+
+        assert version == len(MIGRATIONS)
+        assert {"idx_jobs_queue", "uq_job_tasks_job_sequence"} <= indexes
+        assert not {"idx_jobs_status", "idx_job_tasks_job_id"} & indexes
+        assert [tuple(r) for r in sequences] == [("t1", 1), ("t2", 2), ("t3", 3)]
+
+    async def test_upgrades_baseline_schema(self, test_db_path):
+        """최초 릴리스 스키마(user_version 0)에서 최신까지 — 뒤 단계 컬럼의 인덱스를 앞 단계가 만들면 실패"""
+        test_db_path.unlink()
+        conn = sqlite3.connect(test_db_path)
+        conn.executescript("""
+            CREATE TABLE jobs (
+                id VARCHAR(36) NOT NULL PRIMARY KEY,
+                status VARCHAR(20) NOT NULL,
+                source VARCHAR(50) NOT NULL,
+                source_project_id VARCHAR(255),
+                source_issue_id VARCHAR(255) NOT NULL,
+                title TEXT NOT NULL,
+                subtitle TEXT, message TEXT, level VARCHAR(20), environment VARCHAR(50),
+                exception_type VARCHAR(255), "transaction" VARCHAR(500),
+                filename TEXT, lineno INTEGER, "function" VARCHAR(255), stacktrace TEXT,
+                work_branch VARCHAR(255), error_log TEXT,
+                input_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL,
+                rate_limited_until DATETIME,
+                retry_count INTEGER NOT NULL, source_url TEXT, raw_payload TEXT,
+                created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+                CONSTRAINT uq_jobs_source_issue UNIQUE (source, source_issue_id)
+            );
+            CREATE INDEX idx_jobs_status ON jobs (status);
+            CREATE TABLE job_tasks (
+                id VARCHAR(36) NOT NULL PRIMARY KEY,
+                job_id VARCHAR(36) NOT NULL REFERENCES jobs (id),
+                sequence INTEGER NOT NULL,
+                type VARCHAR(20) NOT NULL,
+                label VARCHAR(200),
+                content TEXT,
+                created_at DATETIME NOT NULL
+            );
+            CREATE INDEX idx_job_tasks_job_id ON job_tasks (job_id);
+            INSERT INTO jobs (
+                id, status, source, source_issue_id, title, stacktrace,
+                input_tokens, output_tokens, retry_count, created_at, updated_at
+            ) VALUES ('j1', 'done', 'sentry', 'i1', 'KeyError in checkout', '[]', 10, 5, 0,
+                      '2026-01-01 00:00:00', '2026-01-01 00:00:00');
+            INSERT INTO job_tasks (id, job_id, sequence, type, content, created_at)
+            VALUES ('t1', 'j1', 1, 'status', 'started', '2026-01-01 00:00:01');
+        """)
+        conn.close()
+
+        database.reset_engine()
+        await database.init_db()
+
+        async with database.db_context() as session:
+            version = (await session.execute(text("PRAGMA user_version"))).scalar()
+            indexes = set((await session.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            )).scalars())
+            stats = (await session.execute(text("SELECT status, job_count FROM job_stats"))).all()
+            tokens = (await session.execute(
+                text("SELECT day, input_tokens, output_tokens FROM token_usage")
+            )).all()
+            job = await JobRepository().get("j1")
+
+        assert version == len(MIGRATIONS)
+        assert {
+            "idx_jobs_queue", "idx_jobs_created_at", "idx_jobs_project_created_at", "uq_job_tasks_job_sequence",
+            "idx_jobs_stacktrace_blob", "idx_jobs_raw_payload_blob",
+            "idx_job_tasks_retention", "idx_job_tasks_content_blob",
+        } <= indexes
+        assert not {"idx_jobs_status", "idx_job_tasks_job_id"} & indexes
+        assert [tuple(r) for r in stats] == [("done", 1)]
+        assert [tuple(r) for r in tokens] == [("2026-01-01", 10, 5)]
+        assert job.occurrence_count == 1
+
+    async def test_adds_occurrence_columns(self, test_db_path):
+        conn = sqlite3.connect(test_db_path)
+        conn.executescript("""
+            ALTER TABLE jobs DROP COLUMN occurrence_count;
+            ALTER TABLE jobs DROP COLUMN first_seen;
+            ALTER TABLE jobs DROP COLUMN last_seen;
+            ALTER TABLE jobs DROP COLUMN event_rate;
+            INSERT INTO jobs (
+                id, status, source, source_issue_id, title,
+                input_tokens, output_tokens, retry_count, created_at, updated_at
+            ) VALUES ('j1', 'done', 'sentry', 'i1', 't', 0, 0, 0, '2026-01-01 00:00:00', '2026-01-02 00:00:00');
+            PRAGMA user_version = 2;
+        """)
+        conn.close()
+
+        database.reset_engine()
+        await database.init_db()
+
+        async with database.db_context() as session:
+            row = (await session.execute(
+                text("SELECT occurrence_count, first_seen, last_seen, event_rate FROM jobs")
+            )).one()
+
+        assert tuple(row) == (1, "2026-01-01 00:00:00", "2026-01-01 00:00:00", 0)
+
+    async def test_moves_tokens_to_usage_table(self, test_db_path):
+        conn = sqlite3.connect(test_db_path)
+        conn.executescript("""
+            ALTER TABLE jobs RENAME COLUMN previous_status TO reopened_from;
+            DROP TABLE job_stats;
+            CREATE TABLE job_stats (
+                source VARCHAR(50) NOT NULL, source_project_id VARCHAR(255) NOT NULL,
+                status VARCHAR(20) NOT NULL, day DATE NOT NULL,
+                job_count INTEGER NOT NULL, input_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL,
+                PRIMARY KEY (source, source_project_id, status, day)
+            );
+            INSERT INTO jobs (
+                id, status, source, source_issue_id, title,
+                input_tokens, output_tokens, retry_count, created_at, updated_at
+            ) VALUES
+                ('j1', 'done', 'sentry', 'i1', 't', 10, 5, 0, '2026-01-01 00:00:00', '2026-01-03 00:00:00'),
+                ('j2', 'pending', 'sentry', 'i2', 't', 0, 0, 0, '2026-01-02 00:00:00', '2026-01-02 00:00:00');
+            INSERT INTO job_stats VALUES ('sentry', '', 'done', '2026-01-01', 1, 10, 5);
+            PRAGMA user_version = 7;
+        """)
+        conn.close()
+
+        database.reset_engine()
+        await database.init_db()
+
+        async with database.db_context() as session:
+            columns = {row[1] for row in await session.execute(text("PRAGMA table_info(jobs)"))}
+            stats = (await session.execute(text("SELECT status, job_count FROM job_stats ORDER BY status"))).all()
+            tokens = (await session.execute(
+                text("SELECT day, source_project_id, input_tokens, output_tokens FROM token_usage")
+            )).all()
+
+        assert "previous_status" in columns and "reopened_from" not in columns
+        assert [tuple(r) for r in stats] == [("done", 1), ("pending", 1)]
+        assert [tuple(r) for r in tokens] == [("2026-01-03", "", 10, 5)]  # 마지막 변경일에 합산
+
+    async def test_externalizes_large_values(self, test_db_path, caplog):
+        payload = "x" * 50_000
+        conn = sqlite3.connect(test_db_path)
+        conn.executescript(f"""
+            DROP VIEW jobs_search_source;
+            DROP VIEW job_tasks_search_source;
+            DROP INDEX idx_jobs_raw_payload_blob;
+            DROP INDEX idx_jobs_stacktrace_blob;
+            DROP INDEX idx_job_tasks_content_blob;
+            DROP INDEX idx_job_tasks_retention;
+            ALTER TABLE jobs DROP COLUMN raw_payload_blob;
+            ALTER TABLE jobs DROP COLUMN stacktrace_blob;
+            ALTER TABLE job_tasks DROP COLUMN content_blob;
+            INSERT INTO jobs (
+                id, status, source, source_issue_id, title, raw_payload, stacktrace,
+                input_tokens, output_tokens, retry_count, created_at, updated_at
+            ) VALUES
+                ('j1', 'done', 'sentry', 'i1', 't', '{payload}', '[]', 0, 0, 0, '2026-01-01', '2026-01-01'),
+                ('j2', 'done', 'sentry', 'i2', 't', '{payload}', '[]', 0, 0, 0, '2026-01-01', '2026-01-01');
+            INSERT INTO job_tasks (id, job_id, sequence, type, content, created_at)
+            VALUES ('t1', 'j1', 1, 'tool_use', '{payload}', '2026-01-01');
+            PRAGMA user_version = 3;
+        """)
+        conn.close()
+
+        database.reset_engine()
+        with caplog.at_level("INFO", logger="core.migrations"):
+            await database.init_db()
+
+        async with database.db_context() as session:
+            inline = (await session.execute(
+                text("SELECT raw_payload, stacktrace FROM jobs UNION ALL SELECT content, NULL FROM job_tasks")
+            )).all()
+            blob_count = (await session.execute(text("SELECT COUNT(*) FROM blobs"))).scalar()
+            job = await JobRepository().get("j2")
+            [task] = await JobRepository().list_tasks("j1")
+
+        assert [tuple(r) for r in inline] == [(None, "[]"), (None, "[]"), (None, None)]
+        assert blob_count == 1  # 같은 내용은 하나로
+        assert job.raw_payload == payload
+        assert task.content == payload
+        assert "Moved 3 values to blobs" in caplog.text
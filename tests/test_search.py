@@ -0,0 +1,83 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from core import database
+from core.config import settings
+from models.error import ParsedError
+from models.job import ErrorSource, JobStatus, JobTaskType
+from repositories.search import to_fts_query
+from services.job_queue import JobService
+from services.maintenance import MaintenanceRunner
+
+
+pytestmark = pytest.mark.sqlite_only  # FTS5
+
+
+async def _job(issue_id: str, title: str, filename: str | None = None, project: str | None = None) -> str:
+    async with database.db_write_context():
+        _, job_id = await JobService().ingest_error(ParsedError(
+            source=ErrorSource.SENTRY, source_issue_id=issue_id, source_project_id=project,
+            title=title, filename=filename,
+        ))
+    return job_id
+
+
+def test_to_fts_query():
+    assert to_fts_query("payments/refund.py") == '"payments/refund.py"'
+    assert to_fts_query('pytest "1 failed" refun*') == '"pytest" "1 failed" "refun"*'
+    assert to_fts_query('a"b OR -') == '"a""b" "OR"'
+    assert to_fts_query(" - ") is None
+
+
+class TestSearch:
+    async def test_jobs_and_tasks_ranked_with_highlights(self, test_db_path):
+        svc = JobService()
+        refund = await _job("1", "ValueError: bad amount", filename="payments/refund.py")
+        other = await _job("2", "KeyError in payments/charge.py")
+        async with database.db_write_context():
+            await svc.add_task(other, JobTaskType.TOOL_USE, label="pytest", content={
+                "tool": "bash", "input": "pytest tests/", "output": "E   payments/refund.py:10 " + "x " * 2000 + "1 failed",
+            })
+
+        async with database.db_context():
+            hits = await svc.search("payments/refund.py")
+            assert [h.job.id for h in hits] == [refund, other]  # filename 일치가 task 본문보다 우선
+            [match] = hits[1].matches
+            assert (match.sequence, match.label) == (1, "pytest")
+            start, end = match.highlights[0]
+            assert match.snippet[start:end] == "payments/refund.py"
+
+            [hit] = await svc.search("pytest failed")
+            assert hit.job.id == other
+            assert await svc.search("payments", status=JobStatus.DONE) == []
+
+    async def test_filters_apply_before_rank_window(self, test_db_path, monkeypatch):
+        monkeypatch.setattr(settings, "search_rank_window", 2)
+        svc = JobService()
+        old = await _job("1", "TimeoutError", project="a")
+        for issue_id in ("2", "3"):  # 더 최근 일치가 창을 채움
+            job_id = await _job(issue_id, "TimeoutError", project="b")
+        async with database.db_write_context():
+            for job_id in (old, job_id):
+                await svc.add_task(job_id, JobTaskType.TOOL_USE, label="pytest", content="TimeoutError")
+
+        async with database.db_context():
+            [hit] = await svc.search("TimeoutError", source_project_id="a")
+            assert hit.job.id == old
+            assert len(hit.matches) == 2  # job 필드 + task
+
+    async def test_index_follows_retention(self, test_db_path, tmp_path, monkeypatch):
+        svc = JobService()
+        job_id = await _job("1", "TimeoutError")
+        async with database.db_write_context():
+            await svc.add_task(job_id, JobTaskType.TOOL_USE, label="grep", content="needle " + "x" * 5000)
+            await svc.update_job_status(job_id, JobStatus.FAILED)
+
+        monkeypatch.setattr(settings, "retention_task_content_days", 1)
+        await MaintenanceRunner(archive_dir=tmp_path).run_once(now=datetime.now(UTC) + timedelta(days=2))
+
+        async with database.db_context():
+            assert await svc.search("needle") == []
+            [hit] = await svc.search("grep")  # label은 남음
+            assert hit.matches[0].sequence == 1
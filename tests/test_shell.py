@@ -0,0 +1,63 @@
+import os
+import signal
+
+import pytest
+
+from services.shell import ShellSession
+
+
+@pytest.fixture
+async def shell(tmp_path):
+    session = ShellSession(tmp_path)
+    yield session
+    await session.close()
+
+
+class TestShellSession:
+    async def test_cwd_and_env_persist(self, shell, tmp_path):
+        assert await shell.run("mkdir sub && cd sub && export FOO=bar", timeout=10) == "(no output)"
+
+        output = await shell.run("pwd; echo $FOO", timeout=10)
+        assert output.split() == [str(tmp_path / "sub"), "bar"]
+
+    async def test_home_outside_work_tree(self, shell, tmp_path):
+        output = await shell.run("touch ~/.netrc && echo $HOME && echo $PIP_CACHE_DIR", timeout=10)
+        home, pip_cache = output.split()
+
+        assert not home.startswith(str(tmp_path))
+        assert pip_cache.startswith(home)
+        assert list(tmp_path.iterdir()) == []  # 작업 트리에 dotfile이 남지 않음
+
+        await shell.close()
+        assert not os.path.exists(home)
+
+    async def test_secrets_not_passed(self, shell, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-secret")
+        assert await shell.run('echo "key=$ANTHROPIC_API_KEY"', timeout=10) == "key=\n"
+
+    async def test_nonzero_exit_code(self, shell):
+        output = await shell.run("echo oops; (exit 3)", timeout=10)
+        assert output == "[exit 3]\noops\n"
+        assert shell.alive  # 실패한 명령은 셸을 끝내지 않음
+        assert await shell.run("echo ok", timeout=10) == "ok\n"
+
+    async def test_restarts_after_timeout(self, shell):
+        await shell.run("export FOO=bar", timeout=10)
+
+        assert await shell.run("sleep 30", timeout=1) == "[timeout after 1s]"
+        assert not shell.alive
+
+        output = await shell.run('echo "foo=$FOO"', timeout=10)
+        assert output == "[shell restarted — previous state lost]\nfoo=\n"
+
+    async def test_recovers_when_shell_exits(self, shell):
+        assert (await shell.run("echo bye; exit", timeout=10)).startswith("[shell exited]\nbye")
+        assert await shell.run("echo back", timeout=10) == "[shell restarted — previous state lost]\nback\n"
+
+    async def test_recovers_when_shell_killed(self, shell):
+        await shell.run("true", timeout=10)
+        proc = shell._proc
+        os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+
+        assert await shell.run("echo back", timeout=10) == "[shell restarted — previous state lost]\nback\n"
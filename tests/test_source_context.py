@@ -0,0 +1,109 @@
+from services.source_context import detect_language, extract_context
+
+PY_SOURCE = '''\
+import json
+from pathlib import Path
+
+LIMIT = 10
+
+
+def unused():
+    return 1
+
+
+def load(path):
+    return json.loads(Path(path).read_text())
+
+
+class Importer:
+    def _validate(self, rows):
+        return rows[:LIMIT]
+
+    @staticmethod
+    def helper():
+        pass
+
+    def run(self, path):
+        rows = load(path)
+        rows = self._validate(rows)
+        return 1 / len(rows)
+'''
+
+TS_SOURCE = '''\
+import { api } from './api'
+
+function compute(a: number, b: number) {
+  return a / b
+}
+
+export function handler(data: number[]) {
+  if (!data.length) {
+    throw new Error('empty')
+  }
+  return compute(data[0], 0)
+}
+
+function unrelated() {
+  return 0
+}
+'''
+
+
+def _lineno(source: str, text: str) -> int:
+    return source.splitlines().index(text) + 1
+
+
+class TestDetectLanguage:
+    """확장자 → 코드 블록 언어"""
+
+    def test_known_extensions(self):
+        assert detect_language("app/main.py") == "python"
+        assert detect_language("src\\\\app.tsx") == "tsx"
+
+    def test_unknown_extension(self):
+        assert detect_language("Makefile") == ""
+        assert detect_language(None) == ""
+
+
+class TestPythonContext:
+    """ast 기반 컨텍스트 추출"""
+
+    def test_enclosing_method_and_imports(self):
+        ctx = extract_context(PY_SOURCE, _lineno(PY_SOURCE, "        return 1 / len(rows)"), "importer.py")
+
+        assert ctx.language == "python"
+        assert ctx.region_name == "Importer.run"
+        assert ctx.region.splitlines()[0] == "    def run(self, path):"
+        assert ctx.imports == "import json\nfrom pathlib import Path"
+
+    def test_referenced_definitions(self):
+        ctx = extract_context(PY_SOURCE, _lineno(PY_SOURCE, "        return 1 / len(rows)"), "importer.py")
+        names = [d.name for d in ctx.definitions]
+
+        assert "load" in names
+        assert "_validate" in names
+        assert "unused" not in names
+        assert "helper" not in names
+
+    def test_out_of_range_returns_none(self):
+        assert extract_context(PY_SOURCE, 10_000, "importer.py") is None
+        assert extract_context(PY_SOURCE, None, "importer.py") is None
+
+    def test_syntax_error_falls_back_to_heuristic(self):
+        source = "def broken(:\n    return 1 / 0\n"
+        ctx = extract_context(source, 2, "broken.py")
+
+        assert "return 1 / 0" in ctx.region
+
+
+class TestHeuristicContext:
+    """들여쓰기/중괄호 휴리스틱"""
+
+    def test_brace_language_function(self):
+        ctx = extract_context(TS_SOURCE, _lineno(TS_SOURCE, "  return compute(data[0], 0)"), "handler.ts")
+
+        assert ctx.region_name == "handler"
+        assert ctx.region.splitlines()[-1] == "}"
+        assert "unrelated" not in ctx.region
+        assert ctx.imports == "import { api } from './api'"
+        assert [d.name for d in ctx.definitions] == ["compute"]
@@ -0,0 +1,88 @@
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from sqlalchemy import select, update
+
+from core import database
+from models.error import ParsedError
+from models.job import ErrorSource, JobModel, JobStatsModel, JobStatus, TokenUsageModel
+from models.project import ProjectModel
+from services.job_queue import JobService
+
+
+async def _stats_rows(session) -> set[tuple]:
+    result = await session.execute(select(JobStatsModel).where(JobStatsModel.job_count != 0))
+    return {(r.source_project_id, r.status, r.job_count) for r in result.scalars()}
+
+
+async def _token_rows(session) -> list[tuple]:
+    result = await session.execute(select(TokenUsageModel))
+    return [(r.day, r.source_project_id, r.input_tokens, r.output_tokens) for r in result.scalars()]
+
+
+class TestJobStats:
+    async def test_counters_follow_transitions(self, test_db_path):
+        from main import app
+
+        svc = JobService()
+        async with database.db_write_context() as session:
+            session.add(ProjectModel(
+                id="p", source="sentry", source_project_id="p1",
+                repo_url="https://github.com/o/r", repo_platform="github",
+            ))
+            for issue in ("1", "2", "3"):
+                await svc.ingest_error(ParsedError(
+                    source=ErrorSource.SENTRY, source_issue_id=issue, source_project_id="p1", title="E",
+                ))
+        async with database.db_write_context():
+            job = await svc.get_next_job()
+            await svc.add_tokens(job.id, 100, 10)
+            await svc.update_job_status(job.id, JobStatus.FAILED)
+            await svc.update_job_status(job.id, JobStatus.DONE, expected=JobStatus.PROCESSING)  # 무시됨
+        async with database.db_write_context():
+            await svc.ingest_error(ParsedError(  # 재오픈
+                source=ErrorSource.SENTRY, source_issue_id=job.source_issue_id, source_project_id="p1", title="E",
+            ))
+
+        async with database.db_context() as session:
+            incremental = await _stats_rows(session)
+            assert incremental == {("p1", "pending", 3)}
+            assert await _token_rows(session) == [(datetime.now(UTC).date(), "p1", 100, 10)]
+        async with database.db_write_context() as session:
+            await svc.rebuild_stats()
+            assert await _stats_rows(session) == incremental
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            [stats] = (await client.get("/api/stats")).json()
+        assert stats == {
+            "source": "sentry", "source_project_id": "p1",
+            "counts": {"pending": 3}, "input_tokens": 100, "output_tokens": 10,
+        }
+
+    async def test_tokens_counted_on_usage_day(self, test_db_path):
+        """오래전에 생성된 job이 오늘 쓴 토큰도 최근 N일 합계에 포함, 아카이브돼도 남음"""
+        svc = JobService()
+        async with database.db_write_context() as session:
+            job_id = await svc.create_job(ParsedError(
+                source=ErrorSource.SENTRY, source_issue_id="old", source_project_id="p1", title="E",
+            ))
+            await session.execute(
+                update(JobModel).where(JobModel.id == job_id)
+                .values(created_at=datetime.now(UTC) - timedelta(days=30))
+            )
+        async with database.db_write_context():
+            await svc.add_tokens(job_id, 100, 10)
+            await svc.update_job_status(job_id, JobStatus.DONE)
+
+        async with database.db_context():
+            [stats] = await svc.project_stats(days=1)
+        assert (stats.input_tokens, stats.output_tokens) == (100, 10)
+        assert stats.counts == {JobStatus.DONE: 1}
+
+        async with database.db_write_context():
+            assert await svc.repo.delete_archived([job_id], before=datetime.now(UTC) + timedelta(seconds=1)) == [job_id]
+        async with database.db_context():
+            [stats] = await svc.project_stats(days=1)
+        assert stats.counts == {}
+        assert (stats.input_tokens, stats.output_tokens) == (100, 10)
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from core import database
+from models.error import ParsedError
+from models.job import ErrorSource, JobTaskType
+from services.job_queue import JobService
+from services.task_log import TaskLogWriter
+
+
+@pytest.fixture
+async def job_id(test_db_path) -> str:
+    async with database.db_context():
+        return await JobService().create_job(
+            ParsedError(source=ErrorSource.SENTRY, source_issue_id="task-log", title="Test Error")
+        )
+
+
+async def _load(job_id: str):
+    svc = JobService()
+    async with database.db_context():
+        return await svc.list_tasks(job_id), await svc.get_job(job_id)
+
+
+class TestTaskLogWriter:
+    async def test_buffers_until_max_events(self, job_id):
+        writer = TaskLogWriter(max_events=3, interval_ms=60_000)
+
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="a")
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="b")
+        tasks, _ = await _load(job_id)
+        assert tasks == []
+
+        await writer.add_task(job_id, JobTaskType.TOOL_USE, content={"tool": "bash"})
+        tasks, _ = await _load(job_id)
+        assert [t.sequence for t in tasks] == [1, 2, 3]
+        assert writer.flushes == 1
+        assert writer.pending == 0
+
+    async def test_flushes_after_interval(self, job_id):
+        writer = TaskLogWriter(max_events=100, interval_ms=10)
+
+        await writer.add_task(job_id, JobTaskType.STATUS, content="processing")
+        await asyncio.sleep(0.1)
+
+        tasks, _ = await _load(job_id)
+        assert len(tasks) == 1
+
+    async def test_continues_sequence_from_db(self, job_id):
+        async with database.db_write_context():
+            await JobService().add_task(job_id, JobTaskType.STATUS, content="processing")
+
+        writer = TaskLogWriter(max_events=100, interval_ms=60_000)
+        assert await writer.add_task(job_id, JobTaskType.MESSAGE, content="a") == 2
+        await writer.close()
+
+        tasks, _ = await _load(job_id)
+        assert [t.sequence for t in tasks] == [1, 2]
+
+    async def test_tokens_folded_into_flush(self, job_id):
+        writer = TaskLogWriter(max_events=100, interval_ms=60_000)
+
+        writer.add_tokens(job_id, 100, 10)
+        writer.add_tokens(job_id, 50, 5)
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="a")
+        await writer.close()
+
+        tasks, job = await _load(job_id)
+        assert len(tasks) == 1
+        assert (job.input_tokens, job.output_tokens) == (150, 15)
+        assert writer.flushes == 1
+
+    async def test_write_pending_joins_caller_transaction(self, job_id):
+        writer = TaskLogWriter(max_events=100, interval_ms=60_000)
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="a")
+        writer.add_tokens(job_id, 100, 10)
+
+        with pytest.raises(RuntimeError):
+            async with database.db_write_context():
+                await writer.write_pending()
+                raise RuntimeError("boom")
+
+        tasks, job = await _load(job_id)
+        assert tasks == []
+        assert writer.pending == 1  # rollback된 이벤트는 버퍼로 돌아옴
+
+        await writer.close()
+        tasks, job = await _load(job_id)
+        assert [t.sequence for t in tasks] == [1]
+        assert (job.input_tokens, job.output_tokens) == (100, 10)
+
+    async def test_gives_up_after_flush_retries(self, job_id, monkeypatch):
+        writer = TaskLogWriter(max_events=100, interval_ms=10, flush_retries=2)
+        calls = 0
+
+        async def fail(tasks):
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("disk I/O error")
+
+        monkeypatch.setattr(writer.repo, "insert_tasks", fail)
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="a")
+        await asyncio.sleep(0.2)
+
+        assert calls == 3  # 처음 + 재시도 2회
+        assert writer.pending == 0
+        assert writer._timer is None
+
+    async def test_release_keeps_sequence_of_buffered_tasks(self, job_id, monkeypatch):
+        writer = TaskLogWriter(max_events=100, interval_ms=60_000)
+        insert_tasks = writer.repo.insert_tasks
+
+        async def fail(tasks):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(writer.repo, "insert_tasks", fail)
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="a")
+        with pytest.raises(RuntimeError):
+            await writer.flush()
+        writer.release(job_id)  # job 종료 — 1번은 아직 버퍼에
+
+        monkeypatch.setattr(writer.repo, "insert_tasks", insert_tasks)
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="b")
+        await writer.close()
+
+        tasks, _ = await _load(job_id)
+        assert [t.sequence for t in tasks] == [1, 2]
+
+    async def test_checkpoints_folded_into_flush(self, job_id):
+        writer = TaskLogWriter(max_events=100, interval_ms=60_000)
+        svc = JobService()
+        messages = [{"role": "user", "content": "fix it"}]
+        writer.clear_checkpoint(job_id)
+        writer.add_checkpoint(job_id, 0, messages)
+        messages.append({"role": "assistant", "content": "ok"})  # 이후 변경은 반영되지 않음
+        await writer.add_task(job_id, JobTaskType.MESSAGE, content="a")
+
+        async with database.db_context():
+            assert await svc.load_checkpoint(job_id) is None
+
+        await writer.flush()
+        assert writer.flushes == 1
+        async with database.db_context():
+            assert await svc.load_checkpoint(job_id) == (0, [{"role": "user", "content": "fix it"}])
+
+        writer.clear_checkpoint(job_id)
+        await writer.flush()
+        async with database.db_context():
+            assert await svc.load_checkpoint(job_id) is None
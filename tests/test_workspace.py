@@ -0,0 +1,142 @@
+import asyncio
+import subprocess
+
+import pytest
+
+from core.config import settings
+from models.job import ErrorSource, Job
+from services.agent import AgentService
+from services.workspace import WorkspaceService
+from worker import Worker
+
+
+def _git(*args: str, cwd=None) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """main 브랜치에 app/views.py가 있는 원격 레포 (file URL)"""
+    src = tmp_path / "src"
+    src.mkdir()
+    _git("init", "-b", "main", cwd=src)
+    (src / "app").mkdir()
+    (src / "app" / "views.py").write_text("def handler():\n    return 1 / 0\n")
+    _git("add", "-A", cwd=src)
+    _git("commit", "-m", "init", cwd=src)
+    return f"file://{src}"
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch) -> WorkspaceService:
+    monkeypatch.setattr(settings, "workspace_dir", tmp_path / "workspaces")
+    return WorkspaceService()
+
+
+class TestWorkspaceService:
+    async def test_prepare_clones_without_checkout(self, workspace, origin):
+        repo_dir = await workspace.prepare(origin, "github")
+
+        assert not (repo_dir / "app").exists()  # 워킹 트리는 체크아웃 전
+        assert await workspace.get_default_branch(repo_dir) == "main"
+        content = await workspace.show_file(repo_dir, "origin/main", "./app/views.py")
+        assert content == "def handler():\n    return 1 / 0\n"
+        assert await workspace.show_file(repo_dir, "origin/main", "missing.py") is None
+
+        await workspace.create_work_branch(repo_dir, "main", "fix/abc")
+        assert (repo_dir / "app" / "views.py").read_text() == content
+
+    async def test_show_file_cached_by_blob(self, workspace, origin, monkeypatch):
+        repo_dir = await workspace.prepare(origin, "github")
+        await workspace.show_file(repo_dir, "origin/main", "app/views.py")
+
+        commands = []
+        run = workspace._run
+
+        async def record(cmd):
+            commands.append(cmd[3])
+            return await run(cmd)
+
+        monkeypatch.setattr(workspace, "_run", record)
+        assert await workspace.show_file(repo_dir, "origin/main", "app/views.py")
+        assert commands == ["rev-parse"]  # cat-file 없이 캐시에서
+
+
+class TestWorkspaceReady:
+    """플래닝과 병렬로 진행되는 작업 브랜치 체크아웃 (workspace_ready)"""
+
+    @pytest.fixture
+    def agent(self, monkeypatch) -> AgentService:
+        monkeypatch.setattr(settings, "agent_mode", "api")
+        monkeypatch.setattr(settings, "anthropic_api_key", "test")
+        agent = AgentService()
+
+        async def notify(message):
+            pass
+
+        monkeypatch.setattr(agent, "_notify", notify)
+        return agent
+
+    @staticmethod
+    def _job() -> Job:
+        return Job(id="job-1", source=ErrorSource.SENTRY, source_issue_id="1", title="ZeroDivisionError")
+
+    async def test_executor_waits_for_checkout(self, agent, tmp_path, monkeypatch):
+        events = []
+        checkout_started = asyncio.Event()
+
+        async def checkout():
+            checkout_started.set()
+            await asyncio.sleep(0.05)
+            events.append("checkout")
+
+        async def plan(job, repo_dir, job_svc, *, source_ref=None):
+            await checkout_started.wait()
+            events.append(f"plan from {source_ref}")  # 체크아웃 진행 중에 플래닝
+            return "plan"
+
+        async def execute(job, repo_dir, work_branch, plan, job_svc, **kwargs):
+            events.append("execute")
+            return None
+
+        monkeypatch.setattr(agent, "_plan", plan)
+        monkeypatch.setattr(agent, "_execute", execute)
+        await agent.run(
+            self._job(), tmp_path, "fix/job-1", None,
+            source_ref="origin/main", workspace_ready=asyncio.create_task(checkout()),
+        )
+
+        assert events == ["plan from origin/main", "checkout", "execute"]
+
+    async def test_checkout_failure_during_planning(self, agent, tmp_path, monkeypatch):
+        executed = False
+
+        async def checkout():
+            raise RuntimeError("Git command failed: checkout")
+
+        async def plan(job, repo_dir, job_svc, *, source_ref=None):
+            await asyncio.sleep(0.01)  # 플래닝 도중 체크아웃 실패
+            return "plan"
+
+        async def execute(*args, **kwargs):
+            nonlocal executed
+            executed = True
+
+        monkeypatch.setattr(agent, "_plan", plan)
+        monkeypatch.setattr(agent, "_execute", execute)
+        with pytest.raises(RuntimeError, match="checkout"):
+            await agent.run(
+                self._job(), tmp_path, "fix/job-1", None,
+                source_ref="origin/main", workspace_ready=asyncio.create_task(checkout()),
+            )
+        assert not executed
+
+    def test_worker_shares_workspace(self, monkeypatch):
+        monkeypatch.setattr(settings, "agent_mode", "api")
+        monkeypatch.setattr(settings, "anthropic_api_key", "test")
+
+        worker = Worker()
+        assert worker.agent_svc.workspace_svc is worker.workspace_svc